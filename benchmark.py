@@ -0,0 +1,342 @@
+# BENCHMARK DOS PLANEJADORES EDROM
+# Compara os planejadores com a assinatura encontrar_caminho(pos_inicial, pos_objetivo, obstaculos,
+# largura_grid, altura_grid, tem_bola) sobre um conjunto fixo de cenários sorteados com semente.
+
+import argparse
+import heapq
+import inspect
+import json
+import logging
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+
+import candidato
+import planejadores as registro
+from estatisticas_busca import EstatisticasBusca
+from simulacao import resetar_cenario
+
+# Planejadores comparados por padrão (nomes de planejadores.PLANEJADORES)
+PLANEJADORES_PADRAO = ["candidato", "candidato_alt", "test_a_star", "test_geometria",
+                       "campo_objetivo", "candidato_hpa"]
+
+TAMANHOS_PADRAO = ["20x15", "40x30"]
+DENSIDADES_PADRAO = [0.10, 0.20]
+
+# Cenários
+def gerar_cenarios(tamanhos, densidades, n_cenarios, semente):
+    """
+    Gera o corpus de consultas: para cada cenário, robô -> bola (sem bola) e bola -> gol (com bola)
+    Args:
+        tamanhos: Lista de tuplas (largura, altura)
+        densidades: Frações de células ocupadas por adversários
+        n_cenarios: Cenários por combinação de tamanho e densidade
+        semente: Semente mestre do corpus
+    Returns:
+        Lista de consultas (dicionários)
+    """
+    consultas = []
+    for largura, altura in tamanhos:
+        for densidade in densidades:
+            for i in range(n_cenarios):
+                rng = random.Random(f"{semente}:{largura}x{altura}:{densidade}:{i}")
+                cenario = resetar_cenario(largura, altura, int(densidade * largura * altura), rng)
+                consultas += consultas_do_cenario(cenario, f"{largura}x{altura}@{densidade:.2f}", largura, altura)
+    return consultas
+
+def consultas_do_cenario(cenario, grupo, largura, altura):
+    """As duas consultas de um cenário: robô -> bola (sem bola) e bola -> gol (com bola)"""
+    base = {"grupo": grupo, "obstaculos": cenario["obstaculos"], "largura_grid": largura, "altura_grid": altura}
+    return [dict(base, pos_inicial=cenario["pos_robo"], pos_objetivo=cenario["pos_bola"], tem_bola=False),
+            dict(base, pos_inicial=cenario["pos_bola"], pos_objetivo=cenario["pos_gol"], tem_bola=True)]
+
+def consultas_do_corpus(caminho_arquivo, n_cenarios=None):
+    """
+    Consultas dos cenários de um corpus gravado por corpus_cenarios.gerar_corpus
+    Args:
+        caminho_arquivo: Arquivo .npz do corpus
+        n_cenarios: Usa só os primeiros cenários de cada grupo (None: todos)
+    Returns:
+        Lista de consultas (dicionários)
+    """
+    from corpus_cenarios import CorpusCenarios
+    corpus = CorpusCenarios(caminho_arquivo)
+    consultas = []
+    por_grupo = {}
+    for indice in range(len(corpus)):
+        grupo = str(corpus.grupo[indice])
+        por_grupo[grupo] = por_grupo.get(grupo, 0) + 1
+        if n_cenarios is None or por_grupo[grupo] <= n_cenarios:
+            cenario = corpus[indice]
+            consultas += consultas_do_cenario(cenario, grupo, cenario["largura_grid"], cenario["altura_grid"])
+    return consultas
+
+# Avaliação
+def custo_caminho(caminho, consulta):
+    """
+    Valida o caminho e calcula seu custo pelo modelo de custos do candidato
+    Args:
+        caminho: Lista de posições devolvida pelo planejador
+        consulta: Consulta que gerou o caminho
+    Returns:
+        Custo total, ou None se o caminho for inválido ou não chegar ao objetivo
+    """
+    if not caminho:
+        return None
+    obstaculos = set(consulta["obstaculos"])
+    # Alguns planejadores não incluem a posição inicial no caminho
+    if caminho[0] != consulta["pos_inicial"]:
+        caminho = [consulta["pos_inicial"]] + list(caminho)
+    if caminho[-1] != consulta["pos_objetivo"]:
+        return None
+
+    custo = 0
+    direcao = None
+    for (x0, y0), (x1, y1) in zip(caminho, caminho[1:]):
+        movimento = (x1 - x0, y1 - y0)
+        if max(abs(movimento[0]), abs(movimento[1])) != 1:
+            return None
+        if not (0 <= x1 < consulta["largura_grid"] and 0 <= y1 < consulta["altura_grid"]) or (x1, y1) in obstaculos:
+            return None
+        custo += candidato.calcular_custo_movimento(direcao, movimento, consulta["tem_bola"])
+        custo += candidato.calcular_penalidade_adversarios((x1, y1), consulta["obstaculos"])
+        direcao = movimento
+    return custo
+
+def pontuar(caminhos, consultas):
+    """
+    Custo de cada caminho pelo modelo do candidato (None se inválido), validando todos de uma
+    vez com validacao_lote; sem NumPy, usa custo_caminho caminho a caminho
+    """
+    try:
+        from validacao_lote import validar_consultas
+    except ImportError:
+        return [custo_caminho(caminho, consulta) for caminho, consulta in zip(caminhos, consultas)]
+    resultado = validar_consultas(caminhos, consultas)
+    return [int(custo) if valido else None for valido, custo in zip(resultado["valido"], resultado["custo"])]
+
+class HeapInstrumentado:
+    """Substitui o módulo heapq de um planejador para contar expansões e o pico do heap"""
+
+    def __init__(self):
+        self.expansoes = 0
+        self.pico_heap = 0
+
+    def heappush(self, heap, item):
+        heapq.heappush(heap, item)
+        if len(heap) > self.pico_heap:
+            self.pico_heap = len(heap)
+
+    def heappop(self, heap):
+        self.expansoes += 1
+        return heapq.heappop(heap)
+
+    def __getattr__(self, nome):
+        return getattr(heapq, nome)
+
+def chamar(funcao, consulta, **opcoes):
+    """Executa o planejador sobre uma consulta"""
+    return funcao(consulta["pos_inicial"], consulta["pos_objetivo"], consulta["obstaculos"],
+                  consulta["largura_grid"], consulta["altura_grid"], consulta["tem_bola"], **opcoes)
+
+def aceita_estatisticas(funcao):
+    """Indica se o planejador preenche um EstatisticasBusca (parâmetro estatisticas=)"""
+    try:
+        return "estatisticas" in inspect.signature(funcao).parameters
+    except (TypeError, ValueError):
+        return False
+
+def carregar(nome):
+    """Importa o planejador registrado em planejadores.py e devolve (módulo, planejador)"""
+    return registro.modulo(nome), registro.carregar(nome)
+
+def medir(modulo, funcao, consulta, repeticoes):
+    """
+    Mede uma consulta: uma execução instrumentada (expansões, pico do heap e pico de
+    memória), que também serve de aquecimento, seguida de execuções limpas para a
+    latência (menor tempo entre as repetições)
+    Planejadores que aceitam estatisticas= informam os próprios contadores; nos demais
+    o módulo heapq é substituído por HeapInstrumentado
+    """
+    instrumento = None
+    opcoes = {}
+    if aceita_estatisticas(funcao):
+        instrumento = EstatisticasBusca()
+        opcoes["estatisticas"] = instrumento
+    elif hasattr(modulo, "heapq"):
+        instrumento = HeapInstrumentado()
+        modulo.heapq = instrumento
+    tracemalloc.start()
+    try:
+        chamar(funcao, consulta, **opcoes)
+        _, pico_memoria = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        if isinstance(instrumento, HeapInstrumentado):
+            modulo.heapq = heapq
+
+    latencia = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        caminho = chamar(funcao, consulta)
+        latencia = min(latencia, time.perf_counter() - inicio)
+
+    expansoes = pico_heap = None
+    if isinstance(instrumento, EstatisticasBusca):
+        expansoes, pico_heap = instrumento.expansoes, instrumento.pico_abertos
+    elif instrumento is not None:
+        expansoes, pico_heap = instrumento.expansoes, instrumento.pico_heap
+    return {
+        "latencia": latencia,
+        "expansoes": expansoes,
+        "pico_heap": pico_heap,
+        "pico_memoria": pico_memoria,
+        "caminho": caminho,
+    }
+
+def percentil(valores, p):
+    """Percentil p (0-100) pelo método do vizinho mais próximo"""
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+def agregar(medidas):
+    """Resume as medidas de um grupo de consultas"""
+    latencias = [m["latencia"] * 1000 for m in medidas]
+    expansoes = [m["expansoes"] for m in medidas if m["expansoes"] is not None]
+    picos_heap = [m["pico_heap"] for m in medidas if m["pico_heap"] is not None]
+    custos = [m["custo"] for m in medidas if m["custo"] is not None]
+    return {
+        "consultas": len(medidas),
+        "p50_ms": percentil(latencias, 50),
+        "p99_ms": percentil(latencias, 99),
+        "expansoes_media": statistics.mean(expansoes) if expansoes else None,
+        "pico_heap": max(picos_heap) if picos_heap else None,
+        "pico_memoria_kb": max(m["pico_memoria"] for m in medidas) / 1024,
+        "custo_medio": statistics.mean(custos) if custos else None,
+        "taxa_falha": 1 - len(custos) / len(medidas),
+    }
+
+def executar(planejadores, consultas, repeticoes=3):
+    """
+    Roda todos os planejadores sobre todas as consultas
+    Args:
+        planejadores: Nomes registrados em planejadores.PLANEJADORES
+        consultas: Consultas geradas por gerar_cenarios
+        repeticoes: Execuções cronometradas por consulta
+    Returns:
+        Dicionário planejador -> grupo -> métricas agregadas
+    """
+    resultados = {}
+    for nome in planejadores:
+        modulo, funcao = carregar(nome)
+        medidas = [medir(modulo, funcao, consulta, repeticoes) for consulta in consultas]
+        for medida, custo in zip(medidas, pontuar([medida.pop("caminho") for medida in medidas], consultas)):
+            medida["custo"] = custo
+        por_grupo = {}
+        for consulta, medida in zip(consultas, medidas):
+            por_grupo.setdefault(consulta["grupo"], []).append(medida)
+        resultados[nome] = {grupo: agregar(medidas) for grupo, medidas in por_grupo.items()}
+    return resultados
+
+def perfilar(planejadores, consultas, **opcoes):
+    """
+    Passada extra, fora das medidas de latência, com cada planejador envolvido em um PerfilPlanejador
+    Args:
+        planejadores: Nomes registrados em planejadores.PLANEJADORES
+        consultas: Consultas geradas por gerar_cenarios
+        **opcoes: Repassadas para PerfilPlanejador (piores, cprofile, memoria)
+    Returns:
+        Dicionário planejador -> dados do perfil (ver perfilamento.exportar)
+    """
+    from perfilamento import PerfilPlanejador
+    perfis = {}
+    for nome in planejadores:
+        _, funcao = carregar(nome)
+        perfil = PerfilPlanejador(funcao, **opcoes)
+        for consulta in consultas:
+            chamar(perfil, consulta)
+        perfis[nome] = perfil.como_dicionario()
+    return perfis
+
+# Relatório
+def formatar(valor, casas=2):
+    if valor is None:
+        return "-"
+    return f"{valor:.{casas}f}" if isinstance(valor, float) else str(valor)
+
+def imprimir(resultados, base=None):
+    """Imprime a tabela de resultados, com a variação relativa a uma execução anterior se houver"""
+    colunas = ["p50_ms", "p99_ms", "expansoes_media", "pico_heap", "pico_memoria_kb", "custo_medio", "taxa_falha"]
+    # Colunas de nome e grupo do tamanho do maior texto (o registro tem nomes longos, ex.: candidato_objetos)
+    largura_nome = max([len("planejador")] + [len(nome) for nome in resultados]) + 2
+    largura_grupo = max([len("grupo")] + [len(grupo) for grupos in resultados.values() for grupo in grupos]) + 2
+    print(f"{'planejador':<{largura_nome}}{'grupo':<{largura_grupo}}" + "".join(f"{c:>17}" for c in colunas))
+    for nome, grupos in resultados.items():
+        for grupo, metricas in grupos.items():
+            linha = f"{nome:<{largura_nome}}{grupo:<{largura_grupo}}"
+            for coluna in colunas:
+                texto = formatar(metricas[coluna])
+                anterior = (base or {}).get(nome, {}).get(grupo, {}).get(coluna)
+                if anterior and metricas[coluna] is not None:
+                    texto += f" ({100 * (metricas[coluna] - anterior) / anterior:+.0f}%)"
+                linha += f"{texto:>17}"
+            print(linha)
+
+def commit_atual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dos planejadores EDROM")
+    parser.add_argument("--planejadores", nargs="+", default=PLANEJADORES_PADRAO, choices=registro.nomes())
+    parser.add_argument("--tamanhos", nargs="+", default=TAMANHOS_PADRAO, help="Ex.: 20x15 40x30")
+    parser.add_argument("--densidades", nargs="+", type=float, default=DENSIDADES_PADRAO)
+    parser.add_argument("--cenarios", type=int, default=20, help="Cenários por tamanho e densidade")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3, help="Execuções cronometradas por consulta")
+    parser.add_argument("--saida", help="Arquivo JSON com os resultados")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior para comparação")
+    parser.add_argument("--corpus", help="Corpus .npz (corpus_cenarios.py) no lugar do sorteio; "
+                                         "--cenarios limita os cenários por grupo")
+    parser.add_argument("--perfilar", metavar="ARQUIVO",
+                        help="Passada extra perfilada (perfilamento.py); relatório em .json ou texto")
+    parser.add_argument("--perfil-piores", type=int, default=5, metavar="N", help="Chamadas mais lentas detalhadas")
+    parser.add_argument("--perfil-cprofile", action="store_true", help="Guarda o cProfile das chamadas mais lentas")
+    parser.add_argument("--perfil-memoria", action="store_true", help="Mede cada chamada com tracemalloc")
+    args = parser.parse_args()
+
+    candidato.configurar_logging(arquivo=False, nivel=logging.WARNING)
+    if args.corpus:
+        consultas = consultas_do_corpus(args.corpus, args.cenarios)
+    else:
+        tamanhos = [tuple(int(v) for v in t.lower().split("x")) for t in args.tamanhos]
+        consultas = gerar_cenarios(tamanhos, args.densidades, args.cenarios, args.semente)
+    resultados = executar(args.planejadores, consultas, args.repeticoes)
+
+    base = None
+    if args.comparar:
+        with open(args.comparar) as arquivo:
+            base = json.load(arquivo)["resultados"]
+    imprimir(resultados, base)
+    if args.perfilar:
+        from perfilamento import exportar
+        exportar(perfilar(args.planejadores, consultas, piores=args.perfil_piores, cprofile=args.perfil_cprofile,
+                          memoria=args.perfil_memoria), args.perfilar)
+        print(f"Perfil gravado em {args.perfilar}")
+
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump({
+                "commit": commit_atual(),
+                "configuracao": {"tamanhos": args.tamanhos, "densidades": args.densidades,
+                                 "cenarios": args.cenarios, "semente": args.semente,
+                                 "repeticoes": args.repeticoes, "corpus": args.corpus},
+                "resultados": resultados,
+            }, arquivo, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Cache de caminhos com descarte LRU.
+
+Envolve qualquer planejador com a assinatura de candidato.encontrar_caminho.
+A chave é (início, objetivo, impressão dos obstáculos, dimensões, posse de bola):
+uma consulta repetida custa uma busca em dicionário. Quando o início de uma
+consulta nova está sobre um caminho guardado para o mesmo cenário e objetivo,
+o trecho restante desse caminho é devolvido sem nova busca.
+'''
+
+from collections import OrderedDict
+
+import candidato
+from mapa import MapaOcupacao
+
+CAPACIDADE_PADRAO = 256
+
+def impressao_obstaculos(obstaculos):
+    """
+    Identifica o conjunto de adversários independente da ordem da lista
+    Para um MapaOcupacao usa o próprio objeto e sua versão (O(1), sem percorrer o mapa)
+    """
+    if isinstance(obstaculos, MapaOcupacao):
+        return (obstaculos, obstaculos.versao)
+    return frozenset(obstaculos)
+
+# ==================== CACHE ====================
+class CacheCaminhos:
+    """Memoização LRU de um planejador, com reaproveitamento de sufixos de caminhos guardados"""
+
+    def __init__(self, planejador=candidato.encontrar_caminho, capacidade=CAPACIDADE_PADRAO, reusar_sufixo=True):
+        """
+        Args:
+            planejador: Função com a assinatura de candidato.encontrar_caminho
+            capacidade: Número máximo de caminhos guardados
+            reusar_sufixo: Responde consultas cujo início está sobre um caminho guardado com o
+                trecho restante dele (a continuação do plano de quem chegou ali por esse caminho)
+        """
+        self.planejador = planejador
+        self.capacidade = capacidade
+        self.reusar_sufixo = reusar_sufixo
+        self._caminhos = OrderedDict()  # chave -> (caminho em tupla, 1 se o caminho omite o início)
+        self._posicoes = {}             # cenário -> {posição: (chave, índice no caminho)}
+        self.acertos = 0
+        self.acertos_sufixo = 0
+        self.falhas = 0
+        self.descartados = 0
+
+    def __call__(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+        cenario = (pos_objetivo, impressao_obstaculos(obstaculos), largura_grid, altura_grid, bool(tem_bola))
+        chave = (pos_inicial, cenario)
+
+        entrada = self._caminhos.get(chave)
+        if entrada is not None:
+            self._caminhos.move_to_end(chave)
+            self.acertos += 1
+            return list(entrada[0])
+
+        if self.reusar_sufixo:
+            origem = self._posicoes.get(cenario, {}).get(pos_inicial)
+            if origem is not None:
+                chave_origem, indice = origem
+                caminho, omite_inicio = self._caminhos[chave_origem]
+                self._caminhos.move_to_end(chave_origem)
+                self.acertos_sufixo += 1
+                return list(caminho[indice + omite_inicio:])
+
+        self.falhas += 1
+        caminho = tuple(self.planejador(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola))
+        self._guardar(chave, cenario, caminho)
+        return list(caminho)
+
+    def _guardar(self, chave, cenario, caminho):
+        omite_inicio = 1 if caminho and caminho[0] != chave[0] else 0
+        self._caminhos[chave] = (caminho, omite_inicio)
+        if self.reusar_sufixo and caminho:
+            posicoes = self._posicoes.setdefault(cenario, {})
+            if omite_inicio:
+                posicoes[chave[0]] = (chave, -1)
+            for indice, posicao in enumerate(caminho):
+                posicoes[posicao] = (chave, indice)
+        while len(self._caminhos) > self.capacidade:
+            self._descartar()
+
+    def _descartar(self):
+        """Remove o caminho usado há mais tempo e suas posições do índice de sufixos"""
+        (inicio, cenario), (caminho, _) = self._caminhos.popitem(last=False)
+        self.descartados += 1
+        posicoes = self._posicoes.get(cenario)
+        if posicoes is None:
+            return
+        for posicao in (inicio,) + caminho:
+            origem = posicoes.get(posicao)
+            if origem is not None and origem[0] == (inicio, cenario):
+                del posicoes[posicao]
+        if not posicoes:
+            del self._posicoes[cenario]
+
+    def limpar(self):
+        """Esvazia o cache (os contadores são mantidos)"""
+        self._caminhos.clear()
+        self._posicoes.clear()
+
+    def estatisticas(self):
+        """Contadores de acertos, acertos por sufixo, falhas, descartes e ocupação"""
+        consultas = self.acertos + self.acertos_sufixo + self.falhas
+        return {
+            "acertos": self.acertos,
+            "acertos_sufixo": self.acertos_sufixo,
+            "falhas": self.falhas,
+            "descartados": self.descartados,
+            "entradas": len(self._caminhos),
+            "taxa_acerto": (self.acertos + self.acertos_sufixo) / consultas if consultas else 0.0,
+        }
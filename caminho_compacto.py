@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Caminho compacto: origem + trechos retos em vetores.
+
+Um caminho de grade muda de direção poucas vezes: em vez de uma tupla por célula,
+CaminhoCompacto guarda a origem e, para cada trecho reto, a direção (índice em
+candidato.MOVIMENTOS, ou SEM_DIRECAO para esperar parado) e o número de passos,
+em dois array.array. As células são geradas sob demanda ao iterar.
+
+CursorCaminho consome um caminho compacto do início para o fim com custo O(1) por
+passo e memória constante além do próprio caminho; percorrer devolve a fila de
+passos que o simulador consome (cursor para caminhos compactos, deque para listas).
+'''
+
+from array import array
+from collections import deque
+
+from candidato import MOVIMENTOS
+
+# Deslocamento de cada direção; o índice SEM_DIRECAO é um passo parado (esperas do planejamento cooperativo)
+DESLOCAMENTOS = tuple(MOVIMENTOS) + ((0, 0),)
+_INDICE_DESLOCAMENTO = {deslocamento: indice for indice, deslocamento in enumerate(DESLOCAMENTOS)}
+
+# ==================== CAMINHO COMPACTO ====================
+class CaminhoCompacto:
+    """Caminho guardado como origem e trechos retos (direção, passos)"""
+
+    __slots__ = ("origem", "direcoes", "repeticoes", "_comprimento")
+
+    def __init__(self, origem=None, direcoes=None, repeticoes=None):
+        """
+        Args:
+            origem: Tupla (x,y) da primeira célula (None para um caminho vazio)
+            direcoes: array('b') com a direção de cada trecho, na ordem do caminho
+            repeticoes: array('i') com o número de passos de cada trecho
+        """
+        self.origem = origem
+        self.direcoes = direcoes if direcoes is not None else array('b')
+        self.repeticoes = repeticoes if repeticoes is not None else array('i')
+        self._comprimento = (1 + sum(self.repeticoes)) if origem is not None else 0
+
+    @classmethod
+    def de_posicoes(cls, posicoes):
+        """
+        Converte uma sequência de posições em caminho compacto
+        Raises:
+            ValueError: Se duas posições seguidas não forem vizinhas (nem iguais)
+        """
+        caminho = cls()
+        ultima = None
+        for posicao in posicoes:
+            posicao = tuple(posicao)
+            if ultima is None:
+                caminho.origem = posicao
+            else:
+                direcao = _INDICE_DESLOCAMENTO.get((posicao[0] - ultima[0], posicao[1] - ultima[1]))
+                if direcao is None:
+                    raise ValueError(f"Posições não vizinhas no caminho: {ultima} -> {posicao}")
+                if caminho.direcoes and caminho.direcoes[-1] == direcao:
+                    caminho.repeticoes[-1] += 1
+                else:
+                    caminho.direcoes.append(direcao)
+                    caminho.repeticoes.append(1)
+            caminho._comprimento += 1
+            ultima = posicao
+        return caminho
+
+    def vertices(self):
+        """Células onde o caminho começa, muda de direção e termina"""
+        if self.origem is None:
+            return []
+        x, y = self.origem
+        vertices = [(x, y)]
+        for direcao, passos in zip(self.direcoes, self.repeticoes):
+            dx, dy = DESLOCAMENTOS[direcao]
+            x, y = x + dx * passos, y + dy * passos
+            vertices.append((x, y))
+        return vertices
+
+    def cursor(self):
+        """CursorCaminho posicionado na primeira célula"""
+        return CursorCaminho(self)
+
+    def __len__(self):
+        return self._comprimento
+
+    def __bool__(self):
+        return self._comprimento > 0
+
+    def __iter__(self):
+        if self.origem is None:
+            return
+        x, y = self.origem
+        yield x, y
+        for direcao, passos in zip(self.direcoes, self.repeticoes):
+            dx, dy = DESLOCAMENTOS[direcao]
+            for _ in range(passos):
+                x += dx
+                y += dy
+                yield x, y
+
+    def __getitem__(self, indice):
+        """Célula na posição indice, percorrendo só os trechos (fatias viram listas)"""
+        if isinstance(indice, slice):
+            return list(self)[indice]
+        if indice < 0:
+            indice += self._comprimento
+        if not 0 <= indice < self._comprimento:
+            raise IndexError("índice fora do caminho")
+        x, y = self.origem
+        for direcao, passos in zip(self.direcoes, self.repeticoes):
+            if not indice:
+                break
+            passos = min(passos, indice)
+            dx, dy = DESLOCAMENTOS[direcao]
+            x, y = x + dx * passos, y + dy * passos
+            indice -= passos
+        return x, y
+
+    def __eq__(self, outro):
+        if isinstance(outro, CaminhoCompacto):
+            return (self.origem == outro.origem and self.direcoes == outro.direcoes and
+                    self.repeticoes == outro.repeticoes)
+        if isinstance(outro, (list, tuple)):
+            return len(self) == len(outro) and all(a == tuple(b) for a, b in zip(self, outro))
+        return NotImplemented
+
+    def __repr__(self):
+        return f"CaminhoCompacto({self.origem}, {len(self.direcoes)} trechos, {self._comprimento} células)"
+
+# ==================== CONSUMO ====================
+class CursorCaminho:
+    """Fila de passos de um CaminhoCompacto: popleft em O(1), sem gerar a lista de células"""
+
+    __slots__ = ("caminho", "trecho", "restantes_trecho", "deslocamento", "posicao", "restantes")
+
+    def __init__(self, caminho):
+        """
+        Args:
+            caminho: CaminhoCompacto a percorrer a partir da origem
+        """
+        self.caminho = caminho
+        self.trecho = -1                # Trecho da célula em posicao (-1: origem)
+        self.restantes_trecho = 0       # Passos que faltam no trecho atual
+        self.deslocamento = (0, 0)      # (dx, dy) do trecho atual
+        self.posicao = None             # Última célula entregue
+        self.restantes = len(caminho)
+
+    def popleft(self):
+        """Próxima célula do caminho (mesma interface de collections.deque)"""
+        if not self.restantes:
+            raise IndexError("caminho já percorrido")
+        self.restantes -= 1
+        if self.posicao is None:
+            self.posicao = self.caminho.origem
+            return self.posicao
+        if not self.restantes_trecho:
+            self.trecho += 1
+            self.restantes_trecho = self.caminho.repeticoes[self.trecho]
+            self.deslocamento = DESLOCAMENTOS[self.caminho.direcoes[self.trecho]]
+        self.restantes_trecho -= 1
+        x, y = self.posicao
+        dx, dy = self.deslocamento
+        self.posicao = posicao = (x + dx, y + dy)
+        return posicao
+
+    def __len__(self):
+        return self.restantes
+
+    def __bool__(self):
+        return self.restantes > 0
+
+    def __iter__(self):
+        """Células que ainda não foram consumidas (sem avançar o cursor)"""
+        consumidas = len(self.caminho) - self.restantes
+        if not consumidas:
+            yield from self.caminho
+            return
+        repeticoes, direcoes = self.caminho.repeticoes, self.caminho.direcoes
+        x, y = self.posicao
+        trecho, restantes_trecho = self.trecho, self.restantes_trecho
+        while True:
+            if not restantes_trecho:
+                trecho += 1
+                if trecho >= len(direcoes):
+                    return
+                restantes_trecho = repeticoes[trecho]
+            dx, dy = DESLOCAMENTOS[direcoes[trecho]]
+            for _ in range(restantes_trecho):
+                x += dx
+                y += dy
+                yield x, y
+            restantes_trecho = 0
+
+    def __getitem__(self, indice):
+        """Célula a indice passos do cursor; [0] é a próxima célula, como em deque"""
+        if not 0 <= indice < self.restantes:
+            raise IndexError("índice fora do trecho restante")
+        if indice == 0:
+            # Próxima célula sem avançar o cursor
+            if self.posicao is None:
+                return self.caminho.origem
+            trecho = self.trecho if self.restantes_trecho else self.trecho + 1
+            dx, dy = DESLOCAMENTOS[self.caminho.direcoes[trecho]]
+            return self.posicao[0] + dx, self.posicao[1] + dy
+        return self.caminho[len(self.caminho) - self.restantes + indice]
+
+def percorrer(caminho):
+    """
+    Fila de passos consumida com popleft
+    Args:
+        caminho: CaminhoCompacto ou sequência de posições
+    Returns:
+        CursorCaminho para um caminho compacto, senão um collections.deque
+    """
+    if isinstance(caminho, CaminhoCompacto):
+        return caminho.cursor()
+    return deque(caminho)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Campo de custo até o objetivo (cost-to-go).
+
+Um único Dijkstra reverso, a partir do objetivo, calcula o custo exato restante
+para todos os estados (célula, direção anterior, bola). Como o gol fica fixo
+durante o episódio, qualquer consulta posterior vira uma consulta à tabela:
+o próximo passo é o sucessor que minimiza custo do movimento + custo restante,
+e o caminho completo é apenas essa caminhada até o objetivo.
+'''
+
+import heapq
+import logging
+from collections import OrderedDict
+
+import candidato
+from candidato import MOVIMENTOS, N_DIRECOES, SEM_DIRECAO, CUSTO_INFINITO
+
+# ==================== CAMPO DE CUSTO ATÉ O OBJETIVO ====================
+class CampoCustoObjetivo:
+    """Tabela com o custo exato até o objetivo para cada estado (célula, direção, bola)"""
+
+    def __init__(self, pos_objetivo, obstaculos, largura_grid, altura_grid, modelo=None):
+        """
+        Executa o Dijkstra reverso sobre todo o espaço de estados
+        Args:
+            pos_objetivo: Tupla (x,y) com o objetivo
+            obstaculos: Lista de posições dos adversários
+            largura_grid: Largura do grid
+            altura_grid: Altura do grid
+            modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+        """
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.pos_objetivo = pos_objetivo
+        self.campo = candidato.obter_campo_custo(obstaculos, largura_grid, altura_grid)
+        self.modelo = modelo or candidato.MODELO_PADRAO
+        self.custo_mov = candidato.tabela_custo_movimento(self.modelo)
+        self.custo = self._dijkstra_reverso()
+
+    def _dijkstra_reverso(self):
+        largura, altura = self.largura, self.altura
+        bloqueado, penalidade = self.campo.bloqueado, self.campo.penalidade
+        custo_mov = self.custo_mov
+        celula_objetivo = self.pos_objetivo[1] * largura + self.pos_objetivo[0]
+
+        custo = [CUSTO_INFINITO] * (largura * altura * N_DIRECOES * 2)
+        heap = []
+        for direcao in range(N_DIRECOES):
+            for bola in (0, 1):
+                estado = (celula_objetivo * N_DIRECOES + direcao) * 2 + bola
+                custo[estado] = 0
+                heap.append((0, estado))
+
+        while heap:
+            custo_atual, estado = heapq.heappop(heap)
+            if custo_atual > custo[estado]:
+                continue
+            bola = estado & 1
+            celula, indice = divmod(estado >> 1, N_DIRECOES)
+            if indice == SEM_DIRECAO:
+                continue  # Apenas o estado inicial não tem direção: ninguém chega nele
+            # Antecessor: a célula de onde o movimento MOVIMENTOS[indice] leva até esta
+            x = celula % largura - MOVIMENTOS[indice][0]
+            y = celula // largura - MOVIMENTOS[indice][1]
+            if not (0 <= x < largura and 0 <= y < altura):
+                continue
+            anterior = y * largura + x
+            if bloqueado[anterior] or anterior == celula_objetivo:
+                continue
+            custo_entrada = custo_atual + penalidade[celula]
+            for direcao in range(N_DIRECOES):
+                novo_custo = custo_entrada + custo_mov[(bola * N_DIRECOES + direcao) * 8 + indice]
+                predecessor = (anterior * N_DIRECOES + direcao) * 2 + bola
+                if novo_custo < custo[predecessor]:
+                    custo[predecessor] = novo_custo
+                    heapq.heappush(heap, (novo_custo, predecessor))
+        return custo
+
+    def _estado(self, posicao, direcao, tem_bola):
+        indice = MOVIMENTOS.index(direcao) if direcao else SEM_DIRECAO
+        return ((posicao[1] * self.largura + posicao[0]) * N_DIRECOES + indice) * 2 + (1 if tem_bola else 0)
+
+    def custo_restante(self, posicao, direcao=None, tem_bola=False):
+        """
+        Custo exato do melhor caminho até o objetivo
+        Args:
+            posicao: Tupla (x,y) do robô
+            direcao: Último movimento executado (None se parado)
+            tem_bola: Indica se o robô está com a bola
+        Returns:
+            Custo restante (CUSTO_INFINITO se o objetivo for inalcançável)
+        """
+        return self.custo[self._estado(posicao, direcao, tem_bola)]
+
+    def heuristica(self, posicao, direcao, tem_bola):
+        """Heurística exata para encontrar_caminho(..., heuristica=campo.heuristica)"""
+        return self.custo[self._estado(posicao, direcao, tem_bola)]
+
+    def proximo_passo(self, posicao, direcao=None, tem_bola=False):
+        """
+        Melhor próximo movimento a partir de qualquer estado
+        Returns:
+            Tupla (posicao, movimento) do próximo passo, ou None se já está no objetivo ou sem caminho
+        """
+        if posicao == self.pos_objetivo:
+            return None
+        anterior = MOVIMENTOS.index(direcao) if direcao else SEM_DIRECAO
+        bola = 1 if tem_bola else 0
+        base = (bola * N_DIRECOES + anterior) * 8
+        melhor, escolha = CUSTO_INFINITO, None
+        for indice, (dx, dy) in enumerate(MOVIMENTOS):
+            nx, ny = posicao[0] + dx, posicao[1] + dy
+            if not (0 <= nx < self.largura and 0 <= ny < self.altura):
+                continue
+            celula = ny * self.largura + nx
+            if self.campo.bloqueado[celula]:
+                continue
+            total = (self.custo_mov[base + indice] + self.campo.penalidade[celula]
+                     + self.custo[(celula * N_DIRECOES + indice) * 2 + bola])
+            if total < melhor:
+                melhor, escolha = total, ((nx, ny), (dx, dy))
+        return escolha
+
+    def caminho(self, pos_inicial, direcao=None, tem_bola=False):
+        """
+        Caminho ótimo obtido percorrendo a tabela
+        Returns:
+            Lista de posições incluindo a inicial (vazia se não houver caminho)
+        """
+        if self.custo_restante(pos_inicial, direcao, tem_bola) == CUSTO_INFINITO:
+            return []
+        caminho = [pos_inicial]
+        posicao = pos_inicial
+        while posicao != self.pos_objetivo:
+            posicao, direcao = self.proximo_passo(posicao, direcao, tem_bola)
+            caminho.append(posicao)
+        return caminho
+
+# Cache por cenário: o mesmo gol é consultado de várias posições durante o episódio
+TAMANHO_CACHE_CAMPOS = 8
+_cache_campos = OrderedDict()
+
+def obter_campo_objetivo(pos_objetivo, obstaculos, largura_grid, altura_grid, modelo=None):
+    """
+    Retorna o CampoCustoObjetivo do cenário, reaproveitando tabelas já calculadas
+    Args:
+        pos_objetivo: Tupla (x,y) com o objetivo
+        obstaculos: Lista de posições dos adversários
+        largura_grid: Largura do grid
+        altura_grid: Altura do grid
+        modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+    Returns:
+        CampoCustoObjetivo correspondente
+    """
+    modelo = modelo or candidato.MODELO_PADRAO
+    # O campo guarda o modelo, então o id não é reaproveitado enquanto a entrada estiver no cache
+    chave = (pos_objetivo, candidato.chave_cenario(obstaculos, largura_grid, altura_grid), id(modelo))
+    campo = _cache_campos.get(chave)
+    if campo is None:
+        campo = CampoCustoObjetivo(pos_objetivo, obstaculos, largura_grid, altura_grid, modelo)
+        _cache_campos[chave] = campo
+        if len(_cache_campos) > TAMANHO_CACHE_CAMPOS:
+            _cache_campos.popitem(last=False)
+    else:
+        _cache_campos.move_to_end(chave)
+    return campo
+
+def encontrar_caminho_por_campo(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                                modelo=None):
+    """
+    Planejador com a assinatura de candidato.encontrar_caminho baseado no campo até o objetivo
+    Args:
+        pos_inicial: Tupla (x,y) com a posição inicial
+        pos_objetivo: Tupla (x,y) com o objetivo
+        obstaculos: Lista de posições dos adversários
+        largura_grid: Largura do grid de busca
+        altura_grid: Altura do grid de busca
+        tem_bola: Indica se o robô começa com a bola
+        modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+    Returns:
+        Lista de posições representando o caminho encontrado (vazia se não houver)
+    """
+    campo = obter_campo_objetivo(pos_objetivo, obstaculos, largura_grid, altura_grid, modelo)
+    caminho = campo.caminho(pos_inicial, None, tem_bola)
+    if not caminho:
+        logging.warning("Nenhum caminho válido encontrado!")
+    return caminho
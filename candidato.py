@@ -6,35 +6,53 @@ CURSO DO CANDIDATO: Engenharia Biomédica
 ÁREAS DE INTERESSE: Elétrica e Behavior
 '''
 
-import heapq
 import logging
+import math
+import time
+from array import array
+from collections import OrderedDict
 from datetime import datetime
 import os
 
+from fila_prioridade import FILAS
+from mapa import MapaOcupacao
+
 # ==================== CONFIGURAÇÃO DE LOGGING ====================
-def configurar_logging():
-    """Configura o sistema de logging com arquivo e console"""
-    log_dir = "logs"
-    os.makedirs(log_dir, exist_ok=True)
-    
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    log_file = os.path.join(log_dir, f"path_finding_{timestamp}.log")
-    
+# DEBUG_MODE = True
+DEBUG_MODE = False  # Mude para True para ativar logs detalhados
+
+def configurar_logging(arquivo=True, nivel=None):
+    """
+    Configura o sistema de logging com arquivo e console
+    Chamada pelo ponto de entrada (simulador, simulação, benchmark...): importar o
+    candidato não configura o logging nem cria arquivos
+    Args:
+        arquivo: Grava também em logs/path_finding_<data e hora>.log
+        nivel: Nível do logger raiz (None: DEBUG com DEBUG_MODE, senão INFO)
+    """
+    handlers = [logging.StreamHandler()]
+    if arquivo:
+        log_dir = "logs"
+        os.makedirs(log_dir, exist_ok=True)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        log_file = os.path.join(log_dir, f"path_finding_{timestamp}.log")
+        handlers.insert(0, logging.FileHandler(log_file))
+
+    if nivel is None:
+        nivel = logging.DEBUG if DEBUG_MODE else logging.INFO
     logging.basicConfig(
-        level=logging.INFO,
+        level=nivel,
         format='%(asctime)s [%(levelname)s]: %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+        handlers=handlers
     )
+    logging.getLogger().setLevel(nivel)  # basicConfig não muda o nível se o logging já estava configurado
     logging.info("Sistema de logging configurado")
 
-configurar_logging()
-
-# DEBUG_MODE = True
-DEBUG_MODE = False  # Mude para True para ativar logs detalhados
-logging.getLogger().setLevel(logging.DEBUG if DEBUG_MODE else logging.INFO)
+# Motor usado por encontrar_caminho: "vetorial" (vetores planos) ou "objetos" (classe Estado)
+MOTOR_PADRAO = "vetorial"
+# Lista de abertos: "binaria" (heapq) ou "baldes" (fila de baldes, ver fila_prioridade.py)
+FILA_PADRAO = "binaria"
 
 # ==================== DEFINIÇÃO DE CLASSES ====================
 class Estado:
@@ -59,28 +77,116 @@ class Estado:
         self.direcao_anterior = direcao_anterior
         self.tem_bola = tem_bola
         
-        logging.debug(f"Novo estado criado - Posição: {posicao} | Custo: g={g}, h={h}, f={self.f} | "
-                     f"Direção: {direcao_anterior} | Bola: {'Sim' if tem_bola else 'Não'}")
+        if DEBUG_MODE:
+            logging.debug(f"Novo estado criado - Posição: {posicao} | Custo: g={g}, h={h}, f={self.f} | "
+                          f"Direção: {direcao_anterior} | Bola: {'Sim' if tem_bola else 'Não'}")
 
     def __lt__(self, other):
         """Comparação para heap prioritário (menor custo f primeiro)"""
         return self.f < other.f
 
+# ==================== MODELO DE CUSTO ====================
+class ModeloCusto:
+    """
+    Custos de movimento do desafio reunidos em um só objeto: a tabela usada pelos
+    motores e a heurística são derivadas dos mesmos valores, então a heurística
+    continua admissível e consistente para qualquer configuração
+    """
+
+    def __init__(self, custo_reto=100, custo_diagonal=100, custo_reto_diagonal=50, custo_90_graus=150, fator_bola=2):
+        """
+        Args:
+            custo_reto: Custo base de um passo reto (Nível Básico)
+            custo_diagonal: Custo base de um passo diagonal (Nível Básico)
+            custo_reto_diagonal: Adicional ao trocar entre reto e diagonal (Nível 1)
+            custo_90_graus: Adicional para uma curva de 90 graus (Nível 1)
+            fator_bola: Multiplicador dos adicionais de rotação com posse de bola (Nível 2)
+
+        O modelo não deve ser alterado depois de usado: a tabela é calculada uma única vez.
+        """
+        self.custo_reto = custo_reto
+        self.custo_diagonal = custo_diagonal
+        self.custo_reto_diagonal = custo_reto_diagonal
+        self.custo_90_graus = custo_90_graus
+        self.fator_bola = fator_bola
+        self._tabela = None
+
+    def custo_movimento(self, direcao_atual, nova_direcao, tem_bola):
+        """Custo do passo nova_direcao vindo de direcao_atual (None no primeiro passo)"""
+        diagonal = nova_direcao[0] != 0 and nova_direcao[1] != 0
+        custo = self.custo_diagonal if diagonal else self.custo_reto
+
+        # Aplica custo adicional para mudanças de direção
+        if direcao_atual and direcao_atual != nova_direcao:
+            fator = self.fator_bola if tem_bola else 1
+            # Mudança entre movimento reto e diagonal
+            if (abs(direcao_atual[0]) + abs(direcao_atual[1])) != (abs(nova_direcao[0]) + abs(nova_direcao[1])):
+                custo += self.custo_reto_diagonal * fator  # Nível 1 e 2
+                if DEBUG_MODE:
+                    logging.debug(f"Custo de rotação reto/diagonal: {'com bola' if tem_bola else 'sem bola'}")
+            # Mudança brusca (90 graus)
+            elif direcao_atual[0] * nova_direcao[0] + direcao_atual[1] * nova_direcao[1] == 0:
+                custo += self.custo_90_graus * fator  # Nível 1 e 2
+                if DEBUG_MODE:
+                    logging.debug(f"Custo de rotação 90°: {'com bola' if tem_bola else 'sem bola'}")
+        return custo
+
+    def tabela(self):
+        """
+        Pré-calcula custo_movimento para todas as combinações de direções
+        Returns:
+            Lista plana indexada por ((bola * N_DIRECOES) + direcao_anterior) * 8 + nova_direcao
+        """
+        if self._tabela is None:
+            tabela = []
+            for bola in (False, True):
+                for anterior in range(N_DIRECOES):
+                    direcao_anterior = MOVIMENTOS[anterior] if anterior < SEM_DIRECAO else None
+                    for movimento in MOVIMENTOS:
+                        tabela.append(self.custo_movimento(direcao_anterior, movimento, bola))
+            # Menor custo possível de um passo de cada tipo, com qualquer rotação e posse de bola
+            self.passo_reto = min(custo for i, custo in enumerate(tabela) if i % 8 < 4)
+            self.passo_diagonal = min(custo for i, custo in enumerate(tabela) if i % 8 >= 4)
+            self._tabela = tabela
+        return self._tabela
+
+    def heuristica(self, dx, dy):
+        """
+        Limite inferior do custo para deslocar (dx, dy) células
+        Com d passos diagonais e r retos: d + r >= maior e 2d + r >= maior + menor. O mínimo
+        de d * passo_diagonal + r * passo_reto nessa região está em um dos três vértices
+        abaixo; rotações e penalidades nunca são negativas. Um passo reduz o valor em no
+        máximo o próprio custo, então a heurística também é consistente.
+        """
+        if self._tabela is None:
+            self.tabela()
+        dx, dy = abs(dx), abs(dy)
+        menor, maior = (dx, dy) if dx < dy else (dy, dx)
+        reto, diagonal = self.passo_reto, self.passo_diagonal
+        return min(menor * diagonal + (maior - menor) * reto, maior * diagonal, (maior + menor) * reto)
+
+    def __repr__(self):
+        return (f"ModeloCusto(custo_reto={self.custo_reto}, custo_diagonal={self.custo_diagonal}, "
+                f"custo_reto_diagonal={self.custo_reto_diagonal}, custo_90_graus={self.custo_90_graus}, "
+                f"fator_bola={self.fator_bola})")
+
+# Custos em uso (o enunciado original do desafio corresponde a ModeloCusto(custo_reto=300, custo_diagonal=100))
+MODELO_PADRAO = ModeloCusto()
+
 # ==================== FUNÇÕES DE CÁLCULO ====================
-def calcular_heuristica(pos_atual, pos_objetivo):
+def calcular_heuristica(pos_atual, pos_objetivo, modelo=None):
     """
-    Calcula a heurística otimizada para custos 100/300
+    Heurística admissível derivada do modelo de custo
     Args:
         pos_atual: Tupla (x,y) com a posição atual
         pos_objetivo: Tupla (x,y) com o objetivo
+        modelo: ModeloCusto (None usa MODELO_PADRAO)
     Returns:
-        Valor heurístico estimado
+        Valor heurístico estimado (nunca maior que o custo real restante)
     """
-    dx = abs(pos_atual[0] - pos_objetivo[0])
-    dy = abs(pos_atual[1] - pos_objetivo[1])
-    return min(dx, dy) * 100 + abs(dx - dy) * 300  # Combina movimentos diagonais e retos
+    return (modelo or MODELO_PADRAO).heuristica(pos_atual[0] - pos_objetivo[0], pos_atual[1] - pos_objetivo[1])
 
-def calcular_custo_movimento(direcao_atual, nova_direcao, tem_bola):
+def calcular_custo_movimento(direcao_atual, nova_direcao, tem_bola, modelo=None):
     """
     Calcula o custo total do movimento considerando:
     - Custo base (reto/diagonal)
@@ -89,25 +195,11 @@ def calcular_custo_movimento(direcao_atual, nova_direcao, tem_bola):
         direcao_atual: Direção do movimento anterior
         nova_direcao: Direção do novo movimento
         tem_bola: Indica se o robô está com a bola
+        modelo: ModeloCusto (None usa MODELO_PADRAO)
     Returns:
         Custo total do movimento
     """
-    # Custo base conforme especificação do desafio
-    # custo = 100 if (nova_direcao[0] != 0 and nova_direcao[1] != 0) else 300
-    custo = 100
-    
-    # Aplica custo adicional para mudanças de direção
-    if direcao_atual and direcao_atual != nova_direcao:
-        # Mudança entre movimento reto e diagonal
-        if (abs(direcao_atual[0]) + abs(direcao_atual[1])) != (abs(nova_direcao[0]) + abs(nova_direcao[1])):
-            custo += 50 * (2 if tem_bola else 1)  # Nível 1 e 2
-            logging.debug(f"Custo de rotação reto/diagonal: {'com bola' if tem_bola else 'sem bola'}")
-        # Mudança brusca (90 graus)
-        elif direcao_atual[0] * nova_direcao[0] + direcao_atual[1] * nova_direcao[1] == 0:
-            custo += 150 * (2 if tem_bola else 1)  # Nível 1 e 2
-            logging.debug(f"Custo de rotação 90°: {'com bola' if tem_bola else 'sem bola'}")
-    
-    return custo
+    return (modelo or MODELO_PADRAO).custo_movimento(direcao_atual, nova_direcao, tem_bola)
 
 def calcular_penalidade_adversarios(posicao, obstaculos):
     """
@@ -121,13 +213,246 @@ def calcular_penalidade_adversarios(posicao, obstaculos):
     penalidade = 0
     for obs in obstaculos:
         dist = max(abs(posicao[0]-obs[0]), abs(posicao[1]-obs[1]))
-        if dist <= 2:  # Células adjacentes e diagonais secundárias
-            penalidade += (300 - 100 * dist) if dist <= 1 else (100 - 30 * (dist-1))
-            logging.debug(f"Penalidade adversário: {posicao} próximo a {obs} (dist={dist}): +{penalidade}")
+        if dist <= RAIO_PENALIDADE:  # Células adjacentes e diagonais secundárias
+            penalidade += _KERNEL_PENALIDADE[dist]
+            if DEBUG_MODE:
+                logging.debug(f"Penalidade adversário: {posicao} próximo a {obs} (dist={dist}): +{penalidade}")
     return penalidade
 
+RAIO_PENALIDADE = 2
+
+def penalidade_por_distancia(dist):
+    """
+    Penalidade gerada por um único adversário a uma distância de Chebyshev
+    Args:
+        dist: Distância (0 a RAIO_PENALIDADE) entre a célula e o adversário
+    Returns:
+        Valor da penalidade
+    """
+    return (300 - 100 * dist) if dist <= 1 else (100 - 30 * (dist-1))
+
+# ==================== CAMPO DE CUSTO ====================
+class CampoCusto:
+    """Máscara de bloqueio e penalidade de adversários pré-calculadas por célula"""
+
+    def __init__(self, obstaculos, largura_grid, altura_grid):
+        """
+        Constrói o campo a partir da lista de adversários
+        Args:
+            obstaculos: Lista de posições dos adversários
+            largura_grid: Largura do grid
+            altura_grid: Altura do grid
+
+        Cada adversário "carimba" sua vizinhança de raio RAIO_PENALIDADE, então a
+        construção custa O(adversários) e cada consulta posterior é O(1),
+        independente de quantos adversários existem.
+        """
+        self.largura = largura_grid
+        self.altura = altura_grid
+        n_celulas = largura_grid * altura_grid
+        self.bloqueado = bytearray(n_celulas)  # Quantidade de adversários na célula
+        self.penalidade = [0] * n_celulas      # Soma das penalidades de proximidade
+        for obs in obstaculos:
+            self.adicionar_obstaculo(obs)
+
+    def _carimbar(self, posicao, sinal):
+        """Soma (sinal=1) ou remove (sinal=-1) a contribuição de um adversário"""
+        ox, oy = posicao
+        largura = self.largura
+        if 0 <= ox < largura and 0 <= oy < self.altura:
+            self.bloqueado[oy * largura + ox] += sinal
+        for y in range(max(0, oy - RAIO_PENALIDADE), min(self.altura, oy + RAIO_PENALIDADE + 1)):
+            linha = y * largura
+            for x in range(max(0, ox - RAIO_PENALIDADE), min(largura, ox + RAIO_PENALIDADE + 1)):
+                self.penalidade[linha + x] += sinal * _KERNEL_PENALIDADE[max(abs(x - ox), abs(y - oy))]
+
+    def adicionar_obstaculo(self, posicao):
+        """Inclui um adversário no campo"""
+        self._carimbar(posicao, 1)
+
+    def remover_obstaculo(self, posicao):
+        """Retira um adversário previamente incluído no campo"""
+        self._carimbar(posicao, -1)
+
+    def celula(self, posicao):
+        """Índice plano da célula (x,y)"""
+        return posicao[1] * self.largura + posicao[0]
+
+    def esta_bloqueado(self, posicao):
+        """Indica se a posição contém um adversário"""
+        return self.bloqueado[self.celula(posicao)] > 0
+
+    def penalidade_em(self, posicao):
+        """Mesmo valor de calcular_penalidade_adversarios, em O(1)"""
+        return self.penalidade[self.celula(posicao)]
+
+_KERNEL_PENALIDADE = [penalidade_por_distancia(dist) for dist in range(RAIO_PENALIDADE + 1)]
+
+def definir_penalidades_proximidade(penalidades):
+    """
+    Troca as penalidades de proximidade de todo o processo (usado pela varredura de parâmetros)
+    Args:
+        penalidades: Penalidade de cada distância de Chebyshev, de 0 a RAIO_PENALIDADE
+                     (None restaura os valores de penalidade_por_distancia)
+
+    Os campos e as tabelas em cache continuam válidos: chave_cenario inclui as penalidades.
+    """
+    if penalidades is None:
+        penalidades = [penalidade_por_distancia(dist) for dist in range(RAIO_PENALIDADE + 1)]
+    if len(penalidades) != RAIO_PENALIDADE + 1 or min(penalidades) < 0:
+        raise ValueError(f"São necessárias {RAIO_PENALIDADE + 1} penalidades não negativas: {penalidades}")
+    _KERNEL_PENALIDADE[:] = penalidades
+
+def penalidades_proximidade():
+    """Penalidades de proximidade em uso, de 0 a RAIO_PENALIDADE (cópia)"""
+    return list(_KERNEL_PENALIDADE)
+
+class _PenalidadesSobDemanda(dict):
+    """Penalidade por célula calculada na primeira consulta a partir dos bytes do mapa"""
+
+    def __init__(self, mapa):
+        super().__init__()
+        self.mapa = mapa
+
+    def __missing__(self, celula):
+        mapa = self.mapa
+        largura, dados = mapa.largura, mapa.dados
+        cx, cy = celula % largura, celula // largura
+        penalidade = 0
+        for y in range(max(0, cy - RAIO_PENALIDADE), min(mapa.altura, cy + RAIO_PENALIDADE + 1)):
+            linha = y * largura
+            for x in range(max(0, cx - RAIO_PENALIDADE), min(largura, cx + RAIO_PENALIDADE + 1)):
+                if dados[linha + x]:
+                    penalidade += _KERNEL_PENALIDADE[max(abs(x - cx), abs(y - cy))]
+        self[celula] = penalidade
+        return penalidade
+
+class CampoCustoMapa(CampoCusto):
+    """
+    CampoCusto sobre um MapaOcupacao: os bloqueios são os próprios bytes do mapa
+    (sem cópia, inclusive quando vêm de um mmap) e as penalidades são calculadas só
+    para as células que a busca alcança, então a construção é O(1) mesmo em campos enormes
+    """
+
+    def __init__(self, mapa):
+        self.largura = mapa.largura
+        self.altura = mapa.altura
+        self.bloqueado = mapa.dados
+        self.penalidade = _PenalidadesSobDemanda(mapa)
+
+    def _carimbar(self, posicao, sinal):
+        raise TypeError("Campo de um MapaOcupacao: altere o mapa (ocupar/liberar) em vez do campo")
+
+# Cache dos campos mais recentes: o simulador replaneja várias vezes com o mesmo cenário
+TAMANHO_CACHE_CAMPOS = 8
+_cache_campos = OrderedDict()
+
+def chave_cenario(obstaculos, largura_grid, altura_grid):
+    """Chave de cache de tudo o que é pré-calculado por cenário (campos de custo, marcos)"""
+    if isinstance(obstaculos, MapaOcupacao):
+        # O mapa pode ter milhões de células: a chave é o próprio objeto e sua versão
+        return (largura_grid, altura_grid, id(obstaculos), obstaculos.versao, tuple(_KERNEL_PENALIDADE))
+    return (largura_grid, altura_grid, tuple(obstaculos), tuple(_KERNEL_PENALIDADE))
+
+def obter_campo_custo(obstaculos, largura_grid, altura_grid):
+    """
+    Retorna o CampoCusto do cenário, reaproveitando campos já construídos
+    Args:
+        obstaculos: Lista de posições dos adversários ou MapaOcupacao
+        largura_grid: Largura do grid
+        altura_grid: Altura do grid
+    Returns:
+        CampoCusto correspondente
+    """
+    chave = chave_cenario(obstaculos, largura_grid, altura_grid)
+    campo = _cache_campos.get(chave)
+    if campo is None:
+        if isinstance(obstaculos, MapaOcupacao):
+            campo = CampoCustoMapa(obstaculos)
+        else:
+            campo = CampoCusto(obstaculos, largura_grid, altura_grid)
+        _cache_campos[chave] = campo
+        if len(_cache_campos) > TAMANHO_CACHE_CAMPOS:
+            _cache_campos.popitem(last=False)
+    else:
+        _cache_campos.move_to_end(chave)
+    return campo
+
 # ==================== ALGORITMO PRINCIPAL ====================
-def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False, motor=None,
+                      heuristica=None, estatisticas=None, rastreamento=None, modelo=None, marcos=None, fila=None,
+                      pos_final=None, compacto=False):
+    """
+    Ponto de entrada do path finding: delega a busca ao motor escolhido
+    Args:
+        pos_inicial: Tupla (x,y) com a posição inicial
+        pos_objetivo: Tupla (x,y) com o objetivo
+        obstaculos: Lista de posições dos adversários, MapaOcupacao ou grade NumPy (altura, largura)
+        largura_grid: Largura do grid de busca
+        altura_grid: Altura do grid de busca
+        tem_bola: Indica se o robô começa com a bola
+        motor: "vetorial" ou "objetos" (None usa MOTOR_PADRAO)
+        heuristica: Função (posicao, direcao, tem_bola) -> estimativa, no lugar de calcular_heuristica
+                    (apenas motor vetorial)
+        estatisticas: EstatisticasBusca opcional, preenchida ao final da busca
+        rastreamento: RastreamentoBusca opcional que recebe cada estado expandido
+        modelo: ModeloCusto com os custos de movimento (None usa MODELO_PADRAO)
+        marcos: Número de marcos da heurística ALT ou uma TabelaMarcos (apenas motor vetorial,
+                ver heuristica_marcos.py)
+        fila: Nome da lista de abertos em fila_prioridade.FILAS (None usa FILA_PADRAO)
+        pos_final: Destino depois de pos_objetivo (o gol, com a bola): robô -> bola -> gol em uma
+                   única busca, ver encontrar_caminho_multiplo (apenas motor vetorial)
+        compacto: Devolve um caminho_compacto.CaminhoCompacto (trechos retos em vetores) no lugar
+                  da lista; o motor vetorial o monta sem criar uma tupla por célula
+    Returns:
+        Lista de posições representando o caminho encontrado (vazia se não houver)
+    """
+    motor = motor or MOTOR_PADRAO
+    if motor not in MOTORES:
+        raise ValueError(f"Motor de busca desconhecido: {motor!r} (opções: {', '.join(MOTORES)})")
+    if hasattr(obstaculos, "shape"):
+        # Grade NumPy (altura, largura): prefira converter uma vez com MapaOcupacao.de_array e reaproveitar
+        obstaculos = MapaOcupacao.de_array(obstaculos)
+    opcoes = {}
+    if heuristica is not None:
+        opcoes["heuristica"] = heuristica
+    if estatisticas is not None:
+        opcoes["estatisticas"] = estatisticas
+    if rastreamento is not None:
+        opcoes["rastreamento"] = rastreamento
+    if modelo is not None:
+        opcoes["modelo"] = modelo
+    marcos = resolver_marcos(marcos, obstaculos, largura_grid, altura_grid, modelo)
+    if marcos:
+        opcoes["marcos"] = marcos
+    if fila is not None:
+        opcoes["fila"] = fila
+    if pos_final is not None:
+        if motor != "vetorial" or heuristica is not None:
+            raise ValueError("pos_final só é suportado pelo motor vetorial com a heurística do modelo")
+        caminho = juntar_trechos(encontrar_caminho_multiplo(pos_inicial, [pos_objetivo, pos_final], obstaculos,
+                                                            largura_grid, altura_grid, tem_bola, **opcoes))
+    elif compacto and motor == "vetorial":
+        return encontrar_caminho_vetorial(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                          compacto=True, **opcoes)
+    else:
+        caminho = MOTORES[motor](pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, **opcoes)
+    if compacto:
+        from caminho_compacto import CaminhoCompacto
+        return CaminhoCompacto.de_posicoes(caminho)
+    return caminho
+
+def resolver_marcos(marcos, obstaculos, largura_grid, altura_grid, modelo=None):
+    """Converte um número de marcos na TabelaMarcos do cenário (em cache); tabelas e None passam direto"""
+    if isinstance(marcos, int):
+        if marcos <= 0:
+            return None
+        from heuristica_marcos import obter_tabela_marcos
+        return obter_tabela_marcos(obstaculos, largura_grid, altura_grid, marcos, modelo)
+    return marcos
+
+def encontrar_caminho_objetos(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                              estatisticas=None, rastreamento=None, modelo=None, fila=None):
     """
     Implementação do algoritmo A* para encontrar o caminho ótimo
     Args:
@@ -137,14 +462,20 @@ def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altur
         largura_grid: Largura do grid de busca
         altura_grid: Altura do grid de busca
         tem_bola: Indica se o robô começa com a bola
+        estatisticas: EstatisticasBusca opcional, preenchida ao final da busca
+        rastreamento: RastreamentoBusca opcional que recebe cada estado expandido
+        modelo: ModeloCusto com os custos de movimento (None usa MODELO_PADRAO)
+        fila: Nome da lista de abertos em fila_prioridade.FILAS (None usa FILA_PADRAO)
     Returns:
         Lista de posições representando o caminho encontrado (vazia se não houver)
 
-    - Nível Básico: Movimentos com custos diferenciados (reto:300, diagonal:100)
+    - Nível Básico: Movimentos com custos diferenciados (reto/diagonal, ver ModeloCusto)
     - Nível 1: Custo adicional para mudanças de direção
     - Nível 2: Custo aumentado com posse de bola
     - Nível 3: Penalidade por proximidade de adversários
     """
+    inicio = time.perf_counter()
+    modelo = modelo or MODELO_PADRAO
     logging.info("\n" + "="*50 + " INÍCIO DA BUSCA " + "="*50)
     logging.info(f"Origem: {pos_inicial} | Destino: {pos_objetivo} | Posse de bola: {tem_bola}")
     logging.info(f"Grid: {largura_grid}x{altura_grid} | Obstáculos: {len(obstaculos)}")
@@ -156,40 +487,57 @@ def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altur
     ]
     
     # Inicializa estruturas de dados
-    heap = []  # Fila de prioridade (abertos)
+    abertos = criar_fila(fila, modelo.tabela())  # Fila de prioridade de entradas (f, h, estado)
     fechados = set()  # Conjunto de estados já explorados
     
     # Adiciona o estado inicial
-    heapq.heappush(heap, Estado(
+    estado_inicial = Estado(
         posicao=pos_inicial,
         g=0,
-        h=calcular_heuristica(pos_inicial, pos_objetivo),
+        h=calcular_heuristica(pos_inicial, pos_objetivo, modelo),
         direcao_anterior=None,
         tem_bola=tem_bola
-    ))
+    )
+    abertos.inserir((estado_inicial.f, estado_inicial.h, estado_inicial))
+    expansoes = duplicados = pico_abertos = 0
+    insercoes = 1
+    inicio_busca = time.perf_counter()
 
-    while heap:
-        estado_atual = heapq.heappop(heap)
-        logging.info(f"\nExplorando estado: {estado_atual.posicao} | Custo: f={estado_atual.f} (g={estado_atual.g}, h={estado_atual.h})")
+    while abertos:
+        if len(abertos) > pico_abertos:
+            pico_abertos = len(abertos)
+        _, _, estado_atual = abertos.remover()
+        if DEBUG_MODE:
+            logging.debug(f"Explorando estado: {estado_atual.posicao} | Custo: f={estado_atual.f} (g={estado_atual.g}, h={estado_atual.h})")
 
         # Verifica se chegou ao objetivo
         if estado_atual.posicao == pos_objetivo:
+            fim_busca = time.perf_counter()
             caminho = []
             estado = estado_atual
             while estado:
                 caminho.append(estado.posicao)
                 estado = estado.pai
-            
+            caminho.reverse()
+
             logging.info("\n" + "="*50 + " CAMINHO ENCONTRADO " + "="*50)
             logging.info(f"Custo total: {estado_atual.g} | Passos: {len(caminho)}")
-            logging.info(f"Trajeto: {caminho[::-1]}")
-            return caminho[::-1]
+            logging.info(f"Trajeto: {caminho}")
+            if estatisticas is not None:
+                estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, estado_atual.g, len(caminho),
+                                       (inicio, inicio_busca, fim_busca, time.perf_counter()))
+            return caminho
 
         # Marca o estado como explorado
         chave_estado = (estado_atual.posicao, estado_atual.direcao_anterior, estado_atual.tem_bola)
         if chave_estado in fechados:
+            duplicados += 1
             continue
         fechados.add(chave_estado)
+        expansoes += 1
+        if rastreamento is not None:
+            rastreamento.registrar(estado_atual.posicao, estado_atual.direcao_anterior, estado_atual.tem_bola,
+                                   estado_atual.g, estado_atual.h)
 
         # Explora os vizinhos
         for movimento in movimentos:
@@ -200,18 +548,21 @@ def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altur
             
             # Verifica se a nova posição é válida
             if not (0 <= nova_pos[0] < largura_grid and 0 <= nova_pos[1] < altura_grid):
-                logging.debug(f"Posição inválida: {nova_pos} (fora do grid)")
+                if DEBUG_MODE:
+                    logging.debug(f"Posição inválida: {nova_pos} (fora do grid)")
                 continue
                 
             if nova_pos in obstaculos:
-                logging.debug(f"Posição inválida: {nova_pos} (obstáculo)")
+                if DEBUG_MODE:
+                    logging.debug(f"Posição inválida: {nova_pos} (obstáculo)")
                 continue
 
             # Calcula os custos do movimento
             custo_mov = calcular_custo_movimento(
                 estado_atual.direcao_anterior, 
                 movimento, 
-                estado_atual.tem_bola
+                estado_atual.tem_bola,
+                modelo
             )
             
             penalidade = calcular_penalidade_adversarios(nova_pos, obstaculos)
@@ -225,14 +576,467 @@ def encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altur
                 posicao=nova_pos,
                 pai=estado_atual,
                 g=novo_custo_g,
-                h=calcular_heuristica(nova_pos, pos_objetivo),
+                h=calcular_heuristica(nova_pos, pos_objetivo, modelo),
                 direcao_anterior=movimento,
                 tem_bola=nova_posse_bola
             )
             
             # Adiciona à fila de prioridade
-            heapq.heappush(heap, novo_estado)
-            logging.debug(f"Movimento válido: {movimento} -> {nova_pos} | Custo: {custo_mov} + Penalidade: {penalidade}")
+            abertos.inserir((novo_estado.f, novo_estado.h, novo_estado))
+            insercoes += 1
+            if DEBUG_MODE:
+                logging.debug(f"Movimento válido: {movimento} -> {nova_pos} | Custo: {custo_mov} + Penalidade: {penalidade}")
 
     logging.warning("Nenhum caminho válido encontrado!")
-    return []
\ No newline at end of file
+    if estatisticas is not None:
+        fim = time.perf_counter()
+        estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, None, 0,
+                               (inicio, inicio_busca, fim, fim))
+    return []
+
+# ==================== MOTOR VETORIAL ====================
+# Direções na mesma ordem do motor baseado em objetos; o índice SEM_DIRECAO
+# representa o estado inicial, que ainda não possui direção anterior.
+MOVIMENTOS = (
+    (1, 0), (-1, 0), (0, 1), (0, -1),  # Movimentos retos
+    (1, 1), (1, -1), (-1, 1), (-1, -1)  # Movimentos diagonais
+)
+SEM_DIRECAO = len(MOVIMENTOS)
+N_DIRECOES = SEM_DIRECAO + 1
+CUSTO_INFINITO = float('inf')
+
+# Acima deste número de elementos os vetores do espaço de busca viram dicionários:
+# em campos enormes a busca visita só uma fração dos estados
+LIMITE_VETORES_DENSOS = 4_000_000
+
+class VetorEsparso(dict):
+    """Dicionário com valor padrão que substitui uma lista pré-alocada grande demais"""
+
+    def __init__(self, padrao):
+        super().__init__()
+        self.padrao = padrao
+
+    def __missing__(self, indice):
+        return self.padrao
+
+def alocar_vetor(tamanho, padrao):
+    """
+    Vetor indexado por estado ou célula: lista pré-alocada ou VetorEsparso se for grande demais
+    Args:
+        tamanho: Número de posições
+        padrao: Valor inicial de todas as posições
+    """
+    if tamanho > LIMITE_VETORES_DENSOS:
+        return VetorEsparso(padrao)
+    return [padrao] * tamanho
+
+def granularidade_custos(custo_mov):
+    """
+    MDC dos custos de movimento e das penalidades de proximidade: todo f é múltiplo dele
+    Args:
+        custo_mov: Tabela de custos de movimento da busca
+    Returns:
+        O MDC (ao menos 1), ou None se algum custo não for inteiro
+    """
+    custos = [*custo_mov, *_KERNEL_PENALIDADE]
+    if not all(float(custo).is_integer() for custo in custos):
+        return None
+    return math.gcd(*(int(custo) for custo in custos)) or 1
+
+def criar_fila(fila, custo_mov):
+    """
+    Instancia a lista de abertos
+    Args:
+        fila: Nome em fila_prioridade.FILAS (None usa FILA_PADRAO)
+        custo_mov: Tabela de custos de movimento da busca
+    Returns:
+        Fila pronta para a busca; a de baldes recebe a granularidade de granularidade_custos
+
+    A fila de baldes depende de custos inteiros: com algum custo fracionário (no
+    ModeloCusto ou nas penalidades de proximidade) a busca usa a fila binária.
+    """
+    if fila is None:
+        fila = FILA_PADRAO
+    if fila not in FILAS:
+        raise ValueError(f"Fila desconhecida: {fila} (disponíveis: {', '.join(FILAS)})")
+    if fila != "baldes":
+        return FILAS[fila]()
+    granularidade = granularidade_custos(custo_mov)
+    if granularidade is None:
+        logging.info("Fila de baldes: há custos não inteiros no modelo ou nas penalidades; usando a fila binária")
+        return FILAS["binaria"]()
+    return FILAS[fila](granularidade)
+
+def alocar_marcas(tamanho):
+    """Bitmap de marcas (0/1) indexado por estado: bytearray ou VetorEsparso se for grande demais"""
+    if tamanho > LIMITE_VETORES_DENSOS:
+        return VetorEsparso(0)
+    return bytearray(tamanho)
+
+def tabela_custo_movimento(modelo=None):
+    """
+    Pré-calcula calcular_custo_movimento para todas as combinações de direções
+    Args:
+        modelo: ModeloCusto (None usa MODELO_PADRAO)
+    Returns:
+        Lista plana indexada por ((bola * N_DIRECOES) + direcao_anterior) * 8 + nova_direcao
+    """
+    return (modelo or MODELO_PADRAO).tabela()
+
+def encontrar_caminho_vetorial(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                               heuristica=None, estatisticas=None, rastreamento=None, modelo=None, marcos=None,
+                               fila=None, compacto=False):
+    """
+    A* com o espaço de busca guardado em vetores planos pré-alocados
+    Args:
+        pos_inicial: Tupla (x,y) com a posição inicial
+        pos_objetivo: Tupla (x,y) com o objetivo
+        obstaculos: Lista de posições dos adversários
+        largura_grid: Largura do grid de busca
+        altura_grid: Altura do grid de busca
+        tem_bola: Indica se o robô começa com a bola
+        heuristica: Função opcional (posicao, direcao, tem_bola) -> estimativa do custo restante
+        estatisticas: EstatisticasBusca opcional, preenchida ao final da busca
+        rastreamento: RastreamentoBusca opcional que recebe cada estado expandido
+        modelo: ModeloCusto com os custos de movimento (None usa MODELO_PADRAO)
+        marcos: TabelaMarcos do cenário: a heurística passa a ser o máximo entre a do modelo e a ALT
+        fila: Nome da lista de abertos em fila_prioridade.FILAS (None usa FILA_PADRAO)
+        compacto: Devolve um CaminhoCompacto montado direto da cadeia de pais (ver reconstruir_compacto)
+    Returns:
+        Lista de posições representando o caminho encontrado (vazia se não houver)
+
+    Cada estado (célula, direção anterior, bola) vira um inteiro
+    ((celula * N_DIRECOES) + direcao) * 2 + bola, usado como índice nos vetores
+    de custo g, de pais e no bitmap de fechados. Nenhum objeto é criado por
+    expansão e vizinhos dominados (g maior ou igual ao já conhecido) não entram na fila.
+    Bloqueios e penalidades são lidos do CampoCusto do cenário (ver obter_campo_custo).
+    Em campos muito grandes os vetores viram dicionários (ver alocar_vetor).
+    """
+    inicio = time.perf_counter()
+    logging.info(f"Busca vetorial: {pos_inicial} -> {pos_objetivo} | Posse de bola: {tem_bola} | "
+                 f"Grid: {largura_grid}x{altura_grid} | Obstáculos: {len(obstaculos)}")
+
+    n_celulas = largura_grid * altura_grid
+    n_estados = n_celulas * N_DIRECOES * 2
+    modelo = modelo or MODELO_PADRAO
+    custo_mov = modelo.tabela()
+    estimar = modelo.heuristica
+    gx, gy = pos_objetivo
+    estimar_marcos = marcos.estimador(pos_objetivo) if marcos else None
+
+    g = alocar_vetor(n_estados, CUSTO_INFINITO)
+    pai = alocar_vetor(n_estados, -1)
+    fechados = alocar_marcas(n_estados)
+
+    campo = obter_campo_custo(obstaculos, largura_grid, altura_grid)
+    bloqueado = campo.bloqueado
+    penalidades = campo.penalidade
+    heuristicas = alocar_vetor(n_celulas, -1)  # Calculadas sob demanda (-1 = ainda não calculada)
+
+    celula_objetivo = pos_objetivo[1] * largura_grid + pos_objetivo[0]
+    celula_inicial = pos_inicial[1] * largura_grid + pos_inicial[0]
+    estado_inicial = (celula_inicial * N_DIRECOES + SEM_DIRECAO) * 2 + (1 if tem_bola else 0)
+    if heuristica is None:
+        h_inicial = estimar(pos_inicial[0] - gx, pos_inicial[1] - gy)
+        if estimar_marcos is not None:
+            h_inicial = max(h_inicial, estimar_marcos(celula_inicial))
+    else:
+        h_inicial = heuristica(pos_inicial, None, tem_bola)
+
+    g[estado_inicial] = 0
+    abertos = criar_fila(fila, custo_mov)
+    abertos.inserir((h_inicial, h_inicial, estado_inicial))
+    inserir = abertos.inserir
+    remover = abertos.remover
+    # Contadores locais: só vão para o objeto de estatísticas no final
+    expansoes = duplicados = pico_abertos = 0
+    insercoes = 1
+    registrar = rastreamento.registrar if rastreamento is not None else None
+    inicio_busca = time.perf_counter()
+
+    while abertos:
+        if len(abertos) > pico_abertos:
+            pico_abertos = len(abertos)
+        _, h_atual, estado = remover()
+        if fechados[estado]:
+            duplicados += 1
+            continue
+        fechados[estado] = 1
+        expansoes += 1
+
+        bola = estado & 1
+        celula, direcao = divmod(estado >> 1, N_DIRECOES)
+
+        if celula == celula_objetivo:
+            fim_busca = time.perf_counter()
+            custo_total = g[estado]
+            if compacto:
+                caminho = reconstruir_compacto(pai, estado, largura_grid)
+            else:
+                caminho = []
+                while estado != -1:
+                    celula_caminho = (estado >> 1) // N_DIRECOES
+                    caminho.append((celula_caminho % largura_grid, celula_caminho // largura_grid))
+                    estado = pai[estado]
+                caminho.reverse()
+            logging.info(f"Caminho encontrado | Custo total: {custo_total} | Passos: {len(caminho)}")
+            if estatisticas is not None:
+                estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, custo_total,
+                                       len(caminho), (inicio, inicio_busca, fim_busca, time.perf_counter()))
+            return caminho
+
+        if DEBUG_MODE:
+            logging.debug(f"Explorando célula {celula} | direção {direcao} | g={g[estado]}")
+
+        g_atual = g[estado]
+        x, y = celula % largura_grid, celula // largura_grid
+        base_custo = (bola * N_DIRECOES + direcao) * 8
+        if registrar is not None:
+            registrar((x, y), MOVIMENTOS[direcao] if direcao != SEM_DIRECAO else None, bola == 1, g_atual, h_atual)
+
+        for indice, (dx, dy) in enumerate(MOVIMENTOS):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < largura_grid and 0 <= ny < altura_grid):
+                continue
+            nova_celula = ny * largura_grid + nx
+            if bloqueado[nova_celula]:
+                continue
+
+            novo_g = g_atual + custo_mov[base_custo + indice] + penalidades[nova_celula]
+            nova_bola = 1 if nova_celula == celula_objetivo else bola
+            novo_estado = (nova_celula * N_DIRECOES + indice) * 2 + nova_bola
+            if novo_g >= g[novo_estado] or fechados[novo_estado]:
+                continue
+
+            if heuristica is None:
+                h = heuristicas[nova_celula]
+                if h < 0:
+                    h = estimar(nx - gx, ny - gy)
+                    if estimar_marcos is not None:
+                        h = max(h, estimar_marcos(nova_celula))
+                    heuristicas[nova_celula] = h
+                if h == CUSTO_INFINITO:
+                    continue  # Os marcos provam que não há caminho até o objetivo
+            else:
+                h = heuristica((nx, ny), MOVIMENTOS[indice], nova_bola == 1)
+                if h == CUSTO_INFINITO:
+                    continue  # Estado sem caminho até o objetivo
+
+            g[novo_estado] = novo_g
+            pai[novo_estado] = estado
+            inserir((novo_g + h, h, novo_estado))
+            insercoes += 1
+
+    logging.warning("Nenhum caminho válido encontrado!")
+    if estatisticas is not None:
+        fim = time.perf_counter()
+        estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, None, 0,
+                               (inicio, inicio_busca, fim, fim))
+    return []
+
+# ==================== BUSCA COM VÁRIOS OBJETIVOS ====================
+def reconstruir_compacto(pai, estado, largura_grid):
+    """
+    CaminhoCompacto do estado inicial até estado, lido da cadeia de pais da busca vetorial
+    A direção de chegada já está codificada em cada estado: os trechos retos saem dela,
+    sem montar nem inverter a lista de células
+    """
+    from caminho_compacto import CaminhoCompacto
+    direcoes = array('b')
+    repeticoes = array('i')
+    while pai[estado] != -1:
+        direcao = (estado >> 1) % N_DIRECOES
+        if direcoes and direcoes[-1] == direcao:
+            repeticoes[-1] += 1
+        else:
+            direcoes.append(direcao)
+            repeticoes.append(1)
+        estado = pai[estado]
+    direcoes.reverse()
+    repeticoes.reverse()
+    celula = (estado >> 1) // N_DIRECOES
+    return CaminhoCompacto((celula % largura_grid, celula // largura_grid), direcoes, repeticoes)
+
+def encontrar_caminho_multiplo(pos_inicial, objetivos, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                               estatisticas=None, rastreamento=None, modelo=None, marcos=None, fila=None):
+    """
+    Uma única busca por uma sequência de objetivos (ex.: [bola, gol])
+    Args:
+        pos_inicial: Tupla (x,y) com a posição inicial
+        objetivos: Lista de posições a visitar em ordem; a posse de bola começa no primeiro
+        obstaculos: Lista de posições dos adversários ou MapaOcupacao
+        largura_grid: Largura do grid de busca
+        altura_grid: Altura do grid de busca
+        tem_bola: Indica se o robô já começa com a bola
+        estatisticas: EstatisticasBusca opcional, preenchida ao final da busca
+        rastreamento: RastreamentoBusca opcional que recebe cada estado expandido
+        modelo: ModeloCusto com os custos de movimento (None usa MODELO_PADRAO)
+        marcos: Número de marcos da heurística ALT ou uma TabelaMarcos
+        fila: Nome da lista de abertos em fila_prioridade.FILAS (None usa FILA_PADRAO)
+    Returns:
+        Lista de trechos, um por objetivo: o trecho i vai do objetivo anterior (ou da posição
+        inicial) até objetivos[i], incluindo as duas pontas. Vazia se não houver caminho.
+
+    Mesmo motor vetorial, com o índice do trecho no estado:
+    ((celula * N_DIRECOES) + direcao) * n_trechos + trecho. A direção atravessa a troca
+    de trecho, então a rotação para sair da bola em direção ao gol (com custo dobrado)
+    entra na busca e o custo total é ótimo. A heurística é a estimativa até o objetivo
+    do trecho atual somada às estimativas entre os objetivos seguintes.
+    """
+    inicio = time.perf_counter()
+    logging.info(f"Busca com {len(objetivos)} objetivos: {pos_inicial} -> {' -> '.join(map(str, objetivos))} | "
+                 f"Posse de bola: {tem_bola} | Grid: {largura_grid}x{altura_grid} | Obstáculos: {len(obstaculos)}")
+    if not objetivos:
+        raise ValueError("encontrar_caminho_multiplo precisa de pelo menos um objetivo")
+
+    modelo = modelo or MODELO_PADRAO
+    custo_mov = modelo.tabela()
+    estimar = modelo.heuristica
+    marcos = resolver_marcos(marcos, obstaculos, largura_grid, altura_grid, modelo)
+    estimadores_marcos = [marcos.estimador(objetivo) for objetivo in objetivos] if marcos else None
+
+    n_trechos = len(objetivos)
+    ultimo = n_trechos - 1
+    celulas_objetivo = [y * largura_grid + x for x, y in objetivos]
+    bola_no_trecho = [1 if tem_bola or trecho > 0 else 0 for trecho in range(n_trechos)]
+
+    def estimar_trecho(x, y, celula, trecho):
+        gx, gy = objetivos[trecho]
+        h = estimar(x - gx, y - gy)
+        if estimadores_marcos is not None:
+            h = max(h, estimadores_marcos[trecho](celula))
+        return h
+
+    # Estimativa fixa do restante da sequência a partir do objetivo de cada trecho
+    restante = [0] * n_trechos
+    for trecho in range(ultimo - 1, -1, -1):
+        x, y = objetivos[trecho]
+        restante[trecho] = restante[trecho + 1] + estimar_trecho(x, y, celulas_objetivo[trecho], trecho + 1)
+
+    n_celulas = largura_grid * altura_grid
+    n_estados = n_celulas * N_DIRECOES * n_trechos
+    g = alocar_vetor(n_estados, CUSTO_INFINITO)
+    pai = alocar_vetor(n_estados, -1)
+    fechados = alocar_marcas(n_estados)
+    heuristicas = alocar_vetor(n_celulas * n_trechos, -1)
+
+    campo = obter_campo_custo(obstaculos, largura_grid, altura_grid)
+    bloqueado = campo.bloqueado
+    penalidades = campo.penalidade
+
+    # Objetivos sobre a posição inicial já estão cumpridos
+    trecho_inicial = 0
+    while trecho_inicial < ultimo and pos_inicial == objetivos[trecho_inicial]:
+        trecho_inicial += 1
+    celula_inicial = pos_inicial[1] * largura_grid + pos_inicial[0]
+    estado_inicial = (celula_inicial * N_DIRECOES + SEM_DIRECAO) * n_trechos + trecho_inicial
+    h_inicial = estimar_trecho(pos_inicial[0], pos_inicial[1], celula_inicial, trecho_inicial) + restante[trecho_inicial]
+
+    g[estado_inicial] = 0
+    abertos = criar_fila(fila, custo_mov)
+    abertos.inserir((h_inicial, h_inicial, estado_inicial))
+    inserir = abertos.inserir
+    remover = abertos.remover
+    expansoes = duplicados = pico_abertos = 0
+    insercoes = 1
+    registrar = rastreamento.registrar if rastreamento is not None else None
+    inicio_busca = time.perf_counter()
+
+    while abertos:
+        if len(abertos) > pico_abertos:
+            pico_abertos = len(abertos)
+        _, h_atual, estado = remover()
+        if fechados[estado]:
+            duplicados += 1
+            continue
+        fechados[estado] = 1
+        expansoes += 1
+
+        celula_direcao, trecho = divmod(estado, n_trechos)
+        celula, direcao = divmod(celula_direcao, N_DIRECOES)
+        alvo = celulas_objetivo[trecho]
+
+        if trecho == ultimo and celula == alvo:
+            fim_busca = time.perf_counter()
+            custo_total = g[estado]
+            sequencia = []
+            while estado != -1:
+                celula_caminho = estado // n_trechos // N_DIRECOES
+                sequencia.append(((celula_caminho % largura_grid, celula_caminho // largura_grid), estado % n_trechos))
+                estado = pai[estado]
+            sequencia.reverse()
+
+            # Divide a sequência onde o trecho muda: a posição da troca fecha um trecho e abre o seguinte
+            trechos = [[pos_inicial] for _ in range(trecho_inicial)]
+            atual = [pos_inicial]
+            trecho_anterior = trecho_inicial
+            for posicao, trecho_posicao in sequencia[1:]:
+                atual.append(posicao)
+                for _ in range(trecho_anterior, trecho_posicao):
+                    trechos.append(atual)
+                    atual = [posicao]
+                trecho_anterior = trecho_posicao
+            trechos.append(atual)
+
+            logging.info(f"Caminho encontrado | Custo total: {custo_total} | Passos: {len(sequencia)}")
+            if estatisticas is not None:
+                estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, custo_total,
+                                       len(sequencia), (inicio, inicio_busca, fim_busca, time.perf_counter()))
+            return trechos
+
+        g_atual = g[estado]
+        x, y = celula % largura_grid, celula // largura_grid
+        base_custo = (bola_no_trecho[trecho] * N_DIRECOES + direcao) * 8
+        if registrar is not None:
+            registrar((x, y), MOVIMENTOS[direcao] if direcao != SEM_DIRECAO else None, bola_no_trecho[trecho] == 1,
+                      g_atual, h_atual)
+
+        for indice, (dx, dy) in enumerate(MOVIMENTOS):
+            nx, ny = x + dx, y + dy
+            if not (0 <= nx < largura_grid and 0 <= ny < altura_grid):
+                continue
+            nova_celula = ny * largura_grid + nx
+            if bloqueado[nova_celula]:
+                continue
+
+            novo_g = g_atual + custo_mov[base_custo + indice] + penalidades[nova_celula]
+            novo_trecho = trecho
+            if nova_celula == alvo:
+                while novo_trecho < ultimo and nova_celula == celulas_objetivo[novo_trecho]:
+                    novo_trecho += 1
+            novo_estado = (nova_celula * N_DIRECOES + indice) * n_trechos + novo_trecho
+            if novo_g >= g[novo_estado] or fechados[novo_estado]:
+                continue
+
+            indice_h = nova_celula * n_trechos + novo_trecho
+            h = heuristicas[indice_h]
+            if h < 0:
+                h = heuristicas[indice_h] = estimar_trecho(nx, ny, nova_celula, novo_trecho) + restante[novo_trecho]
+            if h == CUSTO_INFINITO:
+                continue
+
+            g[novo_estado] = novo_g
+            pai[novo_estado] = estado
+            inserir((novo_g + h, h, novo_estado))
+            insercoes += 1
+
+    logging.warning("Nenhum caminho válido encontrado!")
+    if estatisticas is not None:
+        fim = time.perf_counter()
+        estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, None, 0,
+                               (inicio, inicio_busca, fim, fim))
+    return []
+
+def juntar_trechos(trechos):
+    """Caminho único a partir dos trechos de encontrar_caminho_multiplo (sem repetir as junções)"""
+    if not trechos:
+        return []
+    caminho = list(trechos[0])
+    for trecho in trechos[1:]:
+        caminho.extend(trecho[1:])
+    return caminho
+
+MOTORES = {
+    "vetorial": encontrar_caminho_vetorial,
+    "objetos": encontrar_caminho_objetos,
+}
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Geração vetorizada de cenários e corpus de cenários em disco.
+
+gerar_lote sorteia muitos cenários de uma vez com as mesmas regras de
+simulacao.resetar_cenario: robô nas três primeiras colunas, gol na última, bola na
+metade do adversário e adversários em x >= 3, a distância de Manhattan >= 3 do
+robô, > 1 do gol, fora da bola e sem sobreposição. Em vez de sortear e rejeitar
+adversário por adversário, cada célula válida de cada cenário recebe uma chave
+aleatória e os adversários são as max_obstaculos células de menor chave: uma
+amostra uniforme sem reposição, como a do laço original, feita com NumPy.
+
+O corpus é um .npz sem compressão com um cenário por linha. Os adversários de
+todos os cenários ficam concatenados em um único vetor, que é mapeado em memória
+ao abrir o arquivo: cada cenário é montado só quando é lido.
+
+Vetores do arquivo (n cenários):
+    versao, semente          escalares
+    grupo                    (n,) texto "LxA@densidade"
+    largura, altura          (n,)
+    robo, bola, gol          (n, 2) posições (x, y)
+    inicio                   (n+1,) início dos adversários de cada cenário em obstaculos
+    obstaculos               (total, 2) posições (x, y)
+'''
+
+import argparse
+import logging
+import time
+import zipfile
+
+import numpy
+from numpy.lib import format as formato_npy
+
+VERSAO_CORPUS = 1
+# Regras de posicionamento de simulacao.resetar_cenario
+COLUNA_MINIMA_ADVERSARIOS = 3
+DISTANCIA_MINIMA_ROBO = 3
+# Cenários sorteados por vez (limita a memória das chaves aleatórias)
+CENARIOS_POR_BLOCO = 1024
+
+# ==================== GERAÇÃO ====================
+def gerar_lote(n_cenarios, largura_grid, altura_grid, max_obstaculos, rng):
+    """
+    Sorteia vários cenários de uma vez
+    Args:
+        n_cenarios: Quantidade de cenários
+        largura_grid: Largura da grade
+        altura_grid: Altura da grade
+        max_obstaculos: Adversários por cenário (menos se não houver células válidas suficientes)
+        rng: numpy.random.Generator
+    Returns:
+        Dicionário com robo, bola e gol (n, 2), obstaculos (n, max_obstaculos, 2) e
+        n_obstaculos (n,): os n_obstaculos primeiros adversários de cada linha são os válidos
+    """
+    n = n_cenarios
+    robo = numpy.stack([rng.integers(0, min(2, largura_grid - 1) + 1, n), rng.integers(0, altura_grid, n)], axis=1)
+    gol = numpy.stack([numpy.full(n, largura_grid - 1), rng.integers(0, altura_grid, n)], axis=1)
+    bola = numpy.empty_like(robo)
+    sortear = numpy.ones(n, dtype=bool)
+    while sortear.any():
+        k = int(sortear.sum())
+        bola[sortear] = numpy.stack([rng.integers(largura_grid // 2, largura_grid, k), rng.integers(0, altura_grid, k)],
+                                    axis=1)
+        sortear = (bola == gol).all(axis=1) | (bola == robo).all(axis=1)
+
+    n_celulas = largura_grid * altura_grid
+    k = min(max_obstaculos, n_celulas)
+    obstaculos = numpy.zeros((n, k, 2), dtype=numpy.int64)
+    n_obstaculos = numpy.zeros(n, dtype=numpy.int64)
+    xs = numpy.arange(n_celulas) % largura_grid
+    ys = numpy.arange(n_celulas) // largura_grid
+    for inicio in range(0, n, CENARIOS_POR_BLOCO):
+        fim = min(n, inicio + CENARIOS_POR_BLOCO)
+        r, g, b = robo[inicio:fim, :, None], gol[inicio:fim, :, None], bola[inicio:fim, :, None]
+        validas = ((xs >= COLUNA_MINIMA_ADVERSARIOS) &
+                   (numpy.abs(xs - r[:, 0]) + numpy.abs(ys - r[:, 1]) >= DISTANCIA_MINIMA_ROBO) &
+                   (numpy.abs(xs - g[:, 0]) + numpy.abs(ys - g[:, 1]) > 1) &
+                   ~((xs == b[:, 0]) & (ys == b[:, 1])))
+        n_obstaculos[inicio:fim] = numpy.minimum(validas.sum(axis=1), k)
+        if k == 0:
+            continue
+        chaves = rng.random(validas.shape)
+        chaves[~validas] = 2.0  # Células inválidas ficam depois de todas as válidas
+        escolhidas = numpy.argpartition(chaves, k - 1, axis=1)[:, :k]
+        # Ordena as escolhidas pela chave: válidas primeiro, em ordem aleatória
+        escolhidas = numpy.take_along_axis(escolhidas, numpy.argsort(numpy.take_along_axis(chaves, escolhidas, axis=1),
+                                                                     axis=1), axis=1)
+        obstaculos[inicio:fim, :, 0] = xs[escolhidas]
+        obstaculos[inicio:fim, :, 1] = ys[escolhidas]
+
+    faltando = int((n_obstaculos < max_obstaculos).sum())
+    if faltando:
+        logging.warning(f"{faltando} cenários sem células válidas para {max_obstaculos} adversários")
+    return {"robo": robo, "bola": bola, "gol": gol, "obstaculos": obstaculos, "n_obstaculos": n_obstaculos}
+
+# ==================== CORPUS EM DISCO ====================
+def gerar_corpus(caminho_arquivo, tamanhos, densidades, n_cenarios, semente):
+    """
+    Sorteia e grava um corpus com n_cenarios por combinação de tamanho e densidade
+    Args:
+        caminho_arquivo: Arquivo .npz de destino
+        tamanhos: Lista de tuplas (largura, altura)
+        densidades: Frações de células ocupadas por adversários
+        n_cenarios: Cenários por combinação
+        semente: Semente mestre (cada grupo tem seu próprio gerador derivado dela)
+    Returns:
+        Quantidade de cenários gravados
+    """
+    grupos, larguras, alturas, robos, bolas, gols, obstaculos, contagens = [], [], [], [], [], [], [], []
+    for largura, altura in tamanhos:
+        for densidade in densidades:
+            rng = numpy.random.default_rng([semente, largura, altura, round(densidade * 1000)])
+            lote = gerar_lote(n_cenarios, largura, altura, int(densidade * largura * altura), rng)
+            grupos += [f"{largura}x{altura}@{densidade:.2f}"] * n_cenarios
+            larguras += [largura] * n_cenarios
+            alturas += [altura] * n_cenarios
+            robos.append(lote["robo"])
+            bolas.append(lote["bola"])
+            gols.append(lote["gol"])
+            for linha, quantidade in zip(lote["obstaculos"], lote["n_obstaculos"]):
+                obstaculos.append(linha[:quantidade])
+                contagens.append(quantidade)
+
+    maior = max(larguras + alturas, default=0)
+    tipo = numpy.int16 if maior <= numpy.iinfo(numpy.int16).max else numpy.int32
+    numpy.savez(caminho_arquivo, versao=VERSAO_CORPUS, semente=semente, grupo=numpy.array(grupos),
+                largura=numpy.array(larguras, dtype=numpy.int32), altura=numpy.array(alturas, dtype=numpy.int32),
+                robo=numpy.concatenate(robos).astype(tipo), bola=numpy.concatenate(bolas).astype(tipo),
+                gol=numpy.concatenate(gols).astype(tipo),
+                inicio=numpy.concatenate([[0], numpy.cumsum(contagens)]).astype(numpy.int64),
+                obstaculos=(numpy.concatenate(obstaculos) if obstaculos else numpy.zeros((0, 2))).astype(tipo))
+    return len(grupos)
+
+def _mapear_membro(caminho_arquivo, nome):
+    """Vetor de um membro sem compressão do .npz mapeado em memória (None se estiver comprimido)"""
+    with zipfile.ZipFile(caminho_arquivo) as arquivo_zip:
+        info = arquivo_zip.getinfo(nome + ".npy")
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(caminho_arquivo, "rb") as arquivo:
+        # Cabeçalho local do zip: 30 bytes fixos + nome + campo extra
+        arquivo.seek(info.header_offset + 26)
+        tamanho_nome, tamanho_extra = numpy.frombuffer(arquivo.read(4), dtype="<u2")
+        arquivo.seek(info.header_offset + 30 + int(tamanho_nome) + int(tamanho_extra))
+        versao = formato_npy.read_magic(arquivo)
+        if versao == (1, 0):
+            forma, fortran, tipo = formato_npy.read_array_header_1_0(arquivo)
+        else:
+            forma, fortran, tipo = formato_npy.read_array_header_2_0(arquivo)
+        deslocamento = arquivo.tell()
+    if fortran or 0 in forma:
+        return None
+    return numpy.memmap(caminho_arquivo, dtype=tipo, mode="r", offset=deslocamento, shape=forma)
+
+class CorpusCenarios:
+    """Corpus gravado por gerar_corpus, lido cenário a cenário"""
+
+    def __init__(self, caminho_arquivo):
+        """
+        Args:
+            caminho_arquivo: Arquivo .npz do corpus
+        """
+        self.caminho_arquivo = caminho_arquivo
+        with numpy.load(caminho_arquivo, allow_pickle=False) as arquivo:
+            if int(arquivo["versao"]) != VERSAO_CORPUS:
+                raise ValueError(f"{caminho_arquivo}: versão de corpus {int(arquivo['versao'])} não suportada")
+            self.semente = int(arquivo["semente"])
+            self.grupo = arquivo["grupo"]
+            self.largura, self.altura = arquivo["largura"], arquivo["altura"]
+            self.robo, self.bola, self.gol = arquivo["robo"], arquivo["bola"], arquivo["gol"]
+            self.inicio = arquivo["inicio"]
+            obstaculos = _mapear_membro(caminho_arquivo, "obstaculos")
+            self.obstaculos = obstaculos if obstaculos is not None else arquivo["obstaculos"]
+
+    def __len__(self):
+        return len(self.grupo)
+
+    def __getitem__(self, indice):
+        """
+        Cenário no formato de simulacao.resetar_cenario, com largura_grid, altura_grid e grupo
+        """
+        if not -len(self) <= indice < len(self):
+            raise IndexError(indice)
+        indice %= len(self)
+        obstaculos = self.obstaculos[self.inicio[indice]:self.inicio[indice + 1]].tolist()
+        return {
+            "pos_robo": tuple(self.robo[indice].tolist()), "pos_bola": tuple(self.bola[indice].tolist()),
+            "pos_gol": tuple(self.gol[indice].tolist()), "obstaculos": [tuple(posicao) for posicao in obstaculos],
+            "tem_bola": False, "caminho_atual": [], "simulacao_rodando": False,
+            "mensagem": f"Cenário {indice} do corpus",
+            "passos": 0, "replanejamentos": 0, "tempo_planejamento": 0.0,
+            "largura_grid": int(self.largura[indice]), "altura_grid": int(self.altura[indice]),
+            "grupo": str(self.grupo[indice]),
+        }
+
+    def __iter__(self):
+        for indice in range(len(self)):
+            yield self[indice]
+
+# Corpus abertos neste processo (cada processo da varredura abre o arquivo uma vez)
+_corpus_abertos = {}
+
+def abrir_corpus(caminho_arquivo):
+    """CorpusCenarios do arquivo, aberto uma única vez por processo"""
+    corpus = _corpus_abertos.get(caminho_arquivo)
+    if corpus is None:
+        corpus = _corpus_abertos[caminho_arquivo] = CorpusCenarios(caminho_arquivo)
+    return corpus
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera um corpus de cenários sorteados com semente")
+    parser.add_argument("saida", help="Arquivo .npz a gravar")
+    parser.add_argument("--tamanhos", nargs="+", default=["20x15", "40x30"], help="Ex.: 20x15 40x30")
+    parser.add_argument("--densidades", type=float, nargs="+", default=[0.10, 0.20])
+    parser.add_argument("--cenarios", type=int, default=1000, help="Cenários por tamanho e densidade")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    tamanhos = [tuple(int(v) for v in tamanho.split("x")) for tamanho in args.tamanhos]
+    inicio = time.perf_counter()
+    total = gerar_corpus(args.saida, tamanhos, args.densidades, args.cenarios, args.semente)
+    print(f"{args.saida}: {total} cenários em {time.perf_counter() - inicio:.2f}s")
+
+if __name__ == '__main__':
+    main()
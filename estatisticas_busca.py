@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Estatísticas e rastreamento das buscas, sem log por nó.
+
+EstatisticasBusca é preenchida pelo planejador ao final da busca (os contadores
+são variáveis locais durante o laço). RastreamentoBusca guarda os últimos estados
+expandidos em um buffer circular apenas quando é passado ao planejador; o
+descarregamento envia o lote inteiro como um único registro de log para uma fila,
+e a formatação e a escrita em arquivo acontecem na thread do QueueListener.
+'''
+
+import logging
+import logging.handlers
+import queue
+from collections import deque
+
+NOME_LOGGER_RASTREAMENTO = "edrom.rastreamento"
+
+# ==================== ESTATÍSTICAS ====================
+class EstatisticasBusca:
+    """Resumo de uma busca, preenchido por encontrar_caminho(..., estatisticas=obj)"""
+
+    def __init__(self):
+        self.expansoes = 0        # Estados retirados do heap e expandidos
+        self.insercoes = 0        # Entradas colocadas no heap
+        self.duplicados = 0       # Retiradas de estados já fechados (descartadas)
+        self.pico_abertos = 0     # Maior tamanho do heap
+        self.custo = None         # Custo do caminho encontrado (None se não houver)
+        self.passos = 0           # Posições no caminho
+        self.tempos = {}          # Fase ("preparacao", "busca", "reconstrucao") -> segundos
+
+    @property
+    def tempo_total(self):
+        return sum(self.tempos.values())
+
+    def preencher(self, expansoes, insercoes, duplicados, pico_abertos, custo, passos, marcas):
+        """
+        Copia os contadores locais da busca
+        Args:
+            marcas: Instantes de time.perf_counter (início, início do laço, fim do laço, fim da reconstrução)
+        """
+        self.expansoes = expansoes
+        self.insercoes = insercoes
+        self.duplicados = duplicados
+        self.pico_abertos = pico_abertos
+        self.custo = custo
+        self.passos = passos
+        inicio, inicio_busca, fim_busca, fim = marcas
+        self.tempos = {"preparacao": inicio_busca - inicio, "busca": fim_busca - inicio_busca,
+                       "reconstrucao": fim - fim_busca}
+
+    def como_dicionario(self):
+        return {"expansoes": self.expansoes, "insercoes": self.insercoes, "duplicados": self.duplicados,
+                "pico_abertos": self.pico_abertos, "custo": self.custo, "passos": self.passos,
+                "tempos": dict(self.tempos)}
+
+    def __repr__(self):
+        tempos = ", ".join(f"{fase}={1000 * segundos:.2f}ms" for fase, segundos in self.tempos.items())
+        return (f"EstatisticasBusca(expansoes={self.expansoes}, insercoes={self.insercoes}, "
+                f"duplicados={self.duplicados}, pico_abertos={self.pico_abertos}, custo={self.custo}, "
+                f"passos={self.passos}, {tempos})")
+
+# ==================== RASTREAMENTO ====================
+class _LoteRastreamento:
+    """Lote de estados expandidos; só vira texto quando o handler final formata o registro"""
+
+    def __init__(self, rotulo, entradas):
+        self.rotulo = rotulo
+        self.entradas = entradas
+
+    def __str__(self):
+        linhas = [f"{self.rotulo}: {len(self.entradas)} estados expandidos"]
+        for posicao, direcao, tem_bola, g, h in self.entradas:
+            linhas.append(f"  {posicao} | direção {direcao} | bola {int(tem_bola)} | g={g} h={h} f={g + h}")
+        return "\n".join(linhas)
+
+class RastreamentoBusca:
+    """Buffer circular dos últimos estados expandidos, passado como encontrar_caminho(..., rastreamento=obj)"""
+
+    def __init__(self, capacidade=10000, logger=NOME_LOGGER_RASTREAMENTO):
+        """
+        Args:
+            capacidade: Quantidade máxima de estados guardados (os mais antigos são descartados)
+            logger: Nome do logger que recebe os lotes em descarregar()
+        """
+        self.entradas = deque(maxlen=capacidade)
+        self.logger = logging.getLogger(logger)
+        self.buscas = 0
+
+    def registrar(self, posicao, direcao, tem_bola, g, h):
+        """Chamado pelo planejador a cada expansão: apenas guarda a tupla"""
+        self.entradas.append((posicao, direcao, tem_bola, g, h))
+
+    def descarregar(self, rotulo=None):
+        """Envia o conteúdo do buffer como um único registro DEBUG e esvazia o buffer"""
+        self.buscas += 1
+        if self.entradas and self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("%s", _LoteRastreamento(rotulo or f"Busca {self.buscas}", list(self.entradas)))
+        self.entradas.clear()
+
+class PlanejadorRastreado:
+    """Planejador com a assinatura de candidato.encontrar_caminho que descarrega o rastreamento a cada busca"""
+
+    def __init__(self, planejador, rastreamento):
+        """
+        Args:
+            planejador: Função que aceita o parâmetro rastreamento= (ex.: candidato.encontrar_caminho)
+            rastreamento: RastreamentoBusca que recebe os estados expandidos
+        """
+        self.planejador = planejador
+        self.rastreamento = rastreamento
+
+    def __call__(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+        caminho = self.planejador(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                  rastreamento=self.rastreamento)
+        self.rastreamento.descarregar(f"{pos_inicial} -> {pos_objetivo} | bola {int(tem_bola)}")
+        return caminho
+
+class _HandlerFila(logging.handlers.QueueHandler):
+    """QueueHandler que não formata no produtor: o lote é formatado na thread do listener"""
+
+    def prepare(self, record):
+        return record
+
+def iniciar_rastreamento_assincrono(arquivo, logger=NOME_LOGGER_RASTREAMENTO):
+    """
+    Liga o logger de rastreamento a um arquivo por meio de uma fila
+    Args:
+        arquivo: Caminho do arquivo de rastreamento
+        logger: Nome do logger usado pelos RastreamentoBusca
+    Returns:
+        QueueListener em execução (chame parar_rastreamento_assincrono ao final)
+    """
+    fila = queue.SimpleQueue()
+    handler_arquivo = logging.FileHandler(arquivo)
+    handler_arquivo.setFormatter(logging.Formatter('%(asctime)s [%(levelname)s]: %(message)s'))
+    listener = logging.handlers.QueueListener(fila, handler_arquivo)
+
+    destino = logging.getLogger(logger)
+    destino.setLevel(logging.DEBUG)
+    destino.propagate = False  # O rastreamento não vai para o console nem para o log principal
+    destino.addHandler(_HandlerFila(fila))
+    listener.start()
+    return listener
+
+def parar_rastreamento_assincrono(listener, logger=NOME_LOGGER_RASTREAMENTO):
+    """Esvazia a fila, fecha o arquivo e desliga o logger de rastreamento"""
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    destino = logging.getLogger(logger)
+    for handler in list(destino.handlers):
+        if isinstance(handler, _HandlerFila):
+            destino.removeHandler(handler)
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Filas de prioridade para a lista de abertos do A*.
+
+Todas recebem entradas (f, h, item) em inserir(entrada) e retiram primeiro o
+menor f, desempatando pelo menor h (o estado mais perto do objetivo).
+FilaBinaria é o heap binário do heapq, com inserir/remover ligados direto às
+funções em C. FilaBaldes explora os custos inteiros do desafio: com a granularidade
+igual ao MDC dos custos, cada balde contém um único valor de f e inserir/remover
+custa O(1) amortizado mais um heap minúsculo de desempate dentro do balde.
+'''
+
+from functools import partial
+from heapq import heappush, heappop
+
+# ==================== HEAP BINÁRIO ====================
+class FilaBinaria:
+    """Heap binário de tuplas (f, h, item)"""
+
+    def __init__(self, granularidade=1):
+        self.heap = []
+        # Sem método Python no caminho: cada chamada vai direto ao heapq
+        self.inserir = partial(heappush, self.heap)
+        self.remover = partial(heappop, self.heap)  # IndexError se estiver vazia
+
+    def __len__(self):
+        return len(self.heap)
+
+# ==================== FILA DE BALDES ====================
+class FilaBaldes:
+    """
+    Fila de baldes monótona (algoritmo de Dial): o balde i guarda as entradas com
+    f em [i * granularidade, (i + 1) * granularidade). Os custos nunca são negativos,
+    então f >= 0 e o cursor só volta atrás com heurísticas inconsistentes.
+    """
+
+    def __init__(self, granularidade=1):
+        """
+        Args:
+            granularidade: Largura de cada balde, inteira e positiva; com o MDC dos custos cada
+                           balde tem um único f (ver candidato.granularidade_custos)
+        """
+        if not isinstance(granularidade, int) or granularidade <= 0:
+            raise ValueError(f"A fila de baldes precisa de custos inteiros e granularidade inteira positiva: "
+                             f"{granularidade!r}")
+        self.granularidade = granularidade
+        self.baldes = []       # Cada balde é um heap (f, h, item), normalmente com um único f
+        self.cursor = None     # Nenhum balde antes do cursor tem entradas
+        self.tamanho = 0
+        self.infinitos = []    # Entradas com f infinito, retiradas por último
+
+    def inserir(self, entrada):
+        """Guarda a entrada (f, h, item)"""
+        try:
+            indice = int(entrada[0] // self.granularidade)
+        except (OverflowError, ValueError):  # f infinito (inf // granularidade é NaN)
+            heappush(self.infinitos, entrada)
+            self.tamanho += 1
+            return
+        baldes = self.baldes
+        if indice >= len(baldes):
+            baldes.extend([] for _ in range(indice - len(baldes) + 1))
+            if self.cursor is None:
+                self.cursor = indice
+        heappush(baldes[indice], entrada)
+        if indice < self.cursor:
+            self.cursor = indice  # Só acontece com heurísticas inconsistentes
+        self.tamanho += 1
+
+    def remover(self):
+        """Retira a entrada (f, h, item) de menor f (IndexError se estiver vazia)"""
+        if not self.tamanho:
+            raise IndexError("remover de uma fila vazia")
+        self.tamanho -= 1
+        cursor = self.cursor
+        if cursor is not None:
+            baldes = self.baldes
+            n_baldes = len(baldes)
+            while cursor < n_baldes and not baldes[cursor]:
+                cursor += 1
+            self.cursor = cursor
+            if cursor < n_baldes:
+                return heappop(baldes[cursor])
+        return heappop(self.infinitos)
+
+    def __len__(self):
+        return self.tamanho
+
+# Implementações disponíveis para encontrar_caminho(..., fila=nome)
+FILAS = {
+    "binaria": FilaBinaria,
+    "baldes": FilaBaldes,
+}
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Heurística ALT (A*, marcos e desigualdade triangular).
+
+Para alguns marcos (células escolhidas longe umas das outras) são calculadas,
+uma vez por cenário, as distâncias de cada marco até todas as células e de todas
+as células até cada marco. As distâncias usam um grafo relaxado só de células:
+cada passo custa o menor custo possível do seu tipo no ModeloCusto mais a
+penalidade da célula de chegada, então nunca superam o custo real. Pela
+desigualdade triangular, d(L, objetivo) - d(L, n) e d(n, L) - d(objetivo, L)
+são limites inferiores do custo de n até o objetivo. Ao contrário da distância
+geométrica, eles enxergam os desvios e as penalidades em volta dos adversários.
+'''
+
+import heapq
+import logging
+from collections import OrderedDict
+
+import candidato
+from candidato import MOVIMENTOS, CUSTO_INFINITO
+
+N_MARCOS_PADRAO = 4
+
+# ==================== TABELA DE MARCOS ====================
+class TabelaMarcos:
+    """Distâncias de e até cada marco, pré-calculadas para um cenário"""
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, n_marcos=N_MARCOS_PADRAO, modelo=None):
+        """
+        Escolhe os marcos e executa dois Dijkstras (direto e reverso) por marco
+        Args:
+            obstaculos: Lista de posições dos adversários ou MapaOcupacao
+            largura_grid: Largura do grid
+            altura_grid: Altura do grid
+            n_marcos: Quantidade de marcos
+            modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+
+        A construção percorre o campo inteiro 2 * n_marcos + 1 vezes: vale a pena
+        quando o mesmo cenário recebe várias consultas (ver obter_tabela_marcos).
+        """
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.modelo = modelo or candidato.MODELO_PADRAO
+        self.modelo.tabela()
+        # Custo mínimo de cada movimento, na ordem de MOVIMENTOS
+        self.passos = [self.modelo.passo_reto if dx == 0 or dy == 0 else self.modelo.passo_diagonal
+                       for dx, dy in MOVIMENTOS]
+        campo = candidato.obter_campo_custo(obstaculos, largura_grid, altura_grid)
+        self.bloqueado = campo.bloqueado
+        self.penalidade = campo.penalidade
+
+        self.marcos = []     # Células escolhidas como marcos
+        self.de_marco = []   # de_marco[k][celula] = distância do marco k até a célula
+        self.ate_marco = []  # ate_marco[k][celula] = distância da célula até o marco k
+        self._escolher_marcos(n_marcos)
+        logging.info(f"ALT: {len(self.marcos)} marcos em {largura_grid}x{altura_grid}")
+
+    def _escolher_marcos(self, n_marcos):
+        """Seleção pelo ponto mais distante: cada marco novo é a célula mais longe dos anteriores"""
+        livre = next((c for c in range(self.largura * self.altura) if not self.bloqueado[c]), None)
+        if livre is None:
+            return
+        # O primeiro marco é o ponto mais distante de uma célula livre qualquer
+        distancia_minima = self._dijkstra(livre, reverso=False)
+        for _ in range(n_marcos):
+            marco = max((c for c, d in enumerate(distancia_minima) if d < CUSTO_INFINITO and c not in self.marcos),
+                        key=distancia_minima.__getitem__, default=None)
+            if marco is None:
+                break
+            de_marco = self._dijkstra(marco, reverso=False)
+            self.marcos.append(marco)
+            self.de_marco.append(de_marco)
+            self.ate_marco.append(self._dijkstra(marco, reverso=True))
+            if len(self.marcos) == 1:
+                distancia_minima = de_marco
+            else:
+                distancia_minima = [min(a, b) for a, b in zip(distancia_minima, de_marco)]
+
+    def _dijkstra(self, origem, reverso):
+        """
+        Distâncias no grafo relaxado de células
+        Args:
+            origem: Célula de partida (ou de chegada, se reverso)
+            reverso: Calcula a distância de cada célula até a origem
+        """
+        largura, altura = self.largura, self.altura
+        bloqueado, penalidade, passos = self.bloqueado, self.penalidade, self.passos
+        distancia = [CUSTO_INFINITO] * (largura * altura)
+        distancia[origem] = 0
+        heap = [(0, origem)]
+        while heap:
+            d, celula = heapq.heappop(heap)
+            if d > distancia[celula]:
+                continue
+            x, y = celula % largura, celula // largura
+            for indice, (dx, dy) in enumerate(MOVIMENTOS):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < largura and 0 <= ny < altura):
+                    continue
+                vizinha = ny * largura + nx
+                if bloqueado[vizinha] and not reverso:
+                    continue
+                # A penalidade é paga ao entrar na célula: no sentido reverso, a célula atual é a de chegada
+                nova = d + passos[indice] + penalidade[celula if reverso else vizinha]
+                if nova < distancia[vizinha]:
+                    distancia[vizinha] = nova
+                    if not bloqueado[vizinha]:
+                        # Uma célula bloqueada pode ser o ponto de partida, mas nenhum passo chega nela
+                        heapq.heappush(heap, (nova, vizinha))
+        return distancia
+
+    def estimador(self, pos_objetivo):
+        """
+        Heurística ALT para um objetivo
+        Args:
+            pos_objetivo: Tupla (x,y) com o objetivo
+        Returns:
+            Função celula -> limite inferior do custo até o objetivo (CUSTO_INFINITO se
+            os marcos provarem que o objetivo é inalcançável a partir da célula)
+        """
+        objetivo = pos_objetivo[1] * self.largura + pos_objetivo[0]
+        termos = []
+        for de_marco, ate_marco in zip(self.de_marco, self.ate_marco):
+            # Marcos que não alcançam o objetivo (ou não são alcançados por ele) não limitam nada
+            termos.append((de_marco, de_marco[objetivo] if de_marco[objetivo] < CUSTO_INFINITO else None,
+                           ate_marco, ate_marco[objetivo] if ate_marco[objetivo] < CUSTO_INFINITO else None))
+
+        def estimativa(celula):
+            melhor = 0
+            for de_marco, de_objetivo, ate_marco, ate_objetivo in termos:
+                if de_objetivo is not None and de_objetivo - de_marco[celula] > melhor:
+                    melhor = de_objetivo - de_marco[celula]
+                if ate_objetivo is not None and ate_marco[celula] - ate_objetivo > melhor:
+                    melhor = ate_marco[celula] - ate_objetivo
+            return melhor
+        return estimativa
+
+# Tabelas dos cenários mais recentes (mesma política de candidato.obter_campo_custo)
+TAMANHO_CACHE_MARCOS = 8
+_cache_marcos = OrderedDict()
+
+def obter_tabela_marcos(obstaculos, largura_grid, altura_grid, n_marcos=N_MARCOS_PADRAO, modelo=None):
+    """
+    Retorna a TabelaMarcos do cenário, reaproveitando tabelas já construídas
+    Args:
+        obstaculos: Lista de posições dos adversários ou MapaOcupacao
+        largura_grid: Largura do grid
+        altura_grid: Altura do grid
+        n_marcos: Quantidade de marcos
+        modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+    Returns:
+        TabelaMarcos correspondente
+    """
+    modelo = modelo or candidato.MODELO_PADRAO
+    # A tabela guarda o modelo, então o id não é reaproveitado enquanto a entrada estiver no cache
+    chave = (candidato.chave_cenario(obstaculos, largura_grid, altura_grid), n_marcos, id(modelo))
+    tabela = _cache_marcos.get(chave)
+    if tabela is None:
+        tabela = _cache_marcos[chave] = TabelaMarcos(obstaculos, largura_grid, altura_grid, n_marcos, modelo)
+        if len(_cache_marcos) > TAMANHO_CACHE_MARCOS:
+            _cache_marcos.popitem(last=False)
+    else:
+        _cache_marcos.move_to_end(chave)
+    return tabela
+
+def encontrar_caminho_alt(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                          n_marcos=N_MARCOS_PADRAO, estatisticas=None, rastreamento=None, modelo=None):
+    """candidato.encontrar_caminho com a heurística ALT (a tabela do cenário e do modelo vem do cache)"""
+    return candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                       estatisticas=estatisticas, rastreamento=rastreamento, modelo=modelo,
+                                       marcos=obter_tabela_marcos(obstaculos, largura_grid, altura_grid, n_marcos,
+                                                                  modelo))
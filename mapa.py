@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Mapa de ocupação compacto para campos grandes.
+
+Em vez de uma lista de tuplas, o campo é guardado como um byte por célula
+(0 = livre, 1 = adversário; qualquer outro valor não nulo também conta como
+ocupado) em ordem de linhas: y * largura + x. O mapa pode ser gravado em um
+arquivo binário simples (cabeçalho + bytes da grade) que é aberto com mmap, sem
+leitura nem conversão: só as páginas tocadas pela busca são carregadas do disco.
+
+Formato do arquivo (little-endian):
+    8 bytes   assinatura b"EDROMAP1"
+    uint32    largura
+    uint32    altura
+    uint32    número de células ocupadas
+    largura * altura bytes da grade
+'''
+
+import argparse
+import mmap
+import random
+import re
+import struct
+
+ASSINATURA = b"EDROMAP1"
+CABECALHO = struct.Struct("<8sIII")
+_BYTE_OCUPADO = re.compile(rb"[^\x00]")  # Qualquer byte diferente de zero é uma célula ocupada
+
+# ==================== MAPA DE OCUPAÇÃO ====================
+class MapaOcupacao:
+    """Grade de ocupação com um byte por célula, usada no lugar da lista de obstáculos"""
+
+    def __init__(self, largura, altura, dados=None, ocupadas=None):
+        """
+        Args:
+            largura: Largura da grade
+            altura: Altura da grade
+            dados: bytearray com largura * altura bytes (None cria um mapa vazio)
+            ocupadas: Número de células ocupadas, se já conhecido
+        """
+        self.largura = largura
+        self.altura = altura
+        self.dados = bytearray(largura * altura) if dados is None else dados
+        if len(self.dados) != largura * altura:
+            raise ValueError(f"Mapa {largura}x{altura} precisa de {largura * altura} bytes, recebeu {len(self.dados)}")
+        # Buffer onde a grade começa em _inicio (um mmap do arquivo inteiro ou os próprios dados)
+        self._buffer = self.dados
+        self._inicio = 0
+        self._ocupadas = ocupadas
+        self._binario = None  # Só bytes 0 e 1 (ver binario)
+        self.versao = 0  # Incrementada a cada alteração (invalida os campos de custo em cache)
+
+    @classmethod
+    def de_lista(cls, obstaculos, largura, altura):
+        """Cria o mapa a partir de uma lista de posições (x,y)"""
+        mapa = cls(largura, altura)
+        for posicao in obstaculos:
+            mapa.ocupar(posicao)
+        return mapa
+
+    @classmethod
+    def de_array(cls, matriz):
+        """
+        Cria o mapa a partir de uma matriz NumPy (altura, largura); valores diferentes de zero são ocupados
+        """
+        altura, largura = matriz.shape
+        ocupadas = matriz != 0
+        return cls(largura, altura, bytearray(ocupadas.astype("uint8").tobytes()), int(ocupadas.sum()))
+
+    def como_array(self):
+        """Visão NumPy (altura, largura) dos mesmos bytes, sem cópia (requer NumPy)"""
+        import numpy
+        return numpy.frombuffer(self.dados, dtype=numpy.uint8).reshape(self.altura, self.largura)
+
+    def celula(self, posicao):
+        """Índice plano da célula (x,y)"""
+        return posicao[1] * self.largura + posicao[0]
+
+    def __contains__(self, posicao):
+        x, y = posicao
+        return 0 <= x < self.largura and 0 <= y < self.altura and self.dados[y * self.largura + x] != 0
+
+    def __iter__(self):
+        """Posições ocupadas em ordem de linhas: bytes não nulos, a mesma regra de __contains__"""
+        buffer, inicio, largura = self._buffer, self._inicio, self.largura
+        fim = inicio + len(self.dados)
+        if not self.binario():
+            # Grade com outros valores além de 0 e 1 (arquivo gerado fora deste módulo): busca por expressão regular
+            for ocupada in _BYTE_OCUPADO.finditer(buffer, inicio, fim):
+                celula = ocupada.start() - inicio
+                yield (celula % largura, celula // largura)
+            return
+        indice = buffer.find(b"\x01", inicio, fim)
+        while indice >= 0:
+            celula = indice - inicio
+            yield (celula % largura, celula // largura)
+            indice = buffer.find(b"\x01", indice + 1, fim)
+
+    def binario(self):
+        """Indica se a grade só tem bytes 0 e 1 (verificado uma vez; ocupar e liberar mantêm a propriedade)"""
+        if self._binario is None:
+            dados = bytes(self.dados) if isinstance(self.dados, memoryview) else self.dados
+            self._binario = dados.count(0) + dados.count(1) == len(dados)
+        return self._binario
+
+    def __len__(self):
+        if self._ocupadas is None:
+            self._ocupadas = sum(1 for _ in self)
+        return self._ocupadas
+
+    def __reduce__(self):
+        # Cópia dos bytes: permite enviar o mapa a outro processo mesmo quando ele vem de um mmap
+        return (MapaOcupacao, (self.largura, self.altura, bytearray(self.dados), self._ocupadas))
+
+    def copiar(self):
+        """Cópia independente do mapa em memória (lê a grade inteira, mesmo quando ela vem de um mmap)"""
+        copia = MapaOcupacao(self.largura, self.altura, bytearray(self.dados), self._ocupadas)
+        copia._binario = self._binario
+        return copia
+
+    def ocupar(self, posicao):
+        """Marca a célula como ocupada por um adversário"""
+        celula = self.celula(posicao)
+        if not self.dados[celula]:
+            self.dados[celula] = 1
+            if self._ocupadas is not None:
+                self._ocupadas += 1
+            self.versao += 1
+
+    def liberar(self, posicao):
+        """Marca a célula como livre"""
+        celula = self.celula(posicao)
+        if self.dados[celula]:
+            self.dados[celula] = 0
+            if self._ocupadas is not None:
+                self._ocupadas -= 1
+            self.versao += 1
+
+    def fechar(self):
+        """Libera o arquivo mapeado (o mapa não pode mais ser usado)"""
+        if isinstance(self._buffer, mmap.mmap):
+            self.dados.release()
+            self._buffer.close()
+
+# ==================== ARQUIVO DE MAPA ====================
+def salvar_mapa(mapa, caminho_arquivo):
+    """
+    Grava o mapa no formato binário
+    Args:
+        mapa: MapaOcupacao
+        caminho_arquivo: Arquivo de destino
+    """
+    with open(caminho_arquivo, "wb") as arquivo:
+        arquivo.write(CABECALHO.pack(ASSINATURA, mapa.largura, mapa.altura, len(mapa)))
+        arquivo.write(mapa.dados)
+
+def carregar_mapa(caminho_arquivo, usar_mmap=True):
+    """
+    Abre um mapa gravado por salvar_mapa
+    Args:
+        caminho_arquivo: Arquivo do mapa
+        usar_mmap: Mapeia o arquivo em memória (cópia na escrita: alterações não vão para o disco);
+                   False lê tudo para um bytearray
+    Returns:
+        MapaOcupacao
+    """
+    with open(caminho_arquivo, "rb") as arquivo:
+        assinatura, largura, altura, ocupadas = CABECALHO.unpack(arquivo.read(CABECALHO.size))
+        if assinatura != ASSINATURA:
+            raise ValueError(f"{caminho_arquivo} não é um arquivo de mapa EDROM")
+        n_celulas = largura * altura
+        if not usar_mmap:
+            dados = bytearray(arquivo.read(n_celulas))
+            if len(dados) != n_celulas:
+                raise ValueError(f"{caminho_arquivo} está truncado")
+            return MapaOcupacao(largura, altura, dados, ocupadas)
+        buffer = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    if len(buffer) < CABECALHO.size + n_celulas:
+        buffer.close()
+        raise ValueError(f"{caminho_arquivo} está truncado")
+    mapa = MapaOcupacao(largura, altura, memoryview(buffer)[CABECALHO.size:CABECALHO.size + n_celulas], ocupadas)
+    mapa._buffer = buffer
+    mapa._inicio = CABECALHO.size
+    return mapa
+
+def gerar_mapa(largura, altura, densidade, rng=random):
+    """
+    Sorteia um mapa com uma fração de células ocupadas
+    Args:
+        largura: Largura da grade
+        altura: Altura da grade
+        densidade: Fração de células com adversários (0 a 1)
+        rng: Gerador aleatório
+    Returns:
+        MapaOcupacao
+    """
+    n_celulas = largura * altura
+    dados = bytearray(n_celulas)
+    ocupadas = rng.sample(range(n_celulas), int(densidade * n_celulas))
+    for celula in ocupadas:
+        dados[celula] = 1
+    return MapaOcupacao(largura, altura, dados, len(ocupadas))
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera arquivos de mapa de ocupação")
+    parser.add_argument("saida", help="Arquivo do mapa a gravar")
+    parser.add_argument("--largura", type=int, required=True)
+    parser.add_argument("--altura", type=int, required=True)
+    parser.add_argument("--densidade", type=float, default=0.1, help="Fração de células com adversários")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args()
+
+    mapa = gerar_mapa(args.largura, args.altura, args.densidade, random.Random(args.semente))
+    salvar_mapa(mapa, args.saida)
+    print(f"{args.saida}: {mapa.largura}x{mapa.altura}, {len(mapa)} células ocupadas")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Perfilamento opcional das chamadas de planejamento.
+
+PerfilPlanejador envolve um planejador com a assinatura de
+candidato.encontrar_caminho. Durante cada chamada, e só durante ela, os pontos
+quentes do candidato (e do módulo do planejador) são trocados por versões medidas
+que contam chamadas e acumulam tempo: as funções de custo, a construção de Estado,
+o campo de custo, as operações da lista de abertos, o heapq e o logging. É a mesma
+técnica do HeapInstrumentado do benchmark: fora do perfil, nada muda no
+planejador e não há custo extra.
+
+Por chamada são guardados o tempo, as expansões (EstatisticasBusca, quando o
+planejador as aceita) e as alocações: o pico de blocos de memória vivos
+(sys.getallocatedblocks) amostrado a cada função medida, menos os blocos no início.
+Opcionalmente cada chamada roda sob cProfile e/ou tracemalloc, e o detalhamento é
+mantido só para as N chamadas mais lentas.
+
+Os dados são um dicionário serializável (como_dicionario). Perfis de vários
+processos podem ser somados com juntar, e exportar grava o relatório em texto ou
+em JSON.
+'''
+
+import cProfile
+import functools
+import heapq
+import inspect
+import io
+import itertools
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+import types
+
+import candidato
+from estatisticas_busca import EstatisticasBusca
+
+# Nomes trocados nos módulos instrumentados (os ausentes em um módulo são ignorados)
+ALVOS_PADRAO = ("calcular_custo_movimento", "calcular_penalidade_adversarios", "calcular_heuristica", "Estado",
+                "obter_campo_custo", "resolver_marcos", "criar_fila", "heapq", "logging")
+# Funções medidas dentro dos módulos trocados
+FUNCOES_MODULO = {
+    "heapq": ("heappush", "heappop"),
+    "logging": ("debug", "info", "warning", "error"),
+}
+PIORES_PADRAO = 5
+LINHAS_CPROFILE = 20
+LINHAS_TRACEMALLOC = 10
+
+# ==================== MEDIÇÃO ====================
+class ContadorFuncao:
+    """Chamadas e tempo acumulado de uma função medida"""
+
+    __slots__ = ("chamadas", "tempo")
+
+    def __init__(self):
+        self.chamadas = 0
+        self.tempo = 0.0
+
+class _FuncaoMedida:
+    """Função que conta chamadas, acumula tempo e amostra os blocos de memória vivos"""
+
+    def __init__(self, funcao, contador, perfil):
+        self.funcao = funcao
+        self.contador = contador
+        self.perfil = perfil
+
+    def __call__(self, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return self.funcao(*args, **kwargs)
+        finally:
+            self.contador.tempo += time.perf_counter() - inicio
+            self.contador.chamadas += 1
+            blocos = sys.getallocatedblocks()
+            if blocos > self.perfil.pico_blocos:
+                self.perfil.pico_blocos = blocos
+
+class _ModuloMedido:
+    """Substitui um módulo (heapq, logging) no planejador, medindo só as funções escolhidas"""
+
+    def __init__(self, modulo, medidas):
+        self._modulo = modulo
+        self.__dict__.update(medidas)
+
+    def __getattr__(self, nome):
+        return getattr(self._modulo, nome)
+
+def _criar_fila_medida(criar_fila, inserir, remover, perfil):
+    """criar_fila cujas filas têm inserir/remover medidos (atributos da instância, como em FilaBinaria)"""
+    def criar(*args, **kwargs):
+        fila = criar_fila(*args, **kwargs)
+        fila.inserir = _FuncaoMedida(fila.inserir, inserir, perfil)
+        fila.remover = _FuncaoMedida(fila.remover, remover, perfil)
+        return fila
+    return criar
+
+def _descrever(args, kwargs):
+    """Texto curto do pedido a partir dos argumentos de encontrar_caminho"""
+    nomes = ("pos_inicial", "pos_objetivo", "obstaculos", "largura_grid", "altura_grid", "tem_bola")
+    valores = dict(zip(nomes, args))
+    valores.update(kwargs)
+    texto = f"{valores.get('pos_inicial')} -> {valores.get('pos_objetivo')}"
+    if valores.get("pos_final") is not None:
+        texto += f" -> {valores['pos_final']}"
+    return texto + f" | bola {int(bool(valores.get('tem_bola')))}"
+
+# ==================== PERFIL ====================
+class PerfilPlanejador:
+    """Planejador com a assinatura de candidato.encontrar_caminho que perfila cada chamada"""
+
+    def __init__(self, planejador=candidato.encontrar_caminho, piores=PIORES_PADRAO, cprofile=False, memoria=False,
+                 modulos=None, alvos=ALVOS_PADRAO):
+        """
+        Args:
+            planejador: Função com a assinatura de candidato.encontrar_caminho
+            piores: Chamadas mais lentas guardadas com detalhes
+            cprofile: Roda cada chamada sob cProfile (o relatório das piores é guardado)
+            memoria: Roda cada chamada sob tracemalloc (pico e maiores alocações retidas)
+            modulos: Módulos cujos alvos são instrumentados (None: candidato e o módulo do planejador)
+            alvos: Nomes de funções, classes ou módulos trocados em cada módulo
+        """
+        functools.update_wrapper(self, planejador, updated=())  # Mesma assinatura (ver planejador_combinado)
+        self.planejador = planejador
+        self.piores = piores
+        self.cprofile = cprofile
+        self.memoria = memoria
+        if modulos is None:
+            modulos = [candidato]
+            modulo = inspect.getmodule(getattr(planejador, "func", planejador))
+            if modulo is None:
+                modulo = inspect.getmodule(type(planejador))
+            if modulo is not None and modulo is not candidato:
+                modulos.append(modulo)
+        self.modulos = modulos
+        self.alvos = alvos
+        try:
+            self.aceita_estatisticas = "estatisticas" in inspect.signature(planejador).parameters
+        except (TypeError, ValueError):
+            self.aceita_estatisticas = False
+        self.contadores = {}
+        self.tempos = []
+        self.fases = {}
+        self.expansoes = 0
+        self.chamadas_com_expansoes = 0
+        self.alocacoes = 0
+        self.pico_blocos = 0
+        self._piores = []  # Heap (tempo, sequência, registro, cProfile, snapshot) das chamadas mais lentas
+        self._sequencia = itertools.count()
+        self._ativo = False
+
+    def _contador(self, nome):
+        contador = self.contadores.get(nome)
+        if contador is None:
+            contador = self.contadores[nome] = ContadorFuncao()
+        return contador
+
+    def _instalar(self):
+        """Troca os alvos pelas versões medidas; devolve a lista para _restaurar"""
+        trocados = []
+        for modulo in self.modulos:
+            for nome in self.alvos:
+                original = getattr(modulo, nome, None)
+                if original is None:
+                    continue
+                prefixo = f"{modulo.__name__}.{nome}"
+                if nome == "criar_fila":
+                    substituto = _criar_fila_medida(original, self._contador(f"{modulo.__name__}.fila.inserir"),
+                                                    self._contador(f"{modulo.__name__}.fila.remover"), self)
+                elif isinstance(original, types.ModuleType):
+                    substituto = _ModuloMedido(original, {
+                        funcao: _FuncaoMedida(getattr(original, funcao), self._contador(f"{prefixo}.{funcao}"), self)
+                        for funcao in FUNCOES_MODULO.get(nome, ()) if hasattr(original, funcao)})
+                elif callable(original):
+                    substituto = _FuncaoMedida(original, self._contador(prefixo), self)
+                else:
+                    continue
+                setattr(modulo, nome, substituto)
+                trocados.append((modulo, nome, original))
+        return trocados
+
+    @staticmethod
+    def _restaurar(trocados):
+        for modulo, nome, original in reversed(trocados):
+            setattr(modulo, nome, original)
+
+    def __call__(self, *args, **kwargs):
+        if self._ativo:
+            # Chamada de dentro do próprio planejador: só a externa é medida
+            return self.planejador(*args, **kwargs)
+        estatisticas = kwargs.get("estatisticas")
+        if estatisticas is None and self.aceita_estatisticas:
+            estatisticas = kwargs["estatisticas"] = EstatisticasBusca()
+        perfil_cprofile = cProfile.Profile() if self.cprofile else None
+        parar_tracemalloc = self.memoria and not tracemalloc.is_tracing()
+        if parar_tracemalloc:
+            tracemalloc.start()
+        elif self.memoria:
+            tracemalloc.reset_peak()
+
+        self._ativo = True
+        trocados = self._instalar()
+        self.pico_blocos = blocos_inicio = sys.getallocatedblocks()
+        inicio = time.perf_counter()
+        try:
+            if perfil_cprofile is not None:
+                resultado = perfil_cprofile.runcall(self.planejador, *args, **kwargs)
+            else:
+                resultado = self.planejador(*args, **kwargs)
+        finally:
+            tempo = time.perf_counter() - inicio
+            self._restaurar(trocados)
+            self._ativo = False
+            pico_memoria = snapshot = None
+            if self.memoria:
+                pico_memoria = tracemalloc.get_traced_memory()[1]
+                if parar_tracemalloc:
+                    # O rastreamento começou com a chamada: o snapshot só tem o que ela alocou e manteve
+                    snapshot = tracemalloc.take_snapshot()
+                    tracemalloc.stop()
+
+        registro = {
+            "pedido": _descrever(args, kwargs),
+            "tempo": tempo,
+            "passos": len(resultado) if hasattr(resultado, "__len__") else None,
+            "expansoes": estatisticas.expansoes if estatisticas is not None else None,
+            "alocacoes": max(self.pico_blocos, sys.getallocatedblocks()) - blocos_inicio,
+            "pico_memoria": pico_memoria,
+        }
+        self.tempos.append(tempo)
+        self.alocacoes += registro["alocacoes"]
+        if estatisticas is not None:
+            self.expansoes += estatisticas.expansoes
+            self.chamadas_com_expansoes += 1
+            for fase, segundos in estatisticas.tempos.items():
+                self.fases[fase] = self.fases.get(fase, 0.0) + segundos
+        if self.piores:
+            entrada = (tempo, next(self._sequencia), registro, perfil_cprofile, snapshot)
+            if len(self._piores) < self.piores:
+                heapq.heappush(self._piores, entrada)
+            elif tempo > self._piores[0][0]:
+                heapq.heapreplace(self._piores, entrada)
+        return resultado
+
+    def como_dicionario(self):
+        """Dados do perfil em um dicionário serializável (ver juntar e exportar)"""
+        piores = []
+        for _, _, registro, perfil_cprofile, snapshot in sorted(self._piores, key=lambda entrada: -entrada[0]):
+            registro = dict(registro)
+            if perfil_cprofile is not None:
+                texto = io.StringIO()
+                pstats.Stats(perfil_cprofile, stream=texto).sort_stats("cumulative").print_stats(LINHAS_CPROFILE)
+                registro["cprofile"] = texto.getvalue()
+            if snapshot is not None:
+                registro["tracemalloc"] = [str(estatistica) for estatistica
+                                           in snapshot.statistics("lineno")[:LINHAS_TRACEMALLOC]]
+            piores.append(registro)
+        return {
+            "chamadas": len(self.tempos),
+            "tempos": list(self.tempos),
+            "funcoes": {nome: {"chamadas": contador.chamadas, "tempo": contador.tempo}
+                        for nome, contador in self.contadores.items()},
+            "fases": dict(self.fases),
+            "expansoes": self.expansoes,
+            "chamadas_com_expansoes": self.chamadas_com_expansoes,
+            "alocacoes": self.alocacoes,
+            "piores": piores,
+        }
+
+    def relatorio(self, detalhes=True):
+        return relatorio(self.como_dicionario(), detalhes)
+
+# ==================== RELATÓRIO ====================
+def juntar(perfis, piores=PIORES_PADRAO):
+    """
+    Soma os dados de vários perfis (ex.: um por processo da varredura)
+    Args:
+        perfis: Dicionários de PerfilPlanejador.como_dicionario
+        piores: Chamadas mais lentas mantidas no resultado
+    Returns:
+        Dicionário no mesmo formato
+    """
+    total = {"chamadas": 0, "tempos": [], "funcoes": {}, "fases": {}, "expansoes": 0, "chamadas_com_expansoes": 0,
+             "alocacoes": 0, "piores": []}
+    for dados in perfis:
+        for chave in ("chamadas", "expansoes", "chamadas_com_expansoes", "alocacoes"):
+            total[chave] += dados[chave]
+        total["tempos"] += dados["tempos"]
+        for nome, medida in dados["funcoes"].items():
+            soma = total["funcoes"].setdefault(nome, {"chamadas": 0, "tempo": 0.0})
+            soma["chamadas"] += medida["chamadas"]
+            soma["tempo"] += medida["tempo"]
+        for fase, segundos in dados["fases"].items():
+            total["fases"][fase] = total["fases"].get(fase, 0.0) + segundos
+        total["piores"] += dados["piores"]
+    total["piores"] = sorted(total["piores"], key=lambda registro: -registro["tempo"])[:piores]
+    return total
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(round(p / 100 * (len(ordenados) - 1))))]
+
+def relatorio(dados, detalhes=True):
+    """
+    Relatório em texto de um perfil
+    Args:
+        dados: Dicionário de PerfilPlanejador.como_dicionario ou de juntar
+        detalhes: Inclui as saídas de cProfile e tracemalloc das chamadas mais lentas
+    """
+    if not dados["chamadas"]:
+        return "Perfil vazio: nenhuma chamada de planejamento"
+    tempos_ms = [1000 * tempo for tempo in dados["tempos"]]
+    total_ms = sum(tempos_ms)
+    linhas = [f"Chamadas: {dados['chamadas']} | Total: {total_ms:.1f}ms | p50: {_percentil(tempos_ms, 50):.3f}ms | "
+              f"p99: {_percentil(tempos_ms, 99):.3f}ms | Máximo: {max(tempos_ms):.3f}ms"]
+    if dados["chamadas_com_expansoes"]:
+        fases = " | ".join(f"{fase}: {1000 * segundos:.1f}ms" for fase, segundos in dados["fases"].items())
+        linhas.append(f"Expansões médias: {dados['expansoes'] / dados['chamadas_com_expansoes']:.1f} | {fases}")
+    linhas.append(f"Alocações médias (blocos de memória no pico): {dados['alocacoes'] / dados['chamadas']:.0f}")
+
+    linhas.append("")
+    linhas.append(f"{'função':<48}{'chamadas':>12}{'total ms':>12}{'% do tempo':>12}{'ns/chamada':>12}")
+    for nome, medida in sorted(dados["funcoes"].items(), key=lambda item: -item[1]["tempo"]):
+        if not medida["chamadas"]:
+            continue
+        linhas.append(f"{nome:<48}{medida['chamadas']:>12}{1000 * medida['tempo']:>12.2f}"
+                      f"{100 * 1000 * medida['tempo'] / max(total_ms, 1e-9):>11.1f}%"
+                      f"{1e9 * medida['tempo'] / medida['chamadas']:>12.0f}")
+
+    if dados["piores"]:
+        linhas.append("")
+        linhas.append("Chamadas mais lentas:")
+        for registro in dados["piores"]:
+            texto = f"  {1000 * registro['tempo']:.3f}ms | {registro['pedido']} | passos {registro['passos']}"
+            if registro["expansoes"] is not None:
+                texto += f" | expansões {registro['expansoes']}"
+            texto += f" | alocações {registro['alocacoes']}"
+            if registro["pico_memoria"] is not None:
+                texto += f" | pico {registro['pico_memoria'] / 1024:.1f}KB"
+            linhas.append(texto)
+            if detalhes and registro.get("cprofile"):
+                linhas += ["    " + linha for linha in registro["cprofile"].strip().splitlines()]
+            if detalhes and registro.get("tracemalloc"):
+                linhas.append("    Maiores alocações retidas:")
+                linhas += ["      " + linha for linha in registro["tracemalloc"]]
+    return "\n".join(linhas)
+
+def exportar(perfis, arquivo):
+    """
+    Grava um ou mais perfis: JSON se o arquivo terminar em .json, senão o relatório em texto
+    Args:
+        perfis: Dicionário rótulo -> dados de como_dicionario (ou de juntar)
+        arquivo: Caminho do arquivo
+    """
+    with open(arquivo, "w") as saida:
+        if arquivo.endswith(".json"):
+            json.dump(perfis, saida, indent=2)
+        else:
+            saida.write("\n\n".join(f"==================== {rotulo} ====================\n{relatorio(dados)}"
+                                    for rotulo, dados in perfis.items()) + "\n")
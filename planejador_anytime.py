@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Busca anytime com prazo (ARA*).
+
+A primeira iteração usa um A* ponderado (f = g + ε·h) e encontra rapidamente
+um caminho válido cujo custo é no máximo ε vezes o ótimo. Enquanto houver
+orçamento (tempo ou expansões), ε é reduzido e a busca é retomada
+reaproveitando os valores g já calculados, melhorando o caminho até ε = 1
+(ótimo). O resultado sempre informa o limite de subotimalidade garantido.
+'''
+
+import heapq
+import logging
+import time
+
+import candidato
+from candidato import MOVIMENTOS, N_DIRECOES, SEM_DIRECAO, CUSTO_INFINITO
+
+# ==================== RESULTADO ====================
+class ResultadoAnytime:
+    """Melhor solução encontrada dentro do orçamento"""
+
+    def __init__(self):
+        self.caminho = []                # Melhor caminho (vazio se nenhum foi encontrado)
+        self.custo = CUSTO_INFINITO      # Custo do melhor caminho
+        self.limite = CUSTO_INFINITO     # custo <= limite * custo ótimo
+        self.iteracoes = 0               # Iterações de ε concluídas
+        self.expansoes = 0
+        self.tempo = 0.0                 # Segundos gastos
+        self.esgotou_orcamento = False
+        self.solucoes = []               # Histórico (tempo, custo, limite) de cada melhoria
+
+    @property
+    def otimo(self):
+        return self.limite <= 1.0
+
+# ==================== ARA* ====================
+def encontrar_caminho_anytime(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                              orcamento_ms=None, max_expansoes=None, epsilon_inicial=5.0, passo_epsilon=1.0,
+                              ao_melhorar=None, modelo=None):
+    """
+    ARA*: devolve rápido um caminho ε-subótimo e o melhora enquanto houver orçamento
+    Args:
+        pos_inicial: Tupla (x,y) com a posição inicial
+        pos_objetivo: Tupla (x,y) com o objetivo
+        obstaculos: Lista de posições dos adversários
+        largura_grid: Largura do grid de busca
+        altura_grid: Altura do grid de busca
+        tem_bola: Indica se o robô começa com a bola
+        orcamento_ms: Tempo máximo em milissegundos (None = sem limite)
+        max_expansoes: Número máximo de expansões (None = sem limite)
+        epsilon_inicial: Peso da heurística na primeira iteração
+        passo_epsilon: Redução de ε entre iterações
+        ao_melhorar: Função chamada com o ResultadoAnytime a cada solução melhor
+        modelo: ModeloCusto com os custos de movimento (None usa candidato.MODELO_PADRAO)
+    Returns:
+        ResultadoAnytime com caminho, custo e limite de subotimalidade
+    """
+    inicio = time.perf_counter()
+    prazo = inicio + orcamento_ms / 1000 if orcamento_ms is not None else None
+    resultado = ResultadoAnytime()
+
+    campo = candidato.obter_campo_custo(obstaculos, largura_grid, altura_grid)
+    bloqueado, penalidades = campo.bloqueado, campo.penalidade
+    modelo = modelo or candidato.MODELO_PADRAO
+    custo_mov = candidato.tabela_custo_movimento(modelo)
+    # Todo passo custa ao menos o menor passo do modelo: Chebyshev x custo_minimo é admissível
+    custo_minimo = min(modelo.passo_reto, modelo.passo_diagonal)
+
+    n_celulas = largura_grid * altura_grid
+    n_estados = n_celulas * N_DIRECOES * 2
+    g = candidato.alocar_vetor(n_estados, CUSTO_INFINITO)
+    pai = candidato.alocar_vetor(n_estados, -1)
+    heuristicas = candidato.alocar_vetor(n_celulas, -1)
+    gx, gy = pos_objetivo
+    celula_objetivo = gy * largura_grid + gx
+
+    def heuristica(celula):
+        h = heuristicas[celula]
+        if h < 0:
+            h = heuristicas[celula] = max(abs(celula % largura_grid - gx), abs(celula // largura_grid - gy)) * custo_minimo
+        return h
+
+    estado_inicial = ((pos_inicial[1] * largura_grid + pos_inicial[0]) * N_DIRECOES + SEM_DIRECAO) * 2 + (1 if tem_bola else 0)
+    g[estado_inicial] = 0
+    abertos = {estado_inicial}
+    inconsistentes = set()
+    melhor_objetivo = -1  # Estado no objetivo com menor g
+
+    def custo_objetivo():
+        return g[melhor_objetivo] if melhor_objetivo >= 0 else CUSTO_INFINITO
+
+    def orcamento_esgotado():
+        if max_expansoes is not None and resultado.expansoes >= max_expansoes:
+            return True
+        return prazo is not None and time.perf_counter() >= prazo
+
+    def melhorar_caminho(epsilon):
+        """Uma iteração do ARA*; devolve False se o orçamento acabou no meio dela"""
+        nonlocal melhor_objetivo
+        fechados = candidato.alocar_marcas(n_estados)
+        heap = [(g[s] + epsilon * heuristica((s >> 1) // N_DIRECOES), s) for s in abertos]
+        heapq.heapify(heap)
+        while heap:
+            chave, estado = heap[0]
+            if fechados[estado] or estado not in abertos:
+                heapq.heappop(heap)
+                continue
+            if custo_objetivo() <= chave:
+                return True
+            if orcamento_esgotado():
+                return False
+            heapq.heappop(heap)
+            abertos.discard(estado)
+            fechados[estado] = 1
+            resultado.expansoes += 1
+
+            bola = estado & 1
+            celula, direcao = divmod(estado >> 1, N_DIRECOES)
+            x, y = celula % largura_grid, celula // largura_grid
+            base_custo = (bola * N_DIRECOES + direcao) * 8
+            g_atual = g[estado]
+            for indice, (dx, dy) in enumerate(MOVIMENTOS):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < largura_grid and 0 <= ny < altura_grid):
+                    continue
+                nova_celula = ny * largura_grid + nx
+                if bloqueado[nova_celula]:
+                    continue
+                novo_g = g_atual + custo_mov[base_custo + indice] + penalidades[nova_celula]
+                novo_estado = (nova_celula * N_DIRECOES + indice) * 2 + bola
+                if novo_g >= g[novo_estado]:
+                    continue
+                g[novo_estado] = novo_g
+                pai[novo_estado] = estado
+                if nova_celula == celula_objetivo:
+                    # Estados no objetivo não são expandidos: apenas guardam a melhor solução
+                    if novo_g < custo_objetivo():
+                        melhor_objetivo = novo_estado
+                elif fechados[novo_estado]:
+                    inconsistentes.add(novo_estado)
+                else:
+                    abertos.add(novo_estado)
+                    heapq.heappush(heap, (novo_g + epsilon * heuristica(nova_celula), novo_estado))
+        return True
+
+    def reconstruir():
+        """Caminho até o melhor estado objetivo e seu custo real pela cadeia de pais atual"""
+        caminho = []
+        custo = 0
+        estado = melhor_objetivo
+        while estado != -1:
+            celula, direcao = divmod(estado >> 1, N_DIRECOES)
+            caminho.append((celula % largura_grid, celula // largura_grid))
+            anterior = pai[estado]
+            if anterior != -1:
+                # Pais podem ter melhorado depois que o objetivo foi alcançado: soma as arestas da cadeia
+                custo += custo_mov[((anterior & 1) * N_DIRECOES + (anterior >> 1) % N_DIRECOES) * 8 + direcao]
+                custo += penalidades[celula]
+            estado = anterior
+        caminho.reverse()
+        return caminho, custo
+
+    def publicar(limite):
+        """Registra a solução atual se ela for nova ou tiver limite melhor"""
+        if melhor_objetivo < 0:
+            return
+        caminho, custo = reconstruir()
+        if custo >= resultado.custo and limite >= resultado.limite:
+            return
+        if custo < resultado.custo:
+            resultado.caminho = caminho
+            resultado.custo = custo
+        resultado.limite = min(limite, resultado.limite)
+        resultado.tempo = time.perf_counter() - inicio
+        resultado.solucoes.append((resultado.tempo, resultado.custo, resultado.limite))
+        logging.info(f"ARA*: custo {resultado.custo} | limite {resultado.limite:.3f} | "
+                     f"{resultado.expansoes} expansões | {1000 * resultado.tempo:.2f} ms")
+        if ao_melhorar is not None:
+            ao_melhorar(resultado)
+
+    if pos_inicial == pos_objetivo:
+        resultado.caminho, resultado.custo, resultado.limite = [pos_inicial], 0, 1.0
+        return resultado
+
+    epsilon = max(1.0, epsilon_inicial)
+    while True:
+        concluiu = melhorar_caminho(epsilon)
+        if not concluiu:
+            # Iteração interrompida: o custo só diminuiu, então o limite anterior continua válido
+            resultado.esgotou_orcamento = True
+            publicar(resultado.limite)
+            break
+        resultado.iteracoes += 1
+
+        # Limite garantido: custo / menor g + h entre os estados ainda não resolvidos
+        pendentes = [g[s] + heuristica((s >> 1) // N_DIRECOES) for s in abertos | inconsistentes]
+        minimo = min(pendentes, default=CUSTO_INFINITO)
+        custo = custo_objetivo()
+        if custo == CUSTO_INFINITO:
+            if not pendentes:
+                break  # Busca exaurida: não há caminho
+        elif custo <= minimo:
+            publicar(1.0)
+        else:
+            publicar(min(epsilon, custo / minimo))
+
+        if resultado.limite <= 1.0 or orcamento_esgotado():
+            resultado.esgotou_orcamento = resultado.limite > 1.0
+            break
+        epsilon = max(1.0, epsilon - passo_epsilon)
+        abertos |= inconsistentes
+        inconsistentes.clear()
+
+    resultado.tempo = time.perf_counter() - inicio
+    if not resultado.caminho:
+        logging.warning("Nenhum caminho válido encontrado!")
+    return resultado
+
+# ==================== ADAPTADOR PARA O SIMULADOR ====================
+class PlanejadorComPrazo:
+    """Planejador com a assinatura de candidato.encontrar_caminho limitado por um orçamento de tempo"""
+
+    def __init__(self, orcamento_ms, modelo=None, **opcoes):
+        """
+        Args:
+            orcamento_ms: Tempo máximo por chamada em milissegundos
+            modelo: ModeloCusto com os custos de movimento (None usa candidato.MODELO_PADRAO)
+            **opcoes: Demais parâmetros de encontrar_caminho_anytime
+        """
+        self.orcamento_ms = orcamento_ms
+        self.opcoes = dict(opcoes, modelo=modelo)
+        self.ultimo_resultado = None
+
+    def __call__(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+        self.ultimo_resultado = encontrar_caminho_anytime(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid,
+                                                          tem_bola, orcamento_ms=self.orcamento_ms, **self.opcoes)
+        return list(self.ultimo_resultado.caminho)
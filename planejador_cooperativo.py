@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Planejamento cooperativo de vários robôs (WHCA*, A* cooperativo com janela).
+
+Os robôs são planejados um de cada vez, em ordem de prioridade, sobre uma tabela
+de reservas compartilhada no espaço-tempo: cada célula ocupada em cada tick e cada
+troca de células entre dois ticks fica reservada para o robô que a planejou, e os
+robôs seguintes só usam o que estiver livre (verificação O(1) em dicionários). A
+busca de cada robô é um A* sobre (célula, direção, tick) com a ação extra de
+esperar parado, limitada a uma janela de ticks. Dentro da janela valem os custos
+do candidato; no fim da janela o custo restante é o custo exato até o objetivo
+ignorando os outros robôs, calculado por uma busca reversa retomável (RRA*) que só
+avança o necessário para responder aos estados consultados. A ordem de prioridade
+gira a cada planejamento, para que nenhum robô fique sempre cedendo passagem.
+
+Robôs a mais de duas janelas de distância não podem se encontrar dentro da janela.
+Esses grupos independentes podem ser planejados em paralelo, em processos.
+'''
+
+import heapq
+import logging
+from concurrent.futures import ProcessPoolExecutor
+
+import candidato
+from candidato import MOVIMENTOS, N_DIRECOES, SEM_DIRECAO, CUSTO_INFINITO
+
+JANELA_PADRAO = 16
+
+# ==================== TABELA DE RESERVAS ====================
+class TabelaReservas:
+    """Reservas de células por tick e de trocas de células entre ticks, com consulta O(1)"""
+
+    def __init__(self, n_celulas):
+        self.n_celulas = n_celulas
+        self.vertices = {}      # tick * n_celulas + célula -> robô
+        self.arestas = set()    # (tick * n_celulas + origem) * n_celulas + destino: movimento entre tick e tick+1
+        self.ultimo_uso = {}    # Célula -> último tick reservado
+
+    def livre(self, celula, tick):
+        """Indica se a célula está livre no tick"""
+        return tick * self.n_celulas + celula not in self.vertices
+
+    def troca_livre(self, origem, destino, tick):
+        """Indica se ninguém vai de destino para origem entre tick e tick+1 (as posições se cruzariam)"""
+        return (tick * self.n_celulas + destino) * self.n_celulas + origem not in self.arestas
+
+    def livre_a_partir(self, celula, tick):
+        """Indica se a célula não está reservada em nenhum tick a partir deste"""
+        return self.ultimo_uso.get(celula, -1) < tick
+
+    def reservar(self, robo, celulas, ate=None):
+        """
+        Reserva a sequência de células de um robô, uma por tick a partir do tick 0
+        Args:
+            robo: Identificador do robô
+            celulas: Célula ocupada em cada tick
+            ate: Mantém a última célula reservada até este tick (None: não mantém)
+        """
+        n = self.n_celulas
+        for tick, celula in enumerate(celulas):
+            self.vertices[tick * n + celula] = robo
+            if tick + 1 < len(celulas) and celulas[tick + 1] != celula:
+                self.arestas.add((tick * n + celula) * n + celulas[tick + 1])
+        ultimo = len(celulas) - 1
+        if ate is not None:
+            for tick in range(len(celulas), ate + 1):
+                self.vertices[tick * n + celulas[-1]] = robo
+            ultimo = max(ultimo, ate)
+        for tick, celula in enumerate(celulas[:-1]):
+            if self.ultimo_uso.get(celula, -1) < tick:
+                self.ultimo_uso[celula] = tick
+        if self.ultimo_uso.get(celulas[-1], -1) < ultimo:
+            self.ultimo_uso[celulas[-1]] = ultimo
+
+# ==================== CUSTO RESTANTE (RRA*) ====================
+class CustoRestante:
+    """
+    Custo exato de cada estado (célula, direção) até o objetivo, ignorando os outros robôs
+    A busca parte do objetivo pelas arestas invertidas, guiada em direção à posição de
+    referência (onde o robô está), e é retomada sempre que um estado ainda não fechado é
+    consultado. Com a heurística octil consistente, o custo de um estado fechado é exato.
+    """
+
+    def __init__(self, pos_objetivo, referencia, campo, largura_grid, altura_grid, bola, modelo=None):
+        """
+        Args:
+            pos_objetivo: Tupla (x,y) com o objetivo
+            referencia: Tupla (x,y) para onde a busca reversa é guiada
+            campo: CampoCusto do cenário
+            largura_grid: Largura do grid
+            altura_grid: Altura do grid
+            bola: 1 com posse de bola, 0 sem
+            modelo: ModeloCusto (None usa MODELO_PADRAO)
+        """
+        self.modelo = modelo or candidato.MODELO_PADRAO
+        self.largura, self.altura = largura_grid, altura_grid
+        self.bloqueado, self.penalidade = campo.bloqueado, campo.penalidade
+        self.custo_mov = self.modelo.tabela()
+        self.bola = bola
+        self.referencia = referencia
+        self.celula_objetivo = pos_objetivo[1] * largura_grid + pos_objetivo[0]
+        self.fechados = {}    # Estado -> custo exato até o objetivo
+        self.g = {}
+        self.heap = []
+        h = self._estimar(self.celula_objetivo)
+        for direcao in range(N_DIRECOES):
+            estado = self.celula_objetivo * N_DIRECOES + direcao
+            self.g[estado] = 0
+            self.heap.append((h, estado))
+        heapq.heapify(self.heap)
+
+    def _estimar(self, celula):
+        return self.modelo.heuristica(celula % self.largura - self.referencia[0],
+                                      celula // self.largura - self.referencia[1])
+
+    def custo(self, celula, direcao):
+        """Custo restante do estado (CUSTO_INFINITO se o objetivo for inalcançável dele)"""
+        alvo = celula * N_DIRECOES + direcao
+        custo = self.fechados.get(alvo)
+        if custo is not None:
+            return custo
+        largura, altura = self.largura, self.altura
+        bloqueado, penalidade, custo_mov = self.bloqueado, self.penalidade, self.custo_mov
+        linha_bola = self.bola * N_DIRECOES
+        fechados, g, heap = self.fechados, self.g, self.heap
+        while heap:
+            _, estado = heapq.heappop(heap)
+            if estado in fechados:
+                continue
+            custo_atual = fechados[estado] = g[estado]
+            celula_atual, indice = divmod(estado, N_DIRECOES)
+            if indice != SEM_DIRECAO:
+                # Antecessor: a célula de onde MOVIMENTOS[indice] leva até esta (como em campo_objetivo)
+                x = celula_atual % largura - MOVIMENTOS[indice][0]
+                y = celula_atual // largura - MOVIMENTOS[indice][1]
+                anterior = y * largura + x
+                if (0 <= x < largura and 0 <= y < altura and not bloqueado[anterior]
+                        and anterior != self.celula_objetivo):
+                    custo_entrada = custo_atual + penalidade[celula_atual]
+                    h = self._estimar(anterior)
+                    for direcao_anterior in range(N_DIRECOES):
+                        novo = custo_entrada + custo_mov[(linha_bola + direcao_anterior) * 8 + indice]
+                        predecessor = anterior * N_DIRECOES + direcao_anterior
+                        if novo < g.get(predecessor, CUSTO_INFINITO):
+                            g[predecessor] = novo
+                            heapq.heappush(heap, (novo + h, predecessor))
+            if estado == alvo:
+                return custo_atual
+        return CUSTO_INFINITO
+
+# ==================== PLANEJADOR ====================
+class PlanejadorCooperativo:
+    """Planeja uma equipe de robôs sem colisões entre eles dentro da janela"""
+
+    def __init__(self, janela=JANELA_PADRAO, processos=None, modelo=None):
+        """
+        Args:
+            janela: Ticks planejados com reservas (os robôs devem replanejar antes do fim dela)
+            processos: Planeja grupos independentes de robôs em tantos processos (None: sequencial)
+            modelo: ModeloCusto dos passos, das esperas e do custo restante (None usa MODELO_PADRAO)
+        """
+        self.janela = janela
+        self.processos = processos
+        self.modelo = modelo or candidato.MODELO_PADRAO
+        self.custo_espera = self.modelo.custo_reto  # Ficar parado um tick custa um passo reto, sem rotação
+        self.executores = []     # Um processo por posição, para cada objetivo voltar ao mesmo processo
+        self.rodada = 0          # Desloca a ordem de prioridade a cada planejamento
+        self._chave = None
+        self._restantes = {}     # (objetivo, bola) -> CustoRestante do cenário atual
+        self.expansoes = 0
+
+    def __call__(self, pedidos, obstaculos, largura_grid, altura_grid):
+        return self.planejar(pedidos, obstaculos, largura_grid, altura_grid)
+
+    def planejar(self, pedidos, obstaculos, largura_grid, altura_grid):
+        """
+        Caminhos sem colisões para todos os robôs
+        Args:
+            pedidos: Um dicionário por robô com pos_inicial, pos_objetivo, tem_bola e direcao
+                     (último movimento, None se parado). Com a bola o objetivo é o gol:
+                     ao chegar, o robô sai do campo e a célula deixa de ser reservada
+            obstaculos: Lista de posições dos adversários
+            largura_grid: Largura do grid
+            altura_grid: Altura do grid
+        Returns:
+            Lista com o caminho de cada robô: uma posição por tick, começando pela atual
+            (posições repetidas são esperas), até o objetivo ou até o fim da janela;
+            vazia se o objetivo for inalcançável ou o robô não tiver como sair do lugar
+        """
+        n = len(pedidos)
+        ordem = [(self.rodada + i) % n for i in range(n)] if n else []
+        self.rodada += 1
+        grupos = self.grupos(pedidos) if self.processos else [ordem]
+        if len(grupos) < 2:
+            respostas = [self._planejar_grupo(pedidos, ordem, obstaculos, largura_grid, altura_grid)]
+        else:
+            if not self.executores:
+                self.executores = [ProcessPoolExecutor(max_workers=1) for _ in range(self.processos)]
+            futuros = []
+            for grupo in grupos:
+                # O mesmo objetivo vai sempre ao mesmo processo, que já tem sua busca reversa em cache
+                objetivo = min((pedidos[indice]["pos_objetivo"], pedidos[indice]["tem_bola"]) for indice in grupo)
+                executor = self.executores[hash(objetivo) % self.processos]
+                futuros.append(executor.submit(_planejar_grupo_em_processo, self.janela, self.modelo, pedidos,
+                                               [indice for indice in ordem if indice in grupo], obstaculos,
+                                               largura_grid, altura_grid))
+            respostas = [futuro.result() for futuro in futuros]
+        caminhos = [[] for _ in pedidos]
+        for resposta in respostas:
+            for indice, caminho in resposta.items():
+                caminhos[indice] = caminho
+        return caminhos
+
+    def grupos(self, pedidos):
+        """
+        Separa os robôs em grupos que não podem se encontrar dentro da janela (robôs de
+        grupos diferentes estão a mais de duas janelas de distância, direta ou indiretamente)
+        Returns:
+            Lista de conjuntos de índices de pedidos
+        """
+        grupo = list(range(len(pedidos)))
+
+        def raiz(i):
+            while grupo[i] != i:
+                grupo[i] = grupo[grupo[i]]
+                i = grupo[i]
+            return i
+
+        for i, a in enumerate(pedidos):
+            for j in range(i + 1, len(pedidos)):
+                b = pedidos[j]["pos_inicial"]
+                if max(abs(a["pos_inicial"][0] - b[0]), abs(a["pos_inicial"][1] - b[1])) <= 2 * self.janela:
+                    grupo[raiz(i)] = raiz(j)
+        por_raiz = {}
+        for i in range(len(pedidos)):
+            por_raiz.setdefault(raiz(i), set()).add(i)
+        return list(por_raiz.values())
+
+    def fechar(self):
+        """Encerra os processos do planejamento paralelo"""
+        for executor in self.executores:
+            executor.shutdown()
+        self.executores = []
+
+    # ---------- Planejamento sequencial ----------
+    def _custo_restante(self, pedido, campo, largura_grid, altura_grid):
+        """CustoRestante do objetivo do pedido, mantido enquanto o cenário não mudar"""
+        bola = 1 if pedido["tem_bola"] else 0
+        chave = (pedido["pos_objetivo"], bola)
+        restante = self._restantes.get(chave)
+        if restante is None:
+            restante = self._restantes[chave] = CustoRestante(pedido["pos_objetivo"], pedido["pos_inicial"], campo,
+                                                              largura_grid, altura_grid, bola, self.modelo)
+        return restante
+
+    def _planejar_grupo(self, pedidos, ordem, obstaculos, largura_grid, altura_grid):
+        """
+        Planeja os robôs de ordem, nessa ordem, sobre uma tabela de reservas nova
+        Returns:
+            Dicionário índice do pedido -> caminho
+        """
+        chave = candidato.chave_cenario(obstaculos, largura_grid, altura_grid)
+        if chave != self._chave:
+            self._chave = chave
+            self._restantes = {}
+        campo = candidato.obter_campo_custo(obstaculos, largura_grid, altura_grid)
+        reservas = TabelaReservas(largura_grid * altura_grid)
+        caminhos = {}
+        for indice in ordem:
+            pedido = pedidos[indice]
+            restante = self._custo_restante(pedido, campo, largura_grid, altura_grid)
+            caminho = self._planejar_robo(pedido, campo, restante, reservas)
+            x, y = pedido["pos_inicial"]
+            if caminho:
+                celulas = [py * largura_grid + px for px, py in caminho]
+                sai = pedido["tem_bola"] and caminho[-1] == pedido["pos_objetivo"]
+                reservas.reservar(indice, celulas, None if sai else self.janela)
+            else:
+                # Sem plano o robô fica onde está: os próximos desviam dele
+                reservas.reservar(indice, [y * largura_grid + x], self.janela)
+            caminhos[indice] = caminho
+        return caminhos
+
+    def _planejar_robo(self, pedido, campo, restante, reservas):
+        """A* no espaço-tempo de um robô, respeitando as reservas dos anteriores"""
+        largura, altura, janela = restante.largura, restante.altura, self.janela
+        n_celulas = largura * altura
+        bloqueado, penalidade = campo.bloqueado, campo.penalidade
+        custo_restante = restante.custo
+        bola = restante.bola
+        custo_mov = restante.custo_mov
+        sai = bool(bola)  # Com a bola o objetivo é o gol e o robô sai do campo ao chegar
+
+        (sx, sy), (gx, gy) = pedido["pos_inicial"], pedido["pos_objetivo"]
+        celula_objetivo = gy * largura + gx
+        direcao = MOVIMENTOS.index(pedido["direcao"]) if pedido.get("direcao") else SEM_DIRECAO
+        inicial = (sy * largura + sx) * N_DIRECOES + direcao
+        h = custo_restante(sy * largura + sx, direcao)
+        if h == CUSTO_INFINITO:
+            logging.warning(f"WHCA*: objetivo {pedido['pos_objetivo']} inalcançável de {pedido['pos_inicial']}")
+            return []
+
+        por_tick = n_celulas * N_DIRECOES
+        g = {inicial: 0}
+        pai = {inicial: -1}
+        heap = [(h, h, inicial)]
+        fechados = set()
+        final = None
+        while heap:
+            _, _, estado = heapq.heappop(heap)
+            if estado in fechados:
+                continue
+            fechados.add(estado)
+            self.expansoes += 1
+            tick, resto = divmod(estado, por_tick)
+            celula, anterior = divmod(resto, N_DIRECOES)
+            if celula == celula_objetivo and (sai or reservas.livre_a_partir(celula, tick)):
+                final = estado
+                break
+            if tick == janela:
+                final = estado  # Fim da janela: o restante é o custo do campo, sem reservas
+                break
+            g_atual = g[estado]
+            x, y = celula % largura, celula // largura
+            base = estado + por_tick - resto
+            linha_custos = (bola * N_DIRECOES + anterior) * 8
+
+            sucessores = []
+            if reservas.livre(celula, tick + 1):
+                sucessores.append((celula, anterior, self.custo_espera))
+            for indice, (dx, dy) in enumerate(MOVIMENTOS):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < largura and 0 <= ny < altura):
+                    continue
+                vizinha = ny * largura + nx
+                if (bloqueado[vizinha] or not reservas.livre(vizinha, tick + 1)
+                        or not reservas.troca_livre(celula, vizinha, tick)):
+                    continue
+                sucessores.append((vizinha, indice, custo_mov[linha_custos + indice] + penalidade[vizinha]))
+            for vizinha, indice, custo in sucessores:
+                proximo = base + vizinha * N_DIRECOES + indice
+                novo_g = g_atual + custo
+                if novo_g < g.get(proximo, CUSTO_INFINITO):
+                    h = custo_restante(vizinha, indice)
+                    if h == CUSTO_INFINITO:
+                        continue
+                    g[proximo] = novo_g
+                    pai[proximo] = estado
+                    heapq.heappush(heap, (novo_g + h, h, proximo))
+
+        if final is None:
+            return []
+        caminho = []
+        while final != -1:
+            celula = final % por_tick // N_DIRECOES
+            caminho.append((celula % largura, celula // largura))
+            final = pai[final]
+        caminho.reverse()
+        return caminho
+
+# Planejador de cada processo do planejamento paralelo (campos reaproveitados entre chamadas)
+_planejador_processo = None
+
+def _planejar_grupo_em_processo(janela, modelo, pedidos, ordem, obstaculos, largura_grid, altura_grid):
+    """Planeja um grupo independente de robôs (executada nos processos do pool)"""
+    global _planejador_processo
+    # O modelo chega como cópia a cada chamada: a comparação é pela tabela de custos
+    if (_planejador_processo is None or _planejador_processo.janela != janela or
+            _planejador_processo.modelo.tabela() != modelo.tabela()):
+        _planejador_processo = PlanejadorCooperativo(janela, modelo=modelo)
+    return _planejador_processo._planejar_grupo(pedidos, ordem, obstaculos, largura_grid, altura_grid)
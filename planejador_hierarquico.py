@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Planejamento hierárquico (HPA*) para campos grandes.
+
+O grid é dividido em clusters quadrados. Em cada fronteira entre dois clusters
+vizinhos são escolhidas algumas travessias (pares de células livres, uma de cada
+lado), e cada travessia orientada vira um nó do grafo abstrato: "entrar no cluster
+pela célula e com a direção da travessia". As arestas de um nó são calculadas com
+um Dijkstra restrito ao seu cluster, sobre (célula, direção), com os mesmos custos
+do candidato (rotação, posse de bola e proximidade), e ficam em cache. O custo de
+um caminho abstrato é exatamente o custo do caminho de células que ele representa.
+
+Uma consulta longa faz um A* sobre os nós abstratos, que só calcula as arestas dos
+clusters que alcança, e depois refina cada aresta com o trecho guardado pela busca
+local. Consultas curtas (entre clusters vizinhos) e os raros casos em que o grafo
+abstrato não encontra caminho são delegados a candidato.encontrar_caminho: em grids
+de até 3x3 clusters (30x30 com clusters de 10, o que inclui o campo padrão de
+20x15) toda consulta é curta e o planejador é a busca direta. Quando adversários
+mudam, apenas os clusters a até RAIO_PENALIDADE da mudança perdem seu cache.
+
+O caminho abstrato só atravessa fronteiras nos pontos escolhidos; por isso ele é
+refinado com uma busca direta restrita aos clusters que percorre (mais `corredor`
+clusters de margem). O resultado não é ótimo: medido contra a busca direta em
+grids de 30x20 a 160x120, com adversários mudando entre as consultas, o custo fica
+em média até 3% acima do ótimo com corredor=0 (pior caso 1,30x) e até 0,4% com
+corredor=1 (pior caso 1,03x).
+'''
+
+import heapq
+import logging
+import time
+from collections import Counter, OrderedDict
+
+import candidato
+from candidato import MOVIMENTOS, N_DIRECOES, SEM_DIRECAO, CUSTO_INFINITO, RAIO_PENALIDADE
+from mapa import MapaOcupacao
+
+TAMANHO_CLUSTER_PADRAO = 10
+# Trechos livres de fronteira a partir deste comprimento recebem duas travessias em vez de uma
+TRECHO_LONGO = 6
+# Clusters de margem ao redor do caminho abstrato em que o refinamento também pode passar
+# (None desliga o refinamento; 1 fica a até 1,03x do ótimo nas medições, com até o dobro do tempo de 0,
+# que chegou a 1,30x; ver a docstring do módulo)
+CORREDOR_PADRAO = 0
+
+# ==================== BUSCA LOCAL ====================
+class _BuscaLocal:
+    """Dijkstra sobre (célula, direção) restrito a um cluster, a partir de um estado fixo"""
+
+    def __init__(self, planejador, cluster, celula, direcao, bola):
+        """
+        Args:
+            planejador: PlanejadorHierarquico dono do campo e dos custos
+            cluster: Índice do cluster
+            celula: Célula inicial (índice no grid inteiro)
+            direcao: Índice em MOVIMENTOS da direção de chegada (SEM_DIRECAO no início da consulta)
+            bola: 1 com posse de bola, 0 sem
+        """
+        largura = planejador.largura
+        x0, y0, x1, y1 = planejador.limites(cluster)
+        w = x1 - x0
+        self.largura, self.x0, self.y0, self.w = largura, x0, y0, w
+        vizinhanca = planejador.vizinhanca(cluster)
+        custo_mov = planejador.custo_mov[bola]
+
+        dist = [CUSTO_INFINITO] * (len(vizinhanca) * N_DIRECOES)
+        pai = [-1] * len(dist)
+        inicial = ((celula // largura - y0) * w + celula % largura - x0) * N_DIRECOES + direcao
+        dist[inicial] = 0
+        heap = [(0, inicial)]
+        while heap:
+            d, estado = heapq.heappop(heap)
+            if d > dist[estado]:
+                continue
+            local, anterior = divmod(estado, N_DIRECOES)
+            linha_custos = anterior * 8
+            for indice, vizinha, penalidade in vizinhanca[local]:
+                novo = d + custo_mov[linha_custos + indice] + penalidade
+                proximo = vizinha * N_DIRECOES + indice
+                if novo < dist[proximo]:
+                    dist[proximo] = novo
+                    pai[proximo] = estado
+                    heapq.heappush(heap, (novo, proximo))
+        self.dist = dist
+        self.pai = pai
+        self.custo_mov = custo_mov
+        self._saidas = None   # Lista de saídas usada em _arestas (recalculada se o cluster ganhar outra)
+        self._arestas = None
+
+    def _local(self, celula):
+        return (celula // self.largura - self.y0) * self.w + celula % self.largura - self.x0
+
+    def custo_ate(self, celula):
+        """Tupla (custo, estado) da melhor chegada à célula, com qualquer direção"""
+        base = self._local(celula) * N_DIRECOES
+        estado = min(range(base, base + N_DIRECOES), key=self.dist.__getitem__)
+        return self.dist[estado], estado
+
+    def custo_saida(self, celula, indice):
+        """Tupla (custo, estado): chegar à célula e dar o passo indice para fora do cluster (sem a penalidade)"""
+        base = self._local(celula) * N_DIRECOES
+        dist, custo_mov = self.dist, self.custo_mov
+        melhor, melhor_estado = CUSTO_INFINITO, -1
+        for direcao in range(N_DIRECOES):
+            custo = dist[base + direcao] + custo_mov[direcao * 8 + indice]
+            if custo < melhor:
+                melhor, melhor_estado = custo, base + direcao
+        return melhor, melhor_estado
+
+    def arestas(self, saidas):
+        """
+        Arestas abstratas a partir do estado inicial, em cache enquanto as saídas do cluster não mudarem
+        Args:
+            saidas: Lista de PlanejadorHierarquico.saidas do cluster
+        Returns:
+            Lista de (nó vizinho, custo sem a penalidade de entrada no vizinho, estado final do trecho)
+        """
+        if self._saidas is not saidas:
+            self._arestas = []
+            for dentro, fora, indice in saidas:
+                custo, estado = self.custo_saida(dentro, indice)
+                if custo < CUSTO_INFINITO:
+                    self._arestas.append(((dentro, fora), custo, estado))
+            self._saidas = saidas
+        return self._arestas
+
+    def caminho(self, estado):
+        """Posições da célula inicial até a célula do estado"""
+        caminho = []
+        while estado != -1:
+            local = estado // N_DIRECOES
+            caminho.append((local % self.w + self.x0, local // self.w + self.y0))
+            estado = self.pai[estado]
+        caminho.reverse()
+        return caminho
+
+# ==================== PLANEJADOR HPA* ====================
+_INICIO = (-1, -1)
+_OBJETIVO = (-2, -2)
+
+class PlanejadorHierarquico:
+    """Grafo abstrato de travessias entre clusters, construído sob demanda e mantido entre consultas"""
+
+    def __init__(self, obstaculos, largura_grid, altura_grid, tamanho_cluster=TAMANHO_CLUSTER_PADRAO, modelo=None,
+                 corredor=CORREDOR_PADRAO):
+        """
+        Args:
+            obstaculos: Lista de posições dos adversários ou MapaOcupacao (copiado: adicionar_obstaculo
+                        e remover_obstaculo não alteram o mapa recebido)
+            largura_grid: Largura do grid
+            altura_grid: Altura do grid
+            tamanho_cluster: Lado dos clusters, em células
+            modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+            corredor: Clusters vizinhos incluídos no refinamento em volta do caminho abstrato
+                      (None devolve o caminho abstrato sem refinar)
+        """
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.tamanho = tamanho_cluster
+        self.corredor = corredor
+        self.clusters_x = -(-largura_grid // tamanho_cluster)
+        self.clusters_y = -(-altura_grid // tamanho_cluster)
+        self.modelo = modelo or candidato.MODELO_PADRAO
+        tabela = self.modelo.tabela()
+        self.custo_mov = [tabela[:N_DIRECOES * 8], tabela[N_DIRECOES * 8:]]
+        if isinstance(obstaculos, MapaOcupacao):
+            self.mapa = obstaculos.copiar()
+            self.obstaculos = None
+            self.campo = candidato.obter_campo_custo(self.mapa, largura_grid, altura_grid)
+        else:
+            self.mapa = None
+            self.obstaculos = Counter(obstaculos)
+            self.campo = candidato.CampoCusto(obstaculos, largura_grid, altura_grid)
+
+        self._transicoes = {}  # Fronteira -> lista de pares (célula, célula vizinha)
+        self._saidas = {}      # Cluster -> lista de (célula de dentro, célula de fora, índice do movimento)
+        self._buscas = {}      # Cluster -> {(nó, bola): _BuscaLocal}
+        self._vizinhancas = {} # Cluster -> movimentos possíveis de cada célula (ver vizinhanca)
+        self.buscas_locais = 0     # Dijkstras locais executados desde a criação
+        self.invalidacoes = 0      # Clusters que perderam o cache por mudanças de adversários
+
+    # ---------- Clusters e fronteiras ----------
+    def cluster(self, celula):
+        """Índice do cluster da célula"""
+        return (celula // self.largura // self.tamanho) * self.clusters_x + celula % self.largura // self.tamanho
+
+    def limites(self, cluster):
+        """Tupla (x0, y0, x1, y1) do cluster, com x1 e y1 exclusivos"""
+        cx, cy = cluster % self.clusters_x, cluster // self.clusters_x
+        return (cx * self.tamanho, cy * self.tamanho,
+                min(self.largura, (cx + 1) * self.tamanho), min(self.altura, (cy + 1) * self.tamanho))
+
+    def _fronteiras(self, cluster):
+        """Fronteiras do cluster: ("v", cx, cy) separa (cx, cy) de (cx + 1, cy); ("h", cx, cy) de (cx, cy + 1)"""
+        cx, cy = cluster % self.clusters_x, cluster // self.clusters_x
+        fronteiras = []
+        if cx + 1 < self.clusters_x:
+            fronteiras.append(("v", cx, cy))
+        if cx > 0:
+            fronteiras.append(("v", cx - 1, cy))
+        if cy + 1 < self.clusters_y:
+            fronteiras.append(("h", cx, cy))
+        if cy > 0:
+            fronteiras.append(("h", cx, cy - 1))
+        return fronteiras
+
+    def _travessias(self, fronteira):
+        """
+        Pares (célula, célula vizinha) escolhidos para atravessar a fronteira
+        Cada trecho contínuo de pares livres recebe uma travessia (duas, nas metades de trechos
+        com TRECHO_LONGO pares ou mais), no par de menor penalidade, preferindo o meio.
+        """
+        travessias = self._transicoes.get(fronteira)
+        if travessias is not None:
+            return travessias
+        tipo, cx, cy = fronteira
+        largura, tamanho = self.largura, self.tamanho
+        if tipo == "v":
+            x = (cx + 1) * tamanho - 1
+            pares = [(y * largura + x, y * largura + x + 1)
+                     for y in range(cy * tamanho, min(self.altura, (cy + 1) * tamanho))]
+        else:
+            y = (cy + 1) * tamanho - 1
+            pares = [(y * largura + x, (y + 1) * largura + x)
+                     for x in range(cx * tamanho, min(largura, (cx + 1) * tamanho))]
+        bloqueado, penalidade = self.campo.bloqueado, self.campo.penalidade
+
+        travessias = []
+        trecho = []
+        for par in pares + [None]:
+            if par is not None and not bloqueado[par[0]] and not bloqueado[par[1]]:
+                trecho.append(par)
+                continue
+            if trecho:
+                partes = [trecho] if len(trecho) < TRECHO_LONGO else [trecho[:len(trecho) // 2],
+                                                                       trecho[len(trecho) // 2:]]
+                for parte in partes:
+                    meio = (len(parte) - 1) / 2
+                    travessias.append(min(enumerate(parte), key=lambda item: (
+                        penalidade[item[1][0]] + penalidade[item[1][1]], abs(item[0] - meio)))[1])
+                trecho = []
+        self._transicoes[fronteira] = travessias
+        return travessias
+
+    def saidas(self, cluster):
+        """Lista de (célula de dentro, célula de fora, índice do movimento) das travessias do cluster"""
+        saidas = self._saidas.get(cluster)
+        if saidas is None:
+            saidas = []
+            largura = self.largura
+            for fronteira in self._fronteiras(cluster):
+                for a, b in self._travessias(fronteira):
+                    dentro, fora = (a, b) if self.cluster(a) == cluster else (b, a)
+                    movimento = (fora % largura - dentro % largura, fora // largura - dentro // largura)
+                    saidas.append((dentro, fora, MOVIMENTOS.index(movimento)))
+            self._saidas[cluster] = saidas
+        return saidas
+
+    def vizinhanca(self, cluster):
+        """
+        Para cada célula do cluster (em índice local), a lista de (índice do movimento,
+        célula vizinha livre no cluster, penalidade de entrar nela), calculada uma vez
+        """
+        vizinhanca = self._vizinhancas.get(cluster)
+        if vizinhanca is None:
+            x0, y0, x1, y1 = self.limites(cluster)
+            w, largura = x1 - x0, self.largura
+            bloqueado, penalidade = self.campo.bloqueado, self.campo.penalidade
+            vizinhanca = []
+            for y in range(y0, y1):
+                for x in range(x0, x1):
+                    vizinhas = []
+                    for indice, (dx, dy) in enumerate(MOVIMENTOS):
+                        nx, ny = x + dx, y + dy
+                        if x0 <= nx < x1 and y0 <= ny < y1 and not bloqueado[ny * largura + nx]:
+                            vizinhas.append((indice, (ny - y0) * w + nx - x0, penalidade[ny * largura + nx]))
+                    vizinhanca.append(vizinhas)
+            self._vizinhancas[cluster] = vizinhanca
+        return vizinhanca
+
+    def _busca(self, no, bola):
+        """_BuscaLocal a partir do nó (célula de origem, célula de entrada), calculada uma vez"""
+        origem, entrada = no
+        cluster = self.cluster(entrada)
+        buscas = self._buscas.setdefault(cluster, {})
+        busca = buscas.get((no, bola))
+        if busca is None:
+            largura = self.largura
+            movimento = (entrada % largura - origem % largura, entrada // largura - origem // largura)
+            busca = buscas[(no, bola)] = _BuscaLocal(self, cluster, entrada, MOVIMENTOS.index(movimento), bola)
+            self.buscas_locais += 1
+        return busca
+
+    # ---------- Mudanças de adversários ----------
+    def _invalidar(self, posicao):
+        """Descarta o cache dos clusters cujas células mudaram de custo com um adversário em posicao"""
+        x, y = posicao
+        t = self.tamanho
+        for cy in range(max(0, y - RAIO_PENALIDADE) // t, min(self.altura - 1, y + RAIO_PENALIDADE) // t + 1):
+            for cx in range(max(0, x - RAIO_PENALIDADE) // t, min(self.largura - 1, x + RAIO_PENALIDADE) // t + 1):
+                cluster = cy * self.clusters_x + cx
+                self._buscas.pop(cluster, None)
+                self._vizinhancas.pop(cluster, None)
+                for fronteira in self._fronteiras(cluster):
+                    self._transicoes.pop(fronteira, None)
+                # As saídas dos vizinhos usam as mesmas fronteiras
+                for vizinho in (cluster, cluster - 1, cluster + 1, cluster - self.clusters_x, cluster + self.clusters_x):
+                    self._saidas.pop(vizinho, None)
+                self.invalidacoes += 1
+
+    def adicionar_obstaculo(self, posicao):
+        """Registra um adversário em posicao"""
+        if self.mapa is not None:
+            self.mapa.ocupar(posicao)
+            self.campo = candidato.obter_campo_custo(self.mapa, self.largura, self.altura)
+        else:
+            self.obstaculos[posicao] += 1
+            self.campo.adicionar_obstaculo(posicao)
+        self._invalidar(posicao)
+
+    def remover_obstaculo(self, posicao):
+        """Remove um adversário de posicao"""
+        if self.mapa is not None:
+            self.mapa.liberar(posicao)
+            self.campo = candidato.obter_campo_custo(self.mapa, self.largura, self.altura)
+        else:
+            if not self.obstaculos[posicao]:
+                return
+            self.obstaculos[posicao] -= 1
+            if not self.obstaculos[posicao]:
+                del self.obstaculos[posicao]
+            self.campo.remover_obstaculo(posicao)
+        self._invalidar(posicao)
+
+    def atualizar_obstaculos(self, obstaculos):
+        """Aplica apenas as diferenças entre a lista atual de adversários e a nova"""
+        novos = Counter(obstaculos)
+        for posicao in list((self.obstaculos - novos).elements()):
+            self.remover_obstaculo(posicao)
+        for posicao in list((novos - self.obstaculos).elements()):
+            self.adicionar_obstaculo(posicao)
+
+    # ---------- Consulta ----------
+    def _obstaculos_atuais(self):
+        return self.mapa if self.mapa is not None else list(self.obstaculos.elements())
+
+    def _refinar(self, caminho, custo, bola):
+        """
+        A* sobre (célula, direção) restrito ao corredor: os clusters do caminho abstrato e
+        os vizinhos a até self.corredor clusters deles. O caminho abstrato está no corredor,
+        então o resultado nunca é pior e estados com f >= custo são descartados.
+        Returns:
+            Tupla (caminho, custo)
+        """
+        largura, altura = self.largura, self.altura
+        clusters_x, clusters_y, t = self.clusters_x, self.clusters_y, self.tamanho
+        permitido = bytearray(clusters_x * clusters_y)
+        margem = self.corredor
+        for cluster in {self.cluster(y * largura + x) for x, y in caminho}:
+            cx, cy = cluster % clusters_x, cluster // clusters_x
+            for vy in range(max(0, cy - margem), min(clusters_y, cy + margem + 1)):
+                for vx in range(max(0, cx - margem), min(clusters_x, cx + margem + 1)):
+                    permitido[vy * clusters_x + vx] = 1
+
+        bloqueado, penalidade = self.campo.bloqueado, self.campo.penalidade
+        custo_mov = self.custo_mov[bola]
+        estimar = self.modelo.heuristica
+        (sx, sy), (gx, gy) = caminho[0], caminho[-1]
+        inicial = (sy * largura + sx) * N_DIRECOES + SEM_DIRECAO
+        g = {inicial: 0}
+        pai = {inicial: -1}
+        heap = [(estimar(sx - gx, sy - gy), 0, inicial)]
+        fechados = set()
+        while heap:
+            f, _, estado = heapq.heappop(heap)
+            if f >= custo:
+                return caminho, custo  # Nada melhor que o caminho abstrato
+            if estado in fechados:
+                continue
+            fechados.add(estado)
+            celula, anterior = divmod(estado, N_DIRECOES)
+            x, y = celula % largura, celula // largura
+            if x == gx and y == gy:
+                refinado = []
+                while estado != -1:
+                    celula = estado // N_DIRECOES
+                    refinado.append((celula % largura, celula // largura))
+                    estado = pai[estado]
+                refinado.reverse()
+                return refinado, g[(gy * largura + gx) * N_DIRECOES + anterior]
+            g_atual = g[estado]
+            linha_custos = anterior * 8
+            for indice, (dx, dy) in enumerate(MOVIMENTOS):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < largura and 0 <= ny < altura) or not permitido[ny // t * clusters_x + nx // t]:
+                    continue
+                vizinha = ny * largura + nx
+                if bloqueado[vizinha]:
+                    continue
+                novo_g = g_atual + custo_mov[linha_custos + indice] + penalidade[vizinha]
+                proximo = vizinha * N_DIRECOES + indice
+                if novo_g < g.get(proximo, CUSTO_INFINITO):
+                    g[proximo] = novo_g
+                    pai[proximo] = estado
+                    h = estimar(nx - gx, ny - gy)
+                    heapq.heappush(heap, (novo_g + h, h, proximo))
+        return caminho, custo
+
+    def planejar(self, pos_inicial, pos_objetivo, tem_bola=False, estatisticas=None):
+        """
+        Caminho de pos_inicial até pos_objetivo
+        Args:
+            pos_inicial: Tupla (x,y) com a posição inicial
+            pos_objetivo: Tupla (x,y) com o objetivo
+            tem_bola: Indica se o robô está com a bola
+            estatisticas: EstatisticasBusca opcional (as expansões são as de nós abstratos)
+        Returns:
+            Lista de posições (vazia se não houver caminho)
+        """
+        largura = self.largura
+        celula_inicial = pos_inicial[1] * largura + pos_inicial[0]
+        celula_objetivo = pos_objetivo[1] * largura + pos_objetivo[0]
+        cluster_inicial, cluster_objetivo = self.cluster(celula_inicial), self.cluster(celula_objetivo)
+        if (abs(cluster_inicial % self.clusters_x - cluster_objetivo % self.clusters_x) <= 1 and
+                abs(cluster_inicial // self.clusters_x - cluster_objetivo // self.clusters_x) <= 1):
+            # Consulta curta: a busca direta já é local
+            logging.info("HPA*: início e objetivo em clusters vizinhos; busca direta no grid")
+            return candidato.encontrar_caminho(pos_inicial, pos_objetivo, self._obstaculos_atuais(), largura,
+                                               self.altura, tem_bola, modelo=self.modelo, estatisticas=estatisticas)
+
+        inicio = time.perf_counter()
+        bola = 1 if tem_bola else 0
+        penalidade = self.campo.penalidade
+        estimar = self.modelo.heuristica
+        gx, gy = pos_objetivo
+        buscas = {_INICIO: _BuscaLocal(self, cluster_inicial, celula_inicial, SEM_DIRECAO, bola)}
+
+        g = {_INICIO: 0}
+        pai = {}  # Nó -> (nó anterior, estado final do trecho na busca local do nó anterior)
+        fechados = set()
+        heap = [(estimar(pos_inicial[0] - gx, pos_inicial[1] - gy), 0, _INICIO)]
+        expansoes = duplicados = pico_abertos = 0
+        insercoes = 1
+        inicio_busca = time.perf_counter()
+
+        while heap:
+            if len(heap) > pico_abertos:
+                pico_abertos = len(heap)
+            _, _, no = heapq.heappop(heap)
+            if no in fechados:
+                duplicados += 1
+                continue
+            if no == _OBJETIVO:
+                break
+            fechados.add(no)
+            expansoes += 1
+            busca = buscas.get(no)
+            if busca is None:
+                busca = buscas[no] = self._busca(no, bola)
+            cluster = cluster_inicial if no == _INICIO else self.cluster(no[1])
+            g_no = g[no]
+
+            vizinhos = [(vizinho, custo + penalidade[vizinho[1]], estado)
+                        for vizinho, custo, estado in busca.arestas(self.saidas(cluster))]
+            if cluster == cluster_objetivo:
+                custo, estado = busca.custo_ate(celula_objetivo)
+                if custo < CUSTO_INFINITO:
+                    vizinhos.append((_OBJETIVO, custo, estado))
+            for vizinho, custo, estado in vizinhos:
+                novo_g = g_no + custo
+                if novo_g < g.get(vizinho, CUSTO_INFINITO) and vizinho not in fechados:
+                    g[vizinho] = novo_g
+                    pai[vizinho] = (no, estado)
+                    if vizinho == _OBJETIVO:
+                        h = 0
+                    else:
+                        h = estimar(vizinho[1] % largura - gx, vizinho[1] // largura - gy)
+                    heapq.heappush(heap, (novo_g + h, h, vizinho))
+                    insercoes += 1
+        fim_busca = time.perf_counter()
+
+        if _OBJETIVO not in g:
+            logging.info("HPA*: sem caminho no grafo abstrato; busca direta no grid")
+            return candidato.encontrar_caminho(pos_inicial, pos_objetivo, self._obstaculos_atuais(), largura,
+                                               self.altura, tem_bola, modelo=self.modelo, estatisticas=estatisticas)
+
+        # Cada aresta abstrata vira o trecho de células da sua busca local
+        trechos = []
+        no = _OBJETIVO
+        while no != _INICIO:
+            anterior, estado = pai[no]
+            trechos.append(buscas[anterior].caminho(estado))
+            no = anterior
+        caminho = [posicao for trecho in reversed(trechos) for posicao in trecho]
+        custo = g[_OBJETIVO]
+        if self.corredor is not None:
+            caminho, custo = self._refinar(caminho, custo, bola)
+        logging.info(f"HPA*: custo {custo} (abstrato {g[_OBJETIVO]}) | Passos: {len(caminho)} | "
+                     f"Nós abstratos expandidos: {expansoes} | Buscas locais em cache: {self.buscas_locais}")
+        if estatisticas is not None:
+            estatisticas.preencher(expansoes, insercoes, duplicados, pico_abertos, custo, len(caminho),
+                                   (inicio, inicio_busca, fim_busca, time.perf_counter()))
+        return caminho
+
+# ==================== INTERFACE DO CANDIDATO ====================
+class ReplanejadorHierarquico:
+    """
+    Planejador com a assinatura de candidato.encontrar_caminho que mantém o grafo abstrato
+    entre chamadas: uma nova lista de adversários só invalida os clusters que mudaram
+    """
+
+    def __init__(self, tamanho_cluster=TAMANHO_CLUSTER_PADRAO, modelo=None, corredor=CORREDOR_PADRAO):
+        self.tamanho_cluster = tamanho_cluster
+        self.modelo = modelo
+        self.corredor = corredor
+        self.planejador = None
+        self.chave = None
+
+    def __call__(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                 estatisticas=None):
+        mapa = obstaculos if isinstance(obstaculos, MapaOcupacao) else None
+        chave = (largura_grid, altura_grid, id(mapa), mapa.versao if mapa is not None else None)
+        if self.planejador is None or self.chave[:3] != chave[:3] or (mapa is not None and self.chave != chave):
+            # Um mapa alterado fora do planejador não diz quais células mudaram: o grafo é refeito
+            self.planejador = PlanejadorHierarquico(obstaculos, largura_grid, altura_grid, self.tamanho_cluster,
+                                                    self.modelo, self.corredor)
+        elif mapa is None:
+            self.planejador.atualizar_obstaculos(obstaculos)
+        self.chave = chave
+        return self.planejador.planejar(pos_inicial, pos_objetivo, tem_bola, estatisticas)
+
+# Grafos dos cenários mais recentes (mesma política de candidato.obter_campo_custo)
+TAMANHO_CACHE_HIERARQUICO = 4
+_cache_planejadores = OrderedDict()
+
+def encontrar_caminho_hierarquico(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False,
+                                  tamanho_cluster=TAMANHO_CLUSTER_PADRAO, estatisticas=None, corredor=CORREDOR_PADRAO):
+    """candidato.encontrar_caminho via HPA*, com o grafo abstrato do cenário em cache"""
+    chave = (candidato.chave_cenario(obstaculos, largura_grid, altura_grid), tamanho_cluster, corredor)
+    planejador = _cache_planejadores.get(chave)
+    if planejador is None:
+        planejador = _cache_planejadores[chave] = PlanejadorHierarquico(obstaculos, largura_grid, altura_grid,
+                                                                        tamanho_cluster, corredor=corredor)
+        if len(_cache_planejadores) > TAMANHO_CACHE_HIERARQUICO:
+            _cache_planejadores.popitem(last=False)
+    else:
+        _cache_planejadores.move_to_end(chave)
+    return planejador.planejar(pos_inicial, pos_objetivo, tem_bola, estatisticas)
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Planejamento incremental (D* Lite) para adversários que se movem.
+
+A árvore de busca é mantida entre chamadas: quando adversários entram ou saem
+de uma célula, apenas as arestas cujo custo mudou (célula do adversário e sua
+vizinhança de penalidade) são reparadas, em vez de refazer o A* do zero.
+Os custos são os mesmos do candidato: tabela do ModeloCusto (rotação e posse
+de bola) e penalidade de proximidade do CampoCusto.
+'''
+
+import heapq
+import logging
+from collections import Counter
+
+import candidato
+from candidato import MOVIMENTOS, N_DIRECOES, SEM_DIRECAO, CUSTO_INFINITO, RAIO_PENALIDADE
+
+# ==================== PLANEJADOR D* LITE ====================
+class PlanejadorIncremental:
+    """D* Lite sobre o espaço (célula, direção anterior) com posse de bola fixa"""
+
+    def __init__(self, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False, modelo=None):
+        """
+        Prepara a busca a partir do objetivo
+        Args:
+            pos_objetivo: Tupla (x,y) com o objetivo
+            obstaculos: Lista de posições dos adversários
+            largura_grid: Largura do grid de busca
+            altura_grid: Altura do grid de busca
+            tem_bola: Indica se o robô está com a bola durante todo o trajeto
+            modelo: ModeloCusto com os custos de movimento (None usa candidato.MODELO_PADRAO)
+        """
+        self.largura = largura_grid
+        self.altura = altura_grid
+        self.pos_objetivo = pos_objetivo
+        self.tem_bola = tem_bola
+        self.campo = candidato.CampoCusto(obstaculos, largura_grid, altura_grid)
+        self.obstaculos = Counter(obstaculos)
+
+        self.modelo = modelo or candidato.MODELO_PADRAO
+        tabela = candidato.tabela_custo_movimento(self.modelo)
+        bola = 1 if tem_bola else 0
+        self.custo_mov = tabela[bola * N_DIRECOES * 8:(bola + 1) * N_DIRECOES * 8]
+        # Todo passo custa ao menos o menor passo do modelo (tabela() já calculou passo_reto e passo_diagonal)
+        self.custo_minimo = min(self.modelo.passo_reto, self.modelo.passo_diagonal)
+
+        # Vizinhança pré-calculada: célula * 8 + movimento -> célula de destino / de origem (-1 fora do grid)
+        n_celulas = largura_grid * altura_grid
+        self.destino = [-1] * (n_celulas * 8)
+        self.origem = [-1] * (n_celulas * 8)
+        for celula in range(n_celulas):
+            x, y = celula % largura_grid, celula // largura_grid
+            for indice, (dx, dy) in enumerate(MOVIMENTOS):
+                if 0 <= x + dx < largura_grid and 0 <= y + dy < altura_grid:
+                    self.destino[celula * 8 + indice] = (y + dy) * largura_grid + x + dx
+                if 0 <= x - dx < largura_grid and 0 <= y - dy < altura_grid:
+                    self.origem[celula * 8 + indice] = (y - dy) * largura_grid + x - dx
+
+        n_estados = n_celulas * N_DIRECOES
+        self.g = [CUSTO_INFINITO] * n_estados
+        self.rhs = [CUSTO_INFINITO] * n_estados
+        self.chave = [None] * n_estados  # Chave atual do estado na fila (None = fora da fila)
+        self.fila = []
+        self.km = 0
+        self.estado_inicial = None
+        self.x_inicial = self.y_inicial = None
+        self.pendentes = {}  # Célula -> (bloqueado, penalidade) antes das mudanças ainda não reparadas
+        self.expansoes = 0
+
+        self.celula_objetivo = pos_objetivo[1] * largura_grid + pos_objetivo[0]
+        for direcao in range(N_DIRECOES):
+            estado = self.celula_objetivo * N_DIRECOES + direcao
+            self.rhs[estado] = 0
+            self._enfileirar(estado)
+
+    # ---------- Auxiliares ----------
+    def _heuristica(self, celula):
+        """Limite inferior do custo entre a posição inicial e a célula (Chebyshev x menor custo de passo)"""
+        if self.x_inicial is None:
+            return 0
+        return max(abs(celula % self.largura - self.x_inicial),
+                   abs(celula // self.largura - self.y_inicial)) * self.custo_minimo
+
+    def _calcular_chave(self, estado):
+        g, rhs = self.g[estado], self.rhs[estado]
+        k2 = g if g < rhs else rhs
+        return (k2 + self._heuristica(estado // N_DIRECOES) + self.km, k2)
+
+    def _enfileirar(self, estado):
+        """Coloca o estado na fila se estiver inconsistente; caso contrário o retira"""
+        if self.g[estado] != self.rhs[estado]:
+            chave = self._calcular_chave(estado)
+            self.chave[estado] = chave
+            heapq.heappush(self.fila, (chave, estado))
+        else:
+            self.chave[estado] = None
+
+    def _topo(self):
+        """Descarta entradas obsoletas e devolve a menor entrada válida"""
+        fila = self.fila
+        while fila and self.chave[fila[0][1]] != fila[0][0]:
+            heapq.heappop(fila)
+        return fila[0] if fila else None
+
+    def _recalcular_rhs(self, estado):
+        """rhs = menor custo de aresta + g entre os sucessores do estado"""
+        celula, direcao = divmod(estado, N_DIRECOES)
+        g = self.g
+        bloqueado = self.campo.bloqueado
+        penalidade = self.campo.penalidade
+        custo_mov = self.custo_mov
+        destino = self.destino
+        base_mov = direcao * 8
+        base_vizinho = celula * 8
+        melhor = CUSTO_INFINITO
+        for indice in range(8):
+            vizinha = destino[base_vizinho + indice]
+            if vizinha < 0 or bloqueado[vizinha]:
+                continue
+            total = custo_mov[base_mov + indice] + penalidade[vizinha] + g[vizinha * N_DIRECOES + indice]
+            if total < melhor:
+                melhor = total
+        return melhor
+
+    def _custo_entrada(self, celula, indice, direcao):
+        """Custo de entrar na célula pelo movimento indice vindo da direção anterior"""
+        if self.campo.bloqueado[celula]:
+            return CUSTO_INFINITO
+        return self.custo_mov[direcao * 8 + indice] + self.campo.penalidade[celula]
+
+    def _calcular_caminho_minimo(self):
+        inicial = self.estado_inicial
+        g, rhs, fila = self.g, self.rhs, self.fila
+        while True:
+            topo = self._topo()
+            if topo is None:
+                break
+            if topo[0] >= self._calcular_chave(inicial) and rhs[inicial] == g[inicial]:
+                break
+            chave_antiga, estado = heapq.heappop(fila)
+            self.expansoes += 1
+            chave_nova = self._calcular_chave(estado)
+            if chave_antiga < chave_nova:
+                self.chave[estado] = chave_nova
+                heapq.heappush(fila, (chave_nova, estado))
+                continue
+
+            celula, indice = divmod(estado, N_DIRECOES)
+            anterior = self.origem[celula * 8 + indice] if indice != SEM_DIRECAO else -1
+            if g[estado] > rhs[estado]:
+                # Estado sobreconsistente: g diminui e os antecessores só podem melhorar
+                g[estado] = rhs[estado]
+                self.chave[estado] = None
+                if anterior < 0 or anterior == self.celula_objetivo:
+                    continue
+                for direcao in range(N_DIRECOES):
+                    total = self._custo_entrada(celula, indice, direcao) + g[estado]
+                    predecessor = anterior * N_DIRECOES + direcao
+                    if total < rhs[predecessor]:
+                        rhs[predecessor] = total
+                        self._enfileirar(predecessor)
+            else:
+                # Estado subconsistente: antecessores que dependiam dele recalculam rhs
+                g_antigo = g[estado]
+                g[estado] = CUSTO_INFINITO
+                self._enfileirar(estado)
+                if anterior < 0 or anterior == self.celula_objetivo:
+                    continue
+                for direcao in range(N_DIRECOES):
+                    predecessor = anterior * N_DIRECOES + direcao
+                    if rhs[predecessor] == self._custo_entrada(celula, indice, direcao) + g_antigo:
+                        rhs[predecessor] = self._recalcular_rhs(predecessor)
+                        self._enfileirar(predecessor)
+
+    # ---------- Mudanças de obstáculos ----------
+    def _registrar_vizinhanca(self, posicao):
+        """Guarda o custo antigo das células cujo custo de entrada muda com um adversário em posicao"""
+        ox, oy = posicao
+        for y in range(max(0, oy - RAIO_PENALIDADE), min(self.altura, oy + RAIO_PENALIDADE + 1)):
+            for x in range(max(0, ox - RAIO_PENALIDADE), min(self.largura, ox + RAIO_PENALIDADE + 1)):
+                celula = y * self.largura + x
+                if celula not in self.pendentes:
+                    self.pendentes[celula] = (self.campo.bloqueado[celula], self.campo.penalidade[celula])
+
+    def adicionar_obstaculo(self, posicao):
+        """Um adversário passou a ocupar a posição"""
+        self._registrar_vizinhanca(posicao)
+        self.campo.adicionar_obstaculo(posicao)
+        self.obstaculos[posicao] += 1
+
+    def remover_obstaculo(self, posicao):
+        """Um adversário deixou a posição"""
+        self._registrar_vizinhanca(posicao)
+        self.campo.remover_obstaculo(posicao)
+        self.obstaculos[posicao] -= 1
+        if not self.obstaculos[posicao]:
+            del self.obstaculos[posicao]
+
+    def atualizar_obstaculos(self, obstaculos):
+        """
+        Aplica apenas a diferença entre os adversários atuais e a nova lista
+        Args:
+            obstaculos: Lista completa com as posições atuais dos adversários
+        """
+        novos = Counter(obstaculos)
+        for posicao, quantidade in (self.obstaculos - novos).items():
+            for _ in range(quantidade):
+                self.remover_obstaculo(posicao)
+        for posicao, quantidade in (novos - self.obstaculos).items():
+            for _ in range(quantidade):
+                self.adicionar_obstaculo(posicao)
+
+    def _reparar(self):
+        """Atualiza rhs dos estados cujas arestas de saída mudaram de custo"""
+        g, rhs = self.g, self.rhs
+        for celula, (bloqueado_antigo, penalidade_antiga) in self.pendentes.items():
+            bloqueado_novo = self.campo.bloqueado[celula]
+            penalidade_nova = self.campo.penalidade[celula]
+            if bool(bloqueado_antigo) == bool(bloqueado_novo) and penalidade_antiga == penalidade_nova:
+                continue
+            for indice in range(8):
+                anterior = self.origem[celula * 8 + indice]
+                if anterior < 0 or anterior == self.celula_objetivo:
+                    continue
+                g_sucessor = g[celula * N_DIRECOES + indice]
+                for direcao in range(N_DIRECOES):
+                    predecessor = anterior * N_DIRECOES + direcao
+                    custo_mov = self.custo_mov[direcao * 8 + indice]
+                    antigo = CUSTO_INFINITO if bloqueado_antigo else custo_mov + penalidade_antiga
+                    novo = CUSTO_INFINITO if bloqueado_novo else custo_mov + penalidade_nova
+                    if antigo > novo:
+                        if novo + g_sucessor < rhs[predecessor]:
+                            rhs[predecessor] = novo + g_sucessor
+                            self._enfileirar(predecessor)
+                    elif rhs[predecessor] == antigo + g_sucessor:
+                        rhs[predecessor] = self._recalcular_rhs(predecessor)
+                        self._enfileirar(predecessor)
+        self.pendentes.clear()
+
+    # ---------- Consulta ----------
+    def planejar(self, pos_atual, direcao_atual=None):
+        """
+        Devolve o caminho ótimo da posição atual até o objetivo
+        Args:
+            pos_atual: Tupla (x,y) com a posição do robô
+            direcao_atual: Último movimento executado (None se parado)
+        Returns:
+            Lista de posições, incluindo a atual (vazia se não houver caminho)
+        """
+        direcao = MOVIMENTOS.index(direcao_atual) if direcao_atual else SEM_DIRECAO
+        celula = pos_atual[1] * self.largura + pos_atual[0]
+        if self.x_inicial is not None:
+            # O robô andou: as chaves na fila continuam limites inferiores somando h(anterior, atual)
+            self.km += self._heuristica(celula)
+        self.x_inicial, self.y_inicial = pos_atual
+        self.estado_inicial = celula * N_DIRECOES + direcao
+
+        self._reparar()
+        self._calcular_caminho_minimo()
+        return self._extrair_caminho()
+
+    def _extrair_caminho(self):
+        estado = self.estado_inicial
+        caminho = [(self.x_inicial, self.y_inicial)]
+        for _ in range(len(self.g)):
+            celula, direcao = divmod(estado, N_DIRECOES)
+            if celula == self.celula_objetivo:
+                return caminho
+            melhor, proximo = CUSTO_INFINITO, -1
+            for indice in range(8):
+                vizinha = self.destino[celula * 8 + indice]
+                if vizinha < 0:
+                    continue
+                sucessor = vizinha * N_DIRECOES + indice
+                total = self._custo_entrada(vizinha, indice, direcao) + self.g[sucessor]
+                if total < melhor:
+                    melhor, proximo = total, sucessor
+            if proximo < 0:
+                break
+            estado = proximo
+            celula = estado // N_DIRECOES
+            caminho.append((celula % self.largura, celula // self.largura))
+        logging.warning("Nenhum caminho válido encontrado!")
+        return []
+
+# ==================== ADAPTADOR PARA O SIMULADOR ====================
+class ReplanejadorIncremental:
+    """
+    Planejador com a assinatura de candidato.encontrar_caminho que reaproveita um
+    PlanejadorIncremental enquanto objetivo, grid e posse de bola não mudam
+    """
+
+    def __init__(self, modelo=None):
+        """
+        Args:
+            modelo: ModeloCusto com os custos de movimento (None usa candidato.MODELO_PADRAO)
+        """
+        self.modelo = modelo
+        self.planejador = None
+        self.chave = None
+        self.ultimo_caminho = []
+
+    def __call__(self, pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola=False):
+        chave = (pos_objetivo, largura_grid, altura_grid, tem_bola)
+        if self.chave != chave:
+            self.planejador = PlanejadorIncremental(pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                                    self.modelo)
+            self.chave = chave
+            self.ultimo_caminho = []
+        else:
+            self.planejador.atualizar_obstaculos(obstaculos)
+
+        # Direção do último passo executado, deduzida do caminho entregue anteriormente
+        direcao = None
+        if pos_inicial in self.ultimo_caminho:
+            indice = self.ultimo_caminho.index(pos_inicial)
+            if indice > 0:
+                anterior = self.ultimo_caminho[indice - 1]
+                direcao = (pos_inicial[0] - anterior[0], pos_inicial[1] - anterior[1])
+
+        self.ultimo_caminho = self.planejador.planejar(pos_inicial, direcao)
+        return list(self.ultimo_caminho)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Registro de planejadores por nome, importados só quando escolhidos.
+
+Cada entrada aponta para "módulo:objeto", opcionalmente com parâmetros nomeados.
+O objeto é uma função com a assinatura de candidato.encontrar_caminho (os
+parâmetros são fixados com functools.partial) ou uma classe cujas instâncias têm
+essa assinatura (os parâmetros vão para o construtor, e cada carregar devolve uma
+instância nova, com estado próprio). Consultar o registro não importa nenhum
+planejador: o módulo só é importado em carregar, e importá-lo não configura
+logging nem cria arquivos. Quem configura é o ponto de entrada, com
+configurar_logging (que usa a configuração própria do módulo, se houver).
+
+Fora do registro, carregar também aceita "módulo:objeto" diretamente, o que
+permite usar um planejador novo sem alterar este arquivo.
+'''
+
+import functools
+import importlib
+
+# Nome -> "módulo:objeto" ou ("módulo:objeto", parâmetros nomeados)
+PLANEJADORES = {
+    "candidato": "candidato:encontrar_caminho",
+    "candidato_objetos": ("candidato:encontrar_caminho", {"motor": "objetos"}),
+    "candidato_alt": "heuristica_marcos:encontrar_caminho_alt",
+    "candidato_hpa": "planejador_hierarquico:encontrar_caminho_hierarquico",
+    "campo_objetivo": "campo_objetivo:encontrar_caminho_por_campo",
+    "incremental": "planejador_incremental:ReplanejadorIncremental",
+    "anytime": ("planejador_anytime:PlanejadorComPrazo", {"orcamento_ms": 50}),
+    "hierarquico": "planejador_hierarquico:ReplanejadorHierarquico",
+    "test_a_star": "test_a_star:encontrar_caminho",
+    "test_geometria": "test_geometria:encontrar_caminho",
+}
+PLANEJADOR_PADRAO = "candidato"
+
+def registrar(nome, alvo, **opcoes):
+    """
+    Acrescenta (ou substitui) um planejador no registro
+    Args:
+        nome: Nome usado em carregar e nas opções --planejador
+        alvo: "módulo:objeto"
+        **opcoes: Parâmetros nomeados fixados no planejador (ou passados ao construtor da classe)
+    """
+    PLANEJADORES[nome] = (alvo, opcoes) if opcoes else alvo
+
+def nomes():
+    """Nomes registrados, sem importar nenhum planejador"""
+    return list(PLANEJADORES)
+
+def _resolver(nome):
+    """(nome do módulo, nome do objeto, parâmetros) de um nome registrado ou de "módulo:objeto" """
+    entrada = PLANEJADORES.get(nome)
+    if entrada is None:
+        if ":" not in nome:
+            raise ValueError(f"Planejador desconhecido: {nome!r} (opções: {', '.join(PLANEJADORES)} "
+                             f"ou módulo:objeto)")
+        entrada = nome
+    alvo, opcoes = entrada if isinstance(entrada, tuple) else (entrada, {})
+    nome_modulo, _, nome_objeto = alvo.partition(":")
+    return nome_modulo, nome_objeto or "encontrar_caminho", opcoes
+
+def modulo(nome):
+    """Módulo que define o planejador (importado agora, se ainda não estiver)"""
+    return importlib.import_module(_resolver(nome)[0])
+
+def carregar(nome, **opcoes):
+    """
+    Importa o planejador e devolve um objeto com a assinatura de candidato.encontrar_caminho
+    Args:
+        nome: Nome registrado ou "módulo:objeto"
+        **opcoes: Parâmetros nomeados somados aos do registro (têm prioridade sobre eles)
+    Returns:
+        A função (com os parâmetros fixados) ou uma instância nova da classe
+    """
+    nome_modulo, nome_objeto, padrao = _resolver(nome)
+    objeto = getattr(importlib.import_module(nome_modulo), nome_objeto)
+    opcoes = {**padrao, **opcoes}
+    if isinstance(objeto, type):
+        return objeto(**opcoes)
+    return functools.partial(objeto, **opcoes) if opcoes else objeto
+
+def configurar_logging(nome, **opcoes):
+    """
+    Configura o logging do ponto de entrada para o planejador escolhido
+    Args:
+        nome: Nome registrado ou "módulo:objeto"
+        **opcoes: Parâmetros de candidato.configurar_logging
+
+    Um módulo com configuração própria (test_a_star e test_geometria gravam o log de
+    depuração em tests/) usa a sua configurar_logging(); os demais usam a do candidato.
+    """
+    try:
+        proprio = modulo(nome)
+    except (ValueError, ImportError):
+        proprio = None  # O erro é informado por carregar, na validação do ponto de entrada
+    candidato = importlib.import_module("candidato")
+    if proprio is not None and proprio is not candidato and hasattr(proprio, "configurar_logging"):
+        proprio.configurar_logging()
+    else:
+        candidato.configurar_logging(**opcoes)
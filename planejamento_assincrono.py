@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Planejamento em segundo plano para o simulador gráfico.
+
+A busca roda em uma thread (ou em um processo) separada e o laço de quadros
+apenas envia pedidos e recolhe respostas prontas, sem nunca esperar por elas.
+Enquanto a resposta não chega, o robô segue o último caminho conhecido. Cada
+pedido leva a geração do cenário: depois de um reset, respostas antigas são
+descartadas, assim como as que não servem mais para a posição atual do robô.
+'''
+
+import random
+import time
+from concurrent import futures  # Executores resolvidos sob demanda: o multiprocessing só é importado com usar_processos
+
+import candidato
+from caminho_compacto import percorrer
+from simulacao import (LARGURA_GRID, ALTURA_GRID, EVENTO_SEM_CAMINHO, objetivo_atual, pedido_planejamento,
+                       planejador_combinado, mover_adversarios, mover_robo)
+
+def _executar_pedido(planejador, pedido):
+    """Roda o planejador no executor e mede o tempo gasto lá (função de módulo para poder ir a um processo)"""
+    inicio = time.perf_counter()
+    caminho = planejador(**pedido)
+    return caminho, time.perf_counter() - inicio
+
+# ==================== PLANEJADOR ASSÍNCRONO ====================
+class PlanejadorAssincrono:
+    """Fila de pedidos e respostas de planejamento executados fora do laço de quadros"""
+
+    def __init__(self, planejador=candidato.encontrar_caminho, usar_processos=False):
+        """
+        Args:
+            planejador: Função com a assinatura de candidato.encontrar_caminho
+            usar_processos: Executa a busca em um processo separado (o planejador precisa
+                ser serializável e seu estado não é preservado entre chamadas)
+        """
+        self.planejador = planejador
+        self.combinado = planejador_combinado(planejador)  # Pede robô -> bola -> gol de uma vez
+        if usar_processos:
+            self.executor = futures.ProcessPoolExecutor(max_workers=1)
+        else:
+            self.executor = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="planejador")
+        self.geracao = 0       # Incrementada a cada reset do cenário
+        self.pendente = None   # (geração, pedido, future) do pedido mais recente
+        self.descartados = 0   # Respostas ignoradas por estarem obsoletas
+
+    def invalidar(self):
+        """Descarta o pedido em andamento (chamar sempre que o cenário for resetado)"""
+        self.geracao += 1
+        if self.pendente is not None:
+            if not self.pendente[2].cancel():
+                self.descartados += 1
+            self.pendente = None
+
+    def solicitar(self, estado_jogo, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID):
+        """
+        Pede um caminho para a situação atual, sem bloquear
+        Um pedido idêntico ao pendente não é repetido; um pedido diferente substitui o
+        anterior (que é cancelado se ainda estiver na fila)
+        """
+        pedido = pedido_planejamento(estado_jogo, largura_grid, altura_grid, self.combinado)
+        if self.pendente is not None:
+            geracao, anterior, futuro = self.pendente
+            if geracao == self.geracao and anterior == pedido:
+                return
+            if not futuro.cancel():
+                return  # Em execução ou pronto: o novo pedido sai depois que este for coletado
+        self.pendente = (self.geracao, pedido, self.executor.submit(_executar_pedido, self.planejador, pedido))
+
+    def coletar(self, estado_jogo):
+        """
+        Aplica ao jogo a resposta pronta, se ela ainda for válida
+        Returns:
+            True se um caminho novo (possivelmente vazio) foi aplicado
+        """
+        if self.pendente is None or not self.pendente[2].done():
+            return False
+        geracao, pedido, futuro = self.pendente
+        self.pendente = None
+        if futuro.cancelled():
+            return False
+        caminho, tempo = futuro.result()
+        estado_jogo["tempo_planejamento"] += tempo
+        if geracao != self.geracao or pedido["pos_objetivo"] != objetivo_atual(estado_jogo):
+            self.descartados += 1
+            return False
+
+        # O robô pode ter andado pelo caminho antigo enquanto a busca rodava: usa o trecho à frente dele
+        posicao = estado_jogo["pos_robo"]
+        passos = percorrer(caminho)
+        if posicao in caminho:
+            while passos.popleft() != posicao:
+                pass
+        elif posicao != pedido["pos_inicial"]:
+            self.descartados += 1
+            return False
+        estado_jogo["caminho_atual"] = passos
+        estado_jogo["replanejamentos"] += 1
+        return True
+
+    def avancar_passo(self, estado_jogo, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, adversarios_moveis=0,
+                      rng=random):
+        """
+        Equivalente não bloqueante de simulacao.avancar_passo
+        Sem caminho, o robô espera parado pela resposta; com adversários móveis, o robô segue
+        o último caminho conhecido enquanto o replanejamento roda em segundo plano
+        Returns:
+            EVENTO_BOLA, EVENTO_GOL, EVENTO_SEM_CAMINHO ou None
+        """
+        if self.coletar(estado_jogo) and not estado_jogo["caminho_atual"]:
+            estado_jogo["mensagem"] = "Nenhum caminho encontrado."
+            return EVENTO_SEM_CAMINHO
+        if adversarios_moveis:
+            mover_adversarios(estado_jogo, adversarios_moveis, largura_grid, altura_grid, rng)
+            self.solicitar(estado_jogo, largura_grid, altura_grid)
+
+        caminho = estado_jogo["caminho_atual"]
+        if caminho and caminho[0] in estado_jogo["obstaculos"]:
+            # Um adversário entrou no caminho antigo: espera a resposta nova
+            estado_jogo["caminho_atual"] = caminho = []
+        if not caminho:
+            self.solicitar(estado_jogo, largura_grid, altura_grid)
+            return None
+        return mover_robo(estado_jogo)
+
+    def encerrar(self):
+        """Libera o executor sem esperar a busca em andamento"""
+        self.invalidar()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,680 @@
+# MOTOR HEADLESS DO SIMULADOR EDROM
+# Regras do cenário e máquina de estados robô -> bola -> gol, sem depender do pygame.
+# O simulador gráfico (simulador.py) e as execuções em lote usam este mesmo motor.
+
+import argparse
+import functools
+import inspect
+import json
+import logging
+import random
+import time
+
+import candidato
+import planejadores
+from caminho_compacto import percorrer
+from fila_prioridade import FILAS
+from mapa import MapaOcupacao, carregar_mapa
+
+# Dimensões padrão da grade
+LARGURA_GRID = 20
+ALTURA_GRID = 15
+MAX_OBSTACULOS = 50
+
+# Eventos devolvidos por avancar_passo
+EVENTO_BOLA = "bola"
+EVENTO_GOL = "gol"
+EVENTO_SEM_CAMINHO = "sem_caminho"
+
+# Cenário
+def resetar_cenario(largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, max_obstaculos=MAX_OBSTACULOS, rng=random,
+                    mapa=None, n_robos=1, espalhados=False):
+    """
+    Sorteia um novo cenário (robô, bola, gol e adversários)
+    Args:
+        largura_grid: Largura da grade
+        altura_grid: Altura da grade
+        max_obstaculos: Quantidade de adversários a posicionar
+        rng: Gerador aleatório (random.Random para cenários reproduzíveis)
+        mapa: MapaOcupacao com os adversários já posicionados (ignora as dimensões e max_obstaculos)
+        n_robos: Robôs da equipe, cada um com sua bola (ver resetar_equipe); com 1, o cenário de sempre
+        espalhados: Com vários robôs, sorteia os robôs em toda a metade própria do campo
+    Returns:
+        Dicionário com o estado do jogo
+    """
+    if n_robos > 1:
+        return resetar_equipe(n_robos, largura_grid, altura_grid, max_obstaculos, rng, mapa, espalhados)
+    if mapa is not None:
+        return _cenario_no_mapa(mapa, rng)
+
+    # Posições fixas
+    # pos_robo = (2, altura_grid // 2)
+    pos_robo = (rng.randint(0,2), rng.randint(0, altura_grid - 1))
+    pos_gol = (largura_grid - 1, rng.randint(0,altura_grid - 1))
+
+    # Posição da Bola
+    while True:
+        pos_bola_x = rng.randint(largura_grid // 2, largura_grid - 1)
+        pos_bola_y = rng.randint(0, altura_grid - 1)
+        pos_bola = (pos_bola_x, pos_bola_y)
+        if pos_bola != pos_gol and pos_bola != pos_robo:
+            break
+
+    # Posição dos Adversários (Obstaculos)
+    obstaculos = []
+    posicoes_ocupadas = {pos_robo, pos_gol, pos_bola}
+
+    tentativas = 0
+    while len(obstaculos) < max_obstaculos:
+        obs_x = rng.randint(3, largura_grid - 1)
+        obs_y = rng.randint(0, altura_grid - 1)
+        pos_obs = (obs_x, obs_y)
+
+        dist_do_robo = abs(pos_obs[0] - pos_robo[0]) + abs(pos_obs[1] - pos_robo[1])
+        dist_do_gol = abs(pos_obs[0] - pos_gol[0]) + abs(pos_obs[1] - pos_gol[1])
+
+        if pos_obs in posicoes_ocupadas or dist_do_robo < 3 or dist_do_gol <= 1:
+            tentativas += 1
+            if tentativas > 1000:
+                print(f"AVISO: Não foi possível posicionar {max_obstaculos} obstáculos. Continuando com {len(obstaculos)}.")
+                break
+            continue
+
+        obstaculos.append(pos_obs)
+        posicoes_ocupadas.add(pos_obs)
+        tentativas = 0
+
+    return {
+        "pos_robo": pos_robo, "pos_bola": pos_bola, "pos_gol": pos_gol, "obstaculos": obstaculos,
+        "tem_bola": False, "caminho_atual": [], "simulacao_rodando": False,
+        "mensagem": "Cenário aleatório gerado!",
+        "passos": 0, "replanejamentos": 0, "tempo_planejamento": 0.0
+    }
+
+def _cenario_no_mapa(mapa, rng):
+    """Sorteia robô, bola e gol em células livres de um mapa de ocupação"""
+    largura_grid, altura_grid = mapa.largura, mapa.altura
+
+    def sortear(x_minimo, x_maximo, evitar):
+        for _ in range(100000):
+            posicao = (rng.randint(x_minimo, x_maximo), rng.randint(0, altura_grid - 1))
+            if posicao not in mapa and posicao not in evitar:
+                return posicao
+        raise ValueError(f"Nenhuma célula livre entre x={x_minimo} e x={x_maximo} no mapa")
+
+    pos_robo = sortear(0, min(2, largura_grid - 1), ())
+    pos_gol = sortear(largura_grid - 1, largura_grid - 1, (pos_robo,))
+    pos_bola = sortear(largura_grid // 2, largura_grid - 1, (pos_robo, pos_gol))
+    return {
+        "pos_robo": pos_robo, "pos_bola": pos_bola, "pos_gol": pos_gol, "obstaculos": mapa,
+        "tem_bola": False, "caminho_atual": [], "simulacao_rodando": False,
+        "mensagem": "Cenário gerado sobre o mapa!",
+        "passos": 0, "replanejamentos": 0, "tempo_planejamento": 0.0
+    }
+
+def resetar_equipe(n_robos, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, max_obstaculos=MAX_OBSTACULOS,
+                   rng=random, mapa=None, espalhados=False):
+    """
+    Sorteia um cenário com vários robôs: cada um começa nas três primeiras colunas, tem
+    sua própria bola na metade do adversário e deve levá-la ao gol comum
+    Args:
+        n_robos: Quantidade de robôs
+        espalhados: Sorteia os robôs em toda a metade própria do campo em vez das três
+                    primeiras colunas (em campos grandes, robôs distantes formam grupos
+                    independentes para PlanejadorCooperativo(processos=...))
+        (demais como em resetar_cenario)
+    Returns:
+        Dicionário com o estado do jogo; o estado de cada robô fica na lista "robos"
+    """
+    if mapa is not None:
+        largura_grid, altura_grid = mapa.largura, mapa.altura
+    colunas_robos = max(1, largura_grid // 2) if espalhados else min(3, largura_grid)
+    if n_robos > colunas_robos * altura_grid:
+        raise ValueError(f"No máximo {colunas_robos * altura_grid} robôs cabem nas {colunas_robos} primeiras colunas")
+    livre = (lambda posicao: posicao not in mapa) if mapa is not None else (lambda posicao: True)
+
+    def sortear(x_minimo, x_maximo, evitar):
+        for _ in range(100000):
+            posicao = (rng.randint(x_minimo, x_maximo), rng.randint(0, altura_grid - 1))
+            if livre(posicao) and posicao not in evitar:
+                return posicao
+        raise ValueError(f"Nenhuma célula livre entre x={x_minimo} e x={x_maximo}")
+
+    robos_pos = []
+    for _ in range(n_robos):
+        robos_pos.append(sortear(0, colunas_robos - 1, robos_pos))
+    pos_gol = sortear(largura_grid - 1, largura_grid - 1, robos_pos)
+    bolas = []
+    for _ in range(n_robos):
+        bolas.append(sortear(largura_grid // 2, largura_grid - 1, robos_pos + bolas + [pos_gol]))
+
+    obstaculos = mapa
+    if mapa is None:
+        obstaculos = []
+        posicoes_ocupadas = set(robos_pos) | set(bolas) | {pos_gol}
+        tentativas = 0
+        while len(obstaculos) < max_obstaculos:
+            pos_obs = (rng.randint(3, largura_grid - 1), rng.randint(0, altura_grid - 1))
+            perto_de_robo = any(abs(pos_obs[0] - x) + abs(pos_obs[1] - y) < 3 for x, y in robos_pos)
+            if pos_obs in posicoes_ocupadas or perto_de_robo or abs(pos_obs[0] - pos_gol[0]) + abs(pos_obs[1] - pos_gol[1]) <= 1:
+                tentativas += 1
+                if tentativas > 1000:
+                    print(f"AVISO: Não foi possível posicionar {max_obstaculos} obstáculos. Continuando com {len(obstaculos)}.")
+                    break
+                continue
+            obstaculos.append(pos_obs)
+            posicoes_ocupadas.add(pos_obs)
+            tentativas = 0
+
+    robos = [{"pos_robo": pos_robo, "pos_bola": pos_bola, "tem_bola": False, "direcao": None, "caminho_atual": [],
+              "passos": 0, "concluido": False} for pos_robo, pos_bola in zip(robos_pos, bolas)]
+    return {
+        "robos": robos, "pos_gol": pos_gol, "obstaculos": obstaculos, "simulacao_rodando": False,
+        "mensagem": f"Cenário com {n_robos} robôs gerado!",
+        "ticks": 0, "gols": 0, "colisoes": 0, "ticks_desde_plano": 0, "replanejamentos": 0,
+        "tempo_planejamento": 0.0
+    }
+
+def mover_adversarios(estado_jogo, quantidade, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, rng=random):
+    """
+    Move alguns adversários uma célula (ou os mantém parados) para uma posição livre
+    Args:
+        estado_jogo: Dicionário do jogo; recebe uma nova lista de obstáculos
+        quantidade: Número de adversários sorteados para se mover
+        largura_grid: Largura da grade
+        altura_grid: Altura da grade
+        rng: Gerador aleatório
+    """
+    obstaculos = list(estado_jogo["obstaculos"])
+    reservadas = {estado_jogo["pos_gol"]}
+    for robo in estado_jogo.get("robos", [estado_jogo]):
+        if not robo.get("concluido"):
+            reservadas.add(robo["pos_robo"])
+            if not robo["tem_bola"]:
+                reservadas.add(robo["pos_bola"])
+    ocupadas = set(obstaculos)
+
+    for indice in rng.sample(range(len(obstaculos)), min(quantidade, len(obstaculos))):
+        x, y = obstaculos[indice]
+        nova = (x + rng.randint(-1, 1), y + rng.randint(-1, 1))
+        if not (0 <= nova[0] < largura_grid and 0 <= nova[1] < altura_grid) or nova in ocupadas or nova in reservadas:
+            continue
+        ocupadas.discard((x, y))
+        ocupadas.add(nova)
+        obstaculos[indice] = nova
+    estado_jogo["obstaculos"] = obstaculos
+
+# Máquina de estados
+def objetivo_atual(estado_jogo):
+    """Bola enquanto o robô não a tem, depois o gol"""
+    return estado_jogo["pos_gol"] if estado_jogo["tem_bola"] else estado_jogo["pos_bola"]
+
+def planejador_combinado(planejador):
+    """Indica se o planejador aceita pos_final, isto é, planeja robô -> bola -> gol de uma vez"""
+    if isinstance(planejador, functools.partial) and planejador.keywords.get("motor", "vetorial") != "vetorial":
+        return False  # pos_final só é suportado pelo motor vetorial (ex.: candidato_objetos do registro)
+    try:
+        return "pos_final" in inspect.signature(planejador).parameters
+    except (TypeError, ValueError):
+        return False
+
+def pedido_planejamento(estado_jogo, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, combinado=False):
+    """
+    Argumentos do planejador para a situação atual do jogo
+    Args:
+        combinado: Sem a bola, pede o caminho completo até o gol (parâmetro pos_final)
+    Returns:
+        Dicionário com os parâmetros nomeados de candidato.encontrar_caminho
+    """
+    obstaculos = estado_jogo["obstaculos"]
+    if not isinstance(obstaculos, MapaOcupacao):
+        obstaculos = list(obstaculos)  # Cópia: o pedido não muda se os adversários se moverem depois
+    pedido = {"pos_inicial": estado_jogo["pos_robo"], "pos_objetivo": objetivo_atual(estado_jogo),
+              "obstaculos": obstaculos, "largura_grid": largura_grid,
+              "altura_grid": altura_grid, "tem_bola": estado_jogo["tem_bola"]}
+    if combinado and not estado_jogo["tem_bola"]:
+        pedido["pos_final"] = estado_jogo["pos_gol"]
+    return pedido
+
+def mover_robo(estado_jogo):
+    """
+    Move o robô para o próximo ponto do caminho atual e trata captura da bola e gol
+    Returns:
+        EVENTO_BOLA, EVENTO_GOL ou None
+    """
+    if estado_jogo["caminho_atual"]:
+        estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].popleft()
+        estado_jogo["passos"] += 1
+    if not estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_bola"]:
+        # Um caminho combinado segue até o gol; um caminho só até a bola termina aqui e força o replanejamento
+        estado_jogo["tem_bola"] = True
+        estado_jogo["mensagem"] = "Bola capturada! Rumo ao gol!"
+        return EVENTO_BOLA
+    if estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_gol"]:
+        estado_jogo["mensagem"] = "GOL! Cenário resetado."
+        return EVENTO_GOL
+    return None
+
+def avancar_passo(estado_jogo, planejador=candidato.encontrar_caminho, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID,
+                  adversarios_moveis=0, rng=random, combinado=None):
+    """
+    Executa um tick da simulação: replaneja se necessário e move o robô uma célula
+    Args:
+        estado_jogo: Dicionário criado por resetar_cenario (modificado no lugar)
+        planejador: Função com a assinatura de candidato.encontrar_caminho
+        largura_grid: Largura da grade
+        altura_grid: Altura da grade
+        adversarios_moveis: Adversários que se movem a cada tick (0 = cenário estático)
+        rng: Gerador aleatório usado no movimento dos adversários
+        combinado: Planeja robô -> bola -> gol em uma única busca (None: se o planejador aceitar pos_final)
+    Returns:
+        EVENTO_BOLA, EVENTO_GOL, EVENTO_SEM_CAMINHO ou None
+    """
+    if adversarios_moveis:
+        # O caminho anterior pode atravessar adversários que acabaram de se mover
+        mover_adversarios(estado_jogo, adversarios_moveis, largura_grid, altura_grid, rng)
+        estado_jogo["caminho_atual"] = []
+    if not estado_jogo["caminho_atual"]:
+        if combinado is None:
+            combinado = planejador_combinado(planejador)
+        inicio = time.perf_counter()
+        estado_jogo["caminho_atual"] = percorrer(planejador(**pedido_planejamento(estado_jogo, largura_grid,
+                                                                                  altura_grid, combinado)))
+        estado_jogo["tempo_planejamento"] += time.perf_counter() - inicio
+        estado_jogo["replanejamentos"] += 1
+        if not estado_jogo["caminho_atual"]:
+            return EVENTO_SEM_CAMINHO
+        if adversarios_moveis and estado_jogo["caminho_atual"][0] == estado_jogo["pos_robo"]:
+            # Replanejando a cada tick, a posição atual no início do caminho manteria o robô parado
+            estado_jogo["caminho_atual"].popleft()
+    return mover_robo(estado_jogo)
+
+# Execução em lote
+def executar_episodio(semente, planejador=candidato.encontrar_caminho, largura_grid=LARGURA_GRID,
+                      altura_grid=ALTURA_GRID, max_obstaculos=MAX_OBSTACULOS, max_passos=None, adversarios_moveis=0,
+                      mapa=None, combinado=None, cenario=None):
+    """
+    Roda um episódio completo sem limite de FPS
+    Args:
+        semente: Semente do cenário (o mesmo valor reproduz o mesmo episódio)
+        planejador: Função com a assinatura de candidato.encontrar_caminho
+        largura_grid: Largura da grade
+        altura_grid: Altura da grade
+        max_obstaculos: Quantidade de adversários
+        max_passos: Limite de ticks antes de declarar falha (padrão: 4x o número de células)
+        adversarios_moveis: Adversários que se movem a cada tick
+        mapa: MapaOcupacao fixo (as dimensões passam a ser as do mapa)
+        combinado: Planeja robô -> bola -> gol em uma única busca (None: se o planejador aceitar pos_final)
+        cenario: Cenário já sorteado (ex.: lido de corpus_cenarios.CorpusCenarios) no lugar do sorteio;
+                 as dimensões passam a ser as dele e a semente só move os adversários
+    Returns:
+        Dicionário com semente, passos, replanejamentos, tempo de planejamento e sucesso
+    """
+    if cenario is not None:
+        largura_grid, altura_grid = cenario["largura_grid"], cenario["altura_grid"]
+    if mapa is not None:
+        if adversarios_moveis:
+            raise ValueError("Adversários móveis não são suportados sobre um mapa de ocupação")
+        largura_grid, altura_grid = mapa.largura, mapa.altura
+    if max_passos is None:
+        max_passos = 4 * largura_grid * altura_grid
+    if combinado is None:
+        combinado = planejador_combinado(planejador)
+    rng = random.Random(semente)
+    estado_jogo = cenario if cenario is not None else resetar_cenario(largura_grid, altura_grid, max_obstaculos, rng,
+                                                                      mapa)
+
+    sucesso = False
+    for _ in range(max_passos):
+        evento = avancar_passo(estado_jogo, planejador, largura_grid, altura_grid, adversarios_moveis, rng, combinado)
+        if evento == EVENTO_GOL:
+            sucesso = True
+            break
+        if evento == EVENTO_SEM_CAMINHO and not adversarios_moveis:
+            # Com adversários parados o bloqueio é permanente
+            break
+
+    return {
+        "semente": semente,
+        "passos": estado_jogo["passos"],
+        "replanejamentos": estado_jogo["replanejamentos"],
+        "tempo_planejamento": estado_jogo["tempo_planejamento"],
+        "sucesso": sucesso,
+    }
+
+# Equipe de robôs
+def planejar_independentes(pedidos, obstaculos, largura_grid, altura_grid, planejador=candidato.encontrar_caminho):
+    """
+    Planejador de equipe de referência: cada robô planeja sozinho, sem considerar os outros
+    (os caminhos podem colidir; serve para comparar com o planejador_cooperativo)
+    """
+    return [planejador(pedido["pos_inicial"], pedido["pos_objetivo"], obstaculos, largura_grid, altura_grid,
+                       pedido["tem_bola"]) for pedido in pedidos]
+
+def avancar_passo_equipe(estado_jogo, planejador_equipe, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID,
+                         adversarios_moveis=0, rng=random, replanejar_a_cada=8):
+    """
+    Executa um tick com vários robôs: replaneja a equipe quando necessário e move todos
+    os robôs ativos uma célula (ou os mantém parados)
+    Args:
+        estado_jogo: Dicionário criado por resetar_equipe (modificado no lugar)
+        planejador_equipe: Função (pedidos, obstaculos, largura_grid, altura_grid) -> lista de caminhos,
+                           como PlanejadorCooperativo ou planejar_independentes
+        largura_grid: Largura da grade
+        altura_grid: Altura da grade
+        adversarios_moveis: Adversários que se movem a cada tick
+        rng: Gerador aleatório usado no movimento dos adversários
+        replanejar_a_cada: Ticks entre replanejamentos (deve ser menor que a janela do planejador)
+    Returns:
+        EVENTO_GOL quando todos os robôs marcaram, EVENTO_SEM_CAMINHO se nenhum robô ativo
+        tem caminho, senão None
+    """
+    ativos = [robo for robo in estado_jogo["robos"] if not robo["concluido"]]
+    replanejar = estado_jogo["ticks_desde_plano"] >= replanejar_a_cada or any(not robo["caminho_atual"]
+                                                                                for robo in ativos)
+    if adversarios_moveis:
+        mover_adversarios(estado_jogo, adversarios_moveis, largura_grid, altura_grid, rng)
+        replanejar = True
+    if replanejar:
+        obstaculos = estado_jogo["obstaculos"]
+        if not isinstance(obstaculos, MapaOcupacao):
+            obstaculos = list(obstaculos)
+        pedidos = [{"pos_inicial": robo["pos_robo"], "tem_bola": robo["tem_bola"], "direcao": robo["direcao"],
+                    "pos_objetivo": estado_jogo["pos_gol"] if robo["tem_bola"] else robo["pos_bola"]}
+                   for robo in ativos]
+        inicio = time.perf_counter()
+        caminhos = planejador_equipe(pedidos, obstaculos, largura_grid, altura_grid)
+        estado_jogo["tempo_planejamento"] += time.perf_counter() - inicio
+        estado_jogo["replanejamentos"] += 1
+        estado_jogo["ticks_desde_plano"] = 0
+        for robo, caminho in zip(ativos, caminhos):
+            robo["caminho_atual"] = passos = percorrer(caminho)
+            if passos and passos[0] == robo["pos_robo"]:
+                # O caminho começa na posição atual
+                passos.popleft()
+        if not any(robo["caminho_atual"] for robo in ativos):
+            estado_jogo["mensagem"] = "Nenhum robô tem caminho."
+            return EVENTO_SEM_CAMINHO
+
+    anteriores = {}
+    for indice, robo in enumerate(ativos):
+        anteriores[indice] = robo["pos_robo"]
+        if robo["caminho_atual"]:
+            proxima = robo["caminho_atual"].popleft()
+            if proxima != robo["pos_robo"]:
+                robo["direcao"] = (proxima[0] - robo["pos_robo"][0], proxima[1] - robo["pos_robo"][1])
+            robo["pos_robo"] = proxima
+            robo["passos"] += 1
+        if not robo["tem_bola"] and robo["pos_robo"] == robo["pos_bola"]:
+            robo["tem_bola"] = True
+        elif robo["tem_bola"] and robo["pos_robo"] == estado_jogo["pos_gol"]:
+            robo["concluido"] = True
+            estado_jogo["gols"] += 1
+
+    # Colisões: dois robôs na mesma célula ou trocando de células no mesmo tick
+    ocupadas = {}
+    for indice, robo in enumerate(ativos):
+        if robo["pos_robo"] in ocupadas:
+            estado_jogo["colisoes"] += 1
+        ocupadas[robo["pos_robo"]] = indice
+    for indice, robo in enumerate(ativos):
+        outro = ocupadas.get(anteriores[indice])
+        if outro is not None and outro > indice and anteriores[outro] == robo["pos_robo"] != anteriores[indice]:
+            estado_jogo["colisoes"] += 1
+
+    estado_jogo["ticks"] += 1
+    estado_jogo["ticks_desde_plano"] += 1
+    if all(robo["concluido"] for robo in estado_jogo["robos"]):
+        estado_jogo["mensagem"] = "Todos os robôs marcaram!"
+        return EVENTO_GOL
+    return None
+
+def executar_episodio_equipe(semente, planejador_equipe, n_robos, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID,
+                             max_obstaculos=MAX_OBSTACULOS, max_passos=None, adversarios_moveis=0, mapa=None,
+                             replanejar_a_cada=8, espalhados=False):
+    """
+    Roda um episódio com vários robôs até todos marcarem
+    Args:
+        semente: Semente do cenário
+        planejador_equipe: Ver avancar_passo_equipe
+        n_robos: Quantidade de robôs
+        replanejar_a_cada: Ticks entre replanejamentos da equipe
+        espalhados: Robôs sorteados em toda a metade própria do campo (ver resetar_equipe)
+        (demais como em executar_episodio)
+    Returns:
+        Dicionário com semente, ticks, gols, passos, replanejamentos, tempo de planejamento,
+        colisões e sucesso (todos os robôs marcaram)
+    """
+    if mapa is not None:
+        if adversarios_moveis:
+            raise ValueError("Adversários móveis não são suportados sobre um mapa de ocupação")
+        largura_grid, altura_grid = mapa.largura, mapa.altura
+    if max_passos is None:
+        max_passos = 4 * largura_grid * altura_grid
+    rng = random.Random(semente)
+    estado_jogo = resetar_equipe(n_robos, largura_grid, altura_grid, max_obstaculos, rng, mapa, espalhados)
+
+    sucesso = False
+    for _ in range(max_passos):
+        evento = avancar_passo_equipe(estado_jogo, planejador_equipe, largura_grid, altura_grid, adversarios_moveis,
+                                      rng, replanejar_a_cada)
+        if evento == EVENTO_GOL:
+            sucesso = True
+            break
+        if evento == EVENTO_SEM_CAMINHO and not adversarios_moveis:
+            break
+
+    return {
+        "semente": semente,
+        "ticks": estado_jogo["ticks"],
+        "gols": estado_jogo["gols"],
+        "passos": sum(robo["passos"] for robo in estado_jogo["robos"]),
+        "replanejamentos": estado_jogo["replanejamentos"],
+        "tempo_planejamento": estado_jogo["tempo_planejamento"],
+        "colisoes": estado_jogo["colisoes"],
+        "sucesso": sucesso,
+    }
+
+def executar_lote(n_episodios, semente=0, episodio=executar_episodio, **kwargs):
+    """
+    Roda vários episódios seguidos com sementes derivadas de uma semente mestre
+    Args:
+        n_episodios: Quantidade de episódios
+        semente: Semente mestre do lote
+        episodio: executar_episodio ou executar_episodio_equipe
+        **kwargs: Repassados para a função do episódio
+    Returns:
+        Lista com o resultado de cada episódio
+    """
+    rng = random.Random(semente)
+    return [episodio(rng.getrandbits(32), **kwargs) for _ in range(n_episodios)]
+
+def resumir(resultados, tempo_total):
+    """Texto com o resumo agregado de um lote"""
+    n = len(resultados)
+    sucessos = sum(r["sucesso"] for r in resultados)
+    planejamento = sum(r["tempo_planejamento"] for r in resultados)
+    replanejamentos = sum(r["replanejamentos"] for r in resultados)
+    return (f"Episódios: {n} | Sucesso: {sucessos}/{n} ({100 * sucessos / max(n, 1):.1f}%) | "
+            f"Passos médios: {sum(r['passos'] for r in resultados) / max(n, 1):.1f} | "
+            f"Replanejamentos: {replanejamentos} | "
+            f"Planejamento: {planejamento:.3f}s ({1000 * planejamento / max(replanejamentos, 1):.3f} ms/plano) | "
+            f"Tempo total: {tempo_total:.3f}s ({n / max(tempo_total, 1e-9):.1f} episódios/s)")
+
+def resumir_equipe(resultados, tempo_total):
+    """Texto com o resumo agregado de um lote de episódios com vários robôs"""
+    n = len(resultados)
+    sucessos = sum(r["sucesso"] for r in resultados)
+    gols = sum(r["gols"] for r in resultados)
+    ticks = sum(r["ticks"] for r in resultados)
+    planejamento = sum(r["tempo_planejamento"] for r in resultados)
+    replanejamentos = sum(r["replanejamentos"] for r in resultados)
+    return (f"Episódios: {n} | Sucesso: {sucessos}/{n} ({100 * sucessos / max(n, 1):.1f}%) | "
+            f"Gols: {gols} ({gols / max(ticks, 1):.3f} gols/tick) | Ticks médios: {ticks / max(n, 1):.1f} | "
+            f"Colisões: {sum(r['colisoes'] for r in resultados)} | Replanejamentos: {replanejamentos} | "
+            f"Planejamento: {planejamento:.3f}s ({1000 * planejamento / max(replanejamentos, 1):.3f} ms/plano) | "
+            f"Tempo total: {tempo_total:.3f}s ({gols / max(tempo_total, 1e-9):.1f} gols/s)")
+
+def _executar_equipe(args):
+    """Lote de episódios com vários robôs, a partir das opções da linha de comando"""
+    if args.independentes:
+        planejador_equipe = planejar_independentes
+    else:
+        from planejador_cooperativo import PlanejadorCooperativo
+        planejador_equipe = PlanejadorCooperativo(args.janela, args.processos)
+
+    inicio = time.perf_counter()
+    resultados = executar_lote(args.episodios, args.semente, episodio=executar_episodio_equipe,
+                               planejador_equipe=planejador_equipe, n_robos=args.robos, largura_grid=args.largura,
+                               altura_grid=args.altura, max_obstaculos=args.obstaculos, max_passos=args.max_passos,
+                               adversarios_moveis=args.adversarios_moveis,
+                               mapa=carregar_mapa(args.mapa) if args.mapa else None,
+                               replanejar_a_cada=args.replanejar_a_cada or max(1, args.janela // 2),
+                               espalhados=args.espalhados)
+    tempo_total = time.perf_counter() - inicio
+    if not args.independentes:
+        planejador_equipe.fechar()
+
+    if args.detalhado:
+        for r in resultados:
+            print(f"semente={r['semente']} ticks={r['ticks']} gols={r['gols']} colisoes={r['colisoes']} "
+                  f"planejamento={1000 * r['tempo_planejamento']:.2f}ms sucesso={r['sucesso']}")
+    print(resumir_equipe(resultados, tempo_total))
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulação headless do desafio EDROM")
+    parser.add_argument("--episodios", type=int, default=100)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--largura", type=int, default=LARGURA_GRID)
+    parser.add_argument("--altura", type=int, default=ALTURA_GRID)
+    parser.add_argument("--obstaculos", type=int, default=MAX_OBSTACULOS)
+    parser.add_argument("--max-passos", type=int, default=None)
+    parser.add_argument("--detalhado", action="store_true", help="Imprime o resultado de cada episódio")
+    parser.add_argument("--saida", help="Arquivo JSON com o resultado de cada episódio")
+    parser.add_argument("--verboso", action="store_true", help="Mantém os logs INFO de cada busca")
+    parser.add_argument("--adversarios-moveis", type=int, default=0, help="Adversários que se movem a cada tick")
+    parser.add_argument("--planejador", metavar="NOME",
+                        help=f"Planejador registrado em planejadores.py ({', '.join(planejadores.nomes())}) "
+                             "ou módulo:objeto")
+    parser.add_argument("--incremental", action="store_true", help="Usa o planejador incremental (D* Lite)")
+    parser.add_argument("--orcamento-ms", type=float, default=None, help="Usa o planejador anytime (ARA*) com este prazo")
+    parser.add_argument("--hierarquico", type=int, default=None, metavar="C",
+                        help="Usa o planejador hierárquico (HPA*) com clusters de CxC células")
+    parser.add_argument("--mapa", help="Arquivo de mapa de ocupação (mapa.py) no lugar dos adversários sorteados")
+    parser.add_argument("--cache", type=int, default=0, metavar="N", help="Guarda os N caminhos mais recentes (LRU)")
+    parser.add_argument("--marcos", type=int, default=0, metavar="K",
+                        help="Soma à heurística a ALT com K marcos por cenário (planejador padrão)")
+    parser.add_argument("--fila", choices=sorted(FILAS), help="Lista de abertos do planejador padrão")
+    parser.add_argument("--compacto", action="store_true",
+                        help="O planejador padrão devolve caminhos compactos (trechos retos, ver caminho_compacto.py)")
+    parser.add_argument("--por-trecho", action="store_true",
+                        help="Planeja até a bola e replaneja até o gol ao capturá-la (em vez da busca combinada)")
+    parser.add_argument("--rastrear", metavar="ARQUIVO",
+                        help="Grava os estados expandidos por cada busca neste arquivo (em segundo plano)")
+    parser.add_argument("--perfilar", metavar="ARQUIVO",
+                        help="Perfila cada planejamento (perfilamento.py) e grava o relatório (.json ou texto)")
+    parser.add_argument("--perfil-piores", type=int, default=5, metavar="N", help="Chamadas mais lentas detalhadas")
+    parser.add_argument("--perfil-cprofile", action="store_true", help="Guarda o cProfile das chamadas mais lentas")
+    parser.add_argument("--perfil-memoria", action="store_true", help="Mede cada chamada com tracemalloc")
+    parser.add_argument("--robos", type=int, default=1, help="Robôs da equipe (acima de 1: planejamento cooperativo)")
+    parser.add_argument("--janela", type=int, default=16, help="Ticks reservados por planejamento cooperativo")
+    parser.add_argument("--replanejar-a-cada", type=int, default=None, metavar="T",
+                        help="Ticks entre replanejamentos da equipe (padrão: metade da janela)")
+    parser.add_argument("--processos", type=int, default=None,
+                        help="Planeja em processos paralelos os grupos de robôs a mais de duas janelas de distância "
+                             "(no campo padrão a equipe inteira é um só grupo e o planejamento é sequencial: "
+                             "só ajuda em campos grandes, de preferência com --espalhados)")
+    parser.add_argument("--espalhados", action="store_true",
+                        help="Sorteia os robôs em toda a metade própria do campo")
+    parser.add_argument("--independentes", action="store_true",
+                        help="Cada robô planeja sozinho com o candidato (referência, com colisões)")
+    args = parser.parse_args()
+    alternativos = [args.incremental, args.orcamento_ms is not None, args.hierarquico is not None,
+                    args.planejador not in (None, planejadores.PLANEJADOR_PADRAO)]
+    if sum(alternativos) > 1:
+        parser.error("--planejador, --incremental, --orcamento-ms e --hierarquico são mutuamente exclusivos")
+    if (args.rastrear or args.marcos or args.fila or args.compacto) and any(alternativos):
+        parser.error("--rastrear, --marcos, --fila e --compacto só estão disponíveis para o planejador padrão")
+    if args.robos > 1 and (any(alternativos) or args.rastrear or args.marcos or args.fila or args.compacto or
+                           args.cache or args.por_trecho or args.perfilar or args.planejador):
+        parser.error("com --robos, só --janela, --replanejar-a-cada, --processos e --independentes escolhem o planejador")
+    if args.espalhados and args.robos < 2:
+        parser.error("--espalhados só vale com --robos acima de 1")
+
+    # Com --verboso, os logs INFO de cada busca vão para o console e para logs/ (test_a_star e test_geometria
+    # gravam o próprio log de depuração em tests/)
+    if args.verboso:
+        planejadores.configurar_logging(args.planejador or planejadores.PLANEJADOR_PADRAO, arquivo=True,
+                                        nivel=logging.INFO)
+    else:
+        candidato.configurar_logging(arquivo=False, nivel=logging.WARNING)
+    if args.robos > 1:
+        _executar_equipe(args)
+        return
+
+    opcoes_busca = {}
+    if args.marcos:
+        opcoes_busca["marcos"] = args.marcos
+    if args.fila:
+        opcoes_busca["fila"] = args.fila
+    if args.compacto:
+        opcoes_busca["compacto"] = True
+    try:
+        planejador = planejadores.carregar(args.planejador or planejadores.PLANEJADOR_PADRAO, **opcoes_busca)
+    except (ValueError, ImportError, AttributeError) as erro:
+        parser.error(f"--planejador: {erro}")
+    listener = None
+    if args.rastrear:
+        from estatisticas_busca import (RastreamentoBusca, PlanejadorRastreado, iniciar_rastreamento_assincrono,
+                                        parar_rastreamento_assincrono)
+        listener = iniciar_rastreamento_assincrono(args.rastrear)
+        planejador = PlanejadorRastreado(planejador, RastreamentoBusca())
+    if args.incremental:
+        from planejador_incremental import ReplanejadorIncremental
+        planejador = ReplanejadorIncremental()
+    elif args.orcamento_ms is not None:
+        from planejador_anytime import PlanejadorComPrazo
+        planejador = PlanejadorComPrazo(args.orcamento_ms)
+    elif args.hierarquico is not None:
+        from planejador_hierarquico import ReplanejadorHierarquico
+        planejador = ReplanejadorHierarquico(args.hierarquico)
+    if args.cache:
+        from cache_caminhos import CacheCaminhos
+        planejador = CacheCaminhos(planejador, args.cache)
+    if args.perfilar:
+        from perfilamento import PerfilPlanejador
+        perfil = planejador = PerfilPlanejador(planejador, args.perfil_piores, args.perfil_cprofile,
+                                               args.perfil_memoria)
+
+    inicio = time.perf_counter()
+    resultados = executar_lote(args.episodios, args.semente, planejador=planejador, largura_grid=args.largura,
+                               altura_grid=args.altura, max_obstaculos=args.obstaculos, max_passos=args.max_passos,
+                               adversarios_moveis=args.adversarios_moveis, combinado=False if args.por_trecho else None,
+                               mapa=carregar_mapa(args.mapa) if args.mapa else None)
+    tempo_total = time.perf_counter() - inicio
+    if listener is not None:
+        parar_rastreamento_assincrono(listener)
+
+    if args.detalhado:
+        for r in resultados:
+            print(f"semente={r['semente']} passos={r['passos']} replanejamentos={r['replanejamentos']} "
+                  f"planejamento={1000 * r['tempo_planejamento']:.2f}ms sucesso={r['sucesso']}")
+    print(resumir(resultados, tempo_total))
+    if args.cache:
+        cache = perfil.planejador if args.perfilar else planejador
+        print("Cache:", " | ".join(f"{nome}: {valor:.3f}" if isinstance(valor, float) else f"{nome}: {valor}"
+                                   for nome, valor in cache.estatisticas().items()))
+    if args.perfilar:
+        from perfilamento import exportar
+        print(perfil.relatorio(detalhes=False))
+        exportar({"simulacao": perfil.como_dicionario()}, args.perfilar)
+
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump(resultados, arquivo, indent=2)
+
+if __name__ == '__main__':
+    main()
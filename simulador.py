@@ -1,11 +1,10 @@
 # SIMULADOR DESAFIO INDIVIDUAL EDROM - 2025
 
-import pygame
+import argparse
 import sys
-# import test_geometria as candidato 
-# import test_a_star as candidato
-import candidato
-import random
+import planejadores
+from simulacao import LARGURA_GRID, ALTURA_GRID, MAX_OBSTACULOS, EVENTO_GOL, resetar_cenario
+from planejamento_assincrono import PlanejadorAssincrono
 
 # Configurações
 COR_FUNDO = (20, 80, 40)
@@ -20,37 +19,53 @@ COR_PAINEL = (40, 40, 40)
 COR_BOTAO = (80, 80, 80)
 COR_TEXTO_BOTAO = (255, 255, 255)
 
-# Dimensões da Grade e da Tela
-LARGURA_GRID = 20
-ALTURA_GRID = 15
+# Dimensões da Tela
 TAMANHO_CELULA = 45
 ALTURA_PAINEL = 75
 
+# Temporização: os quadros não dependem do tempo de busca, que roda em segundo plano
+FPS = 30
+INTERVALO_PASSO_MS = 200   # Um movimento do robô a cada 200 ms
+PAUSA_GOL_MS = 2000
+
 LARGURA_TELA = LARGURA_GRID * TAMANHO_CELULA
 ALTURA_TELA = ALTURA_GRID * TAMANHO_CELULA + ALTURA_PAINEL
 
+pygame = None  # Importado só quando uma janela é aberta (ver carregar_pygame)
+
+def carregar_pygame():
+    """Importa o pygame na primeira vez que é necessário: importar o simulador não carrega o pygame"""
+    global pygame
+    if pygame is None:
+        import pygame as modulo
+        pygame = modulo
+    return pygame
+
 # Desenho
-def desenhar_grade(tela):
-    for x in range(0, LARGURA_TELA, TAMANHO_CELULA):
-        pygame.draw.line(tela, COR_LINHA, (x, 0), (x, ALTURA_GRID * TAMANHO_CELULA))
-    for y in range(0, ALTURA_GRID * TAMANHO_CELULA + 1, TAMANHO_CELULA):
-        pygame.draw.line(tela, COR_LINHA, (0, y), (LARGURA_TELA, y))
+def desenhar_grade(tela, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, tamanho=TAMANHO_CELULA):
+    largura_tela = largura_grid * tamanho
+    for x in range(0, largura_tela, tamanho):
+        pygame.draw.line(tela, COR_LINHA, (x, 0), (x, altura_grid * tamanho))
+    for y in range(0, altura_grid * tamanho + 1, tamanho):
+        pygame.draw.line(tela, COR_LINHA, (0, y), (largura_tela, y))
 
-def desenhar_retangulo(tela, pos_grid, cor):
+def rect_celula(pos_grid, tamanho=TAMANHO_CELULA):
     x, y = pos_grid
-    rect = pygame.Rect(x * TAMANHO_CELULA, y * TAMANHO_CELULA, TAMANHO_CELULA, TAMANHO_CELULA)
-    pygame.draw.rect(tela, cor, rect)
+    return pygame.Rect(x * tamanho, y * tamanho, tamanho, tamanho)
+
+def desenhar_retangulo(tela, pos_grid, cor, tamanho=TAMANHO_CELULA):
+    pygame.draw.rect(tela, cor, rect_celula(pos_grid, tamanho))
     
-def desenhar_circulo(tela, pos_grid, cor, raio_fator=0.4):
+def desenhar_circulo(tela, pos_grid, cor, raio_fator=0.4, tamanho=TAMANHO_CELULA):
     x, y = pos_grid
-    centro_x = int(x * TAMANHO_CELULA + TAMANHO_CELULA / 2)
-    centro_y = int(y * TAMANHO_CELULA + TAMANHO_CELULA / 2)
-    raio = int(TAMANHO_CELULA * raio_fator)
+    centro_x = int(x * tamanho + tamanho / 2)
+    centro_y = int(y * tamanho + tamanho / 2)
+    raio = max(1, int(tamanho * raio_fator))
     pygame.draw.circle(tela, cor, (centro_x, centro_y), raio)
 
-def desenhar_caminho(tela, caminho):
+def desenhar_caminho(tela, caminho, tamanho=TAMANHO_CELULA):
     for passo in caminho:
-        desenhar_circulo(tela, passo, COR_CAMINHO, raio_fator=0.2)
+        desenhar_circulo(tela, passo, COR_CAMINHO, raio_fator=0.2, tamanho=tamanho)
         
 def desenhar_botao(tela, fonte, rect, texto, cor_fundo, cor_texto):
     pygame.draw.rect(tela, cor_fundo, rect, border_radius=8)
@@ -58,56 +73,124 @@ def desenhar_botao(tela, fonte, rect, texto, cor_fundo, cor_texto):
     rect_texto = superficie_texto.get_rect(center=rect.center)
     tela.blit(superficie_texto, rect_texto)
 
-# Lógica
-def resetar_cenario():
-    # Posições fixas
-    # pos_robo = (2, ALTURA_GRID // 2)
-    pos_robo = (random.randint(0,2), random.randint(0, ALTURA_GRID - 1))
-    pos_gol = (LARGURA_GRID - 1, random.randint(0,ALTURA_GRID - 1))
+# Camada de renderização
+class Renderizador:
+    """
+    Desenha o campo com uma superfície estática por cenário (fundo, grade, gol e
+    adversários) e atualiza na tela apenas as células que mudaram de um quadro para o outro
+    """
 
-    # Posição da Bola
-    while True:
-        pos_bola_x = random.randint(LARGURA_GRID // 2, LARGURA_GRID - 1)
-        pos_bola_y = random.randint(0, ALTURA_GRID - 1)
-        pos_bola = (pos_bola_x, pos_bola_y)
-        if pos_bola != pos_gol and pos_bola != pos_robo:
-            break
-
-    # Posição dos Adversários (Obstaculos)
-    MAX_OBSTACULOS = 50
-    obstaculos = []
-    posicoes_ocupadas = {pos_robo, pos_gol, pos_bola}
-    
-    tentativas = 0
-    while len(obstaculos) < MAX_OBSTACULOS:
-        obs_x = random.randint(3, LARGURA_GRID - 1)
-        obs_y = random.randint(0, ALTURA_GRID - 1)
-        pos_obs = (obs_x, obs_y)
-
-        dist_do_robo = abs(pos_obs[0] - pos_robo[0]) + abs(pos_obs[1] - pos_robo[1])
-        dist_do_gol = abs(pos_obs[0] - pos_gol[0]) + abs(pos_obs[1] - pos_gol[1])
-
-        if pos_obs in posicoes_ocupadas or dist_do_robo < 3 or dist_do_gol <= 1:
-            tentativas += 1
-            if tentativas > 1000:
-                print(f"AVISO: Não foi possível posicionar {MAX_OBSTACULOS} obstáculos. Continuando com {len(obstaculos)}.")
-                break
-            continue
-        
-        obstaculos.append(pos_obs)
-        posicoes_ocupadas.add(pos_obs)
-        tentativas = 0
+    def __init__(self, tela, largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, tamanho=TAMANHO_CELULA):
+        carregar_pygame()
+        self.tela = tela
+        self.largura_grid = largura_grid
+        self.altura_grid = altura_grid
+        self.tamanho = tamanho
+        self.estatico = pygame.Surface((largura_grid * tamanho, altura_grid * tamanho))
+        self.cenario = None          # Estado do jogo desenhado na superfície estática
+        self.obstaculos = set()      # Adversários desenhados na superfície estática
+        self.lista_obstaculos = None # Lista (ou mapa) de onde vieram: mover_adversarios cria uma nova
+        self.pos_gol = None
+        self.celulas_dinamicas = set()  # Células com robô, bola ou caminho no último quadro
 
-    return {
-        "pos_robo": pos_robo, "pos_bola": pos_bola, "pos_gol": pos_gol, "obstaculos": obstaculos,
-        "tem_bola": False, "caminho_atual": [], "simulacao_rodando": False,
-        "mensagem": "Cenário aleatório gerado!"
-    }
+    def _desenhar_estatico(self, estado_jogo):
+        self.estatico.fill(COR_FUNDO)
+        desenhar_grade(self.estatico, self.largura_grid, self.altura_grid, self.tamanho)
+        self.pos_gol = estado_jogo["pos_gol"]
+        self.lista_obstaculos = estado_jogo["obstaculos"]
+        self.obstaculos = set(self.lista_obstaculos)
+        desenhar_retangulo(self.estatico, self.pos_gol, COR_GOL, self.tamanho)
+        for obs in self.obstaculos:
+            desenhar_retangulo(self.estatico, obs, COR_OBSTACULO, self.tamanho)
+
+    def _redesenhar_celula_estatica(self, celula):
+        """Refaz uma célula da superfície estática (adversário que entrou ou saiu)"""
+        rect = rect_celula(celula, self.tamanho)
+        if celula in self.obstaculos:
+            pygame.draw.rect(self.estatico, COR_OBSTACULO, rect)
+            return
+        pygame.draw.rect(self.estatico, COR_FUNDO, rect)
+        if celula == self.pos_gol:
+            pygame.draw.rect(self.estatico, COR_GOL, rect)
+            return
+        # Cada célula contém as linhas da grade da sua borda esquerda e do topo
+        pygame.draw.line(self.estatico, COR_LINHA, rect.topleft, (rect.left, rect.bottom - 1))
+        pygame.draw.line(self.estatico, COR_LINHA, rect.topleft, (rect.right - 1, rect.top))
+
+    def desenhar(self, estado_jogo):
+        """
+        Desenha o quadro atual do campo
+        Returns:
+            Lista de retângulos da tela que mudaram (para pygame.display.update)
+        """
+        sujas = set(self.celulas_dinamicas)
+        if estado_jogo is not self.cenario:
+            # Novo cenário: refaz a camada estática e a tela inteira do campo
+            self.cenario = estado_jogo
+            self._desenhar_estatico(estado_jogo)
+            self.tela.blit(self.estatico, (0, 0))
+            sujas = None
+        elif estado_jogo["obstaculos"] is not self.lista_obstaculos:
+            self.lista_obstaculos = estado_jogo["obstaculos"]
+            novos = set(self.lista_obstaculos)
+            alteradas = novos ^ self.obstaculos
+            self.obstaculos = novos
+            for celula in alteradas:
+                self._redesenhar_celula_estatica(celula)
+            sujas |= alteradas
+
+        caminho = [passo for passo in estado_jogo["caminho_atual"]
+                   if passo not in self.obstaculos and passo != self.pos_gol]
+        dinamicas = set(caminho)
+        dinamicas.add(estado_jogo["pos_robo"])
+        if not estado_jogo["tem_bola"]:
+            dinamicas.add(estado_jogo["pos_bola"])
+
+        if sujas is not None:
+            sujas |= dinamicas
+            # Restaura o fundo estático das células que mudaram antes de desenhar por cima
+            for celula in sujas:
+                rect = rect_celula(celula, self.tamanho)
+                self.tela.blit(self.estatico, rect, rect)
+
+        desenhar_caminho(self.tela, caminho, self.tamanho)
+        if estado_jogo["tem_bola"]:
+            desenhar_retangulo(self.tela, estado_jogo["pos_robo"], COR_ROBO_COM_BOLA, self.tamanho)
+            desenhar_circulo(self.tela, estado_jogo["pos_robo"], COR_BOLA, raio_fator=0.3, tamanho=self.tamanho)
+        else:
+            desenhar_retangulo(self.tela, estado_jogo["pos_robo"], COR_ROBO, self.tamanho)
+            desenhar_circulo(self.tela, estado_jogo["pos_bola"], COR_BOLA, tamanho=self.tamanho)
+
+        self.celulas_dinamicas = dinamicas
+        if sujas is None:
+            return [self.estatico.get_rect()]
+        return [rect_celula(celula, self.tamanho) for celula in sujas]
 
 # Loop do Simulador
-def main():
+def main(adversarios_moveis=0, incremental=False, usar_processos=False, largura_grid=LARGURA_GRID,
+         altura_grid=ALTURA_GRID, max_obstaculos=MAX_OBSTACULOS, tamanho_celula=TAMANHO_CELULA, fps=FPS, cache=0,
+         compacto=False, perfilar=None, nome_planejador=None):
+    planejador = planejadores.carregar(nome_planejador or planejadores.PLANEJADOR_PADRAO,
+                                       **({"compacto": True} if compacto else {}))
+    if incremental:
+        from planejador_incremental import ReplanejadorIncremental
+        planejador = ReplanejadorIncremental()
+    if cache:
+        from cache_caminhos import CacheCaminhos
+        planejador = CacheCaminhos(planejador, cache)
+    perfil = None
+    if perfilar:
+        # Perfila na thread de planejamento; o relatório é gravado ao fechar a janela
+        from perfilamento import PerfilPlanejador
+        perfil = planejador = PerfilPlanejador(planejador)
+    assincrono = PlanejadorAssincrono(planejador, usar_processos)
+
+    largura_tela = largura_grid * tamanho_celula
+    altura_tela = altura_grid * tamanho_celula + ALTURA_PAINEL
+
+    carregar_pygame()
     pygame.init()
-    tela = pygame.display.set_mode((LARGURA_TELA, ALTURA_TELA))
+    tela = pygame.display.set_mode((largura_tela, altura_tela))
     pygame.display.set_caption("EDROM - Desafio A*")
     clock = pygame.time.Clock()
     fonte_botao = pygame.font.Font(None, 28)
@@ -120,14 +203,27 @@ def main():
     #     print(f"Não foi possível carregar a imagem 'icone_edrom.png': {e}")
     icone_painel = pygame.Surface((40, 40), pygame.SRCALPHA)
     
-    botao_play_pause = pygame.Rect(20, ALTURA_TELA - ALTURA_PAINEL + 10, 120, 40)
-    botao_reset = pygame.Rect(160, ALTURA_TELA - ALTURA_PAINEL + 10, 120, 40)
-    
-    estado_jogo = resetar_cenario()
+    botao_play_pause = pygame.Rect(20, altura_tela - ALTURA_PAINEL + 10, 120, 40)
+    botao_reset = pygame.Rect(160, altura_tela - ALTURA_PAINEL + 10, 120, 40)
+    painel_rect = pygame.Rect(0, altura_grid * tamanho_celula, largura_tela, ALTURA_PAINEL)
+
+    def novo_cenario():
+        assincrono.invalidar()
+        return resetar_cenario(largura_grid, altura_grid, max_obstaculos)
+
+    renderizador = Renderizador(tela, largura_grid, altura_grid, tamanho_celula)
+    estado_jogo = novo_cenario()
+    proximo_passo = 0
+    fim_pausa_gol = None
+    painel_desenhado = None  # (texto do botão, mensagem) já presentes na tela
 
     while True:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
+                assincrono.encerrar()
+                if perfil is not None:
+                    from perfilamento import exportar
+                    exportar({"simulador": perfil.como_dicionario()}, perfilar)
                 pygame.quit()
                 sys.exit()
             if event.type == pygame.MOUSEBUTTONDOWN:
@@ -135,59 +231,65 @@ def main():
                     estado_jogo["simulacao_rodando"] = not estado_jogo["simulacao_rodando"]
                     estado_jogo["mensagem"] = "Simulação em andamento..." if estado_jogo["simulacao_rodando"] else "Simulação pausada."
                 if botao_reset.collidepoint(event.pos):
-                    estado_jogo = resetar_cenario()
-
-        if estado_jogo["simulacao_rodando"]:
-            if not estado_jogo["caminho_atual"]:
-                objetivo_atual = estado_jogo["pos_bola"] if not estado_jogo["tem_bola"] else estado_jogo["pos_gol"]
-                estado_jogo["caminho_atual"] = candidato.encontrar_caminho(
-                    pos_inicial=estado_jogo["pos_robo"], pos_objetivo=objetivo_atual, obstaculos=estado_jogo["obstaculos"],
-                    largura_grid=LARGURA_GRID, altura_grid=ALTURA_GRID, tem_bola=estado_jogo["tem_bola"])
-            if estado_jogo["caminho_atual"]:
-                estado_jogo["pos_robo"] = estado_jogo["caminho_atual"].pop(0)
-            if not estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_bola"]:
-                estado_jogo["tem_bola"] = True
-                estado_jogo["caminho_atual"] = []
-                estado_jogo["mensagem"] = "Bola capturada! Rumo ao gol!"
-            if estado_jogo["tem_bola"] and estado_jogo["pos_robo"] == estado_jogo["pos_gol"]:
-                estado_jogo["mensagem"] = "GOL! Cenário resetado."
-                pygame.display.flip()
-                pygame.time.wait(2000)
-                estado_jogo = resetar_cenario()
-
-        tela.fill(COR_FUNDO)
-        desenhar_grade(tela)
-        
-        if estado_jogo["caminho_atual"]:
-            desenhar_caminho(tela, estado_jogo["caminho_atual"])
+                    estado_jogo = novo_cenario()
+                    fim_pausa_gol = None
 
-        desenhar_retangulo(tela, estado_jogo["pos_gol"], COR_GOL)
-        for obs in estado_jogo["obstaculos"]:
-            desenhar_retangulo(tela, obs, COR_OBSTACULO)
+        agora = pygame.time.get_ticks()
+        if fim_pausa_gol is not None:
+            if agora >= fim_pausa_gol:
+                estado_jogo = novo_cenario()
+                fim_pausa_gol = None
+        elif estado_jogo["simulacao_rodando"] and agora >= proximo_passo:
+            proximo_passo = agora + INTERVALO_PASSO_MS
+            if assincrono.avancar_passo(estado_jogo, largura_grid, altura_grid, adversarios_moveis) == EVENTO_GOL:
+                fim_pausa_gol = agora + PAUSA_GOL_MS
 
-        if estado_jogo["tem_bola"]:
-            desenhar_retangulo(tela, estado_jogo["pos_robo"], COR_ROBO_COM_BOLA)
-            desenhar_circulo(tela, estado_jogo["pos_robo"], COR_BOLA, raio_fator=0.3)
-        else:
-            desenhar_retangulo(tela, estado_jogo["pos_robo"], COR_ROBO)
-            desenhar_circulo(tela, estado_jogo["pos_bola"], COR_BOLA)
-            
-        painel_rect = pygame.Rect(0, ALTURA_GRID * TAMANHO_CELULA, LARGURA_TELA, ALTURA_PAINEL)
-        pygame.draw.rect(tela, COR_PAINEL, painel_rect)
-        
+        retangulos = renderizador.desenhar(estado_jogo)
+
+        # O painel só é redesenhado quando o texto do botão ou a mensagem mudam
         texto_play = "Pause" if estado_jogo["simulacao_rodando"] else "Play"
-        desenhar_botao(tela, fonte_botao, botao_play_pause, texto_play, COR_BOTAO, COR_TEXTO_BOTAO)
-        desenhar_botao(tela, fonte_botao, botao_reset, "Reset", COR_BOTAO, COR_TEXTO_BOTAO)
-        
-        superficie_msg = fonte_botao.render(estado_jogo["mensagem"], True, COR_TEXTO_BOTAO)
-        tela.blit(superficie_msg, (botao_reset.right + 20, botao_reset.centery - superficie_msg.get_height() // 2))
+        if painel_desenhado != (texto_play, estado_jogo["mensagem"]):
+            painel_desenhado = (texto_play, estado_jogo["mensagem"])
+            pygame.draw.rect(tela, COR_PAINEL, painel_rect)
+            desenhar_botao(tela, fonte_botao, botao_play_pause, texto_play, COR_BOTAO, COR_TEXTO_BOTAO)
+            desenhar_botao(tela, fonte_botao, botao_reset, "Reset", COR_BOTAO, COR_TEXTO_BOTAO)
+
+            superficie_msg = fonte_botao.render(estado_jogo["mensagem"], True, COR_TEXTO_BOTAO)
+            tela.blit(superficie_msg, (botao_reset.right + 20, botao_reset.centery - superficie_msg.get_height() // 2))
 
-        pos_icone_x = LARGURA_TELA - icone_painel.get_width() - 20
-        pos_icone_y = ALTURA_TELA - ALTURA_PAINEL / 2 - icone_painel.get_height() / 2
-        tela.blit(icone_painel, (pos_icone_x, pos_icone_y))
+            pos_icone_x = largura_tela - icone_painel.get_width() - 20
+            pos_icone_y = altura_tela - ALTURA_PAINEL / 2 - icone_painel.get_height() / 2
+            tela.blit(icone_painel, (pos_icone_x, pos_icone_y))
+            retangulos.append(painel_rect)
 
-        pygame.display.flip()
-        clock.tick(5)
+        pygame.display.update(retangulos)
+        clock.tick(fps)
 
 if __name__ == '__main__':
-    main()
+    parser = argparse.ArgumentParser(description="Simulador do desafio EDROM")
+    parser.add_argument("--adversarios-moveis", type=int, default=0, help="Adversários que se movem a cada tick")
+    parser.add_argument("--planejador", metavar="NOME",
+                        help=f"Planejador registrado em planejadores.py ({', '.join(planejadores.nomes())}) "
+                             "ou módulo:objeto")
+    parser.add_argument("--incremental", action="store_true", help="Usa o planejador incremental (D* Lite)")
+    parser.add_argument("--processo", action="store_true", help="Planeja em um processo separado em vez de uma thread")
+    parser.add_argument("--largura", type=int, default=LARGURA_GRID)
+    parser.add_argument("--altura", type=int, default=ALTURA_GRID)
+    parser.add_argument("--obstaculos", type=int, default=MAX_OBSTACULOS)
+    parser.add_argument("--tamanho-celula", type=int, default=TAMANHO_CELULA, help="Pixels por célula")
+    parser.add_argument("--fps", type=int, default=FPS)
+    parser.add_argument("--cache", type=int, default=0, metavar="N", help="Guarda os N caminhos mais recentes (LRU)")
+    parser.add_argument("--compacto", action="store_true",
+                        help="Caminhos compactos (trechos retos, ver caminho_compacto.py) no planejador padrão")
+    parser.add_argument("--perfilar", metavar="ARQUIVO",
+                        help="Perfila cada planejamento (perfilamento.py) e grava o relatório ao fechar a janela")
+    args = parser.parse_args()
+    if args.perfilar and args.processo:
+        parser.error("--perfilar mede a thread de planejamento e não pode ser usado com --processo")
+    if args.planejador and args.planejador not in planejadores.nomes() and ":" not in args.planejador:
+        parser.error(f"--planejador: opções {', '.join(planejadores.nomes())} ou módulo:objeto")
+    if args.planejador not in (None, planejadores.PLANEJADOR_PADRAO) and (args.incremental or args.compacto):
+        parser.error("--incremental e --compacto escolhem o planejador padrão e não podem ser usados com --planejador")
+    planejadores.configurar_logging(args.planejador or planejadores.PLANEJADOR_PADRAO)
+    main(args.adversarios_moveis, args.incremental, args.processo, args.largura, args.altura, args.obstaculos,
+         args.tamanho_celula, args.fps, args.cache, args.compacto, args.perfilar, args.planejador)
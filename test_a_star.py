@@ -4,14 +4,16 @@ from datetime import datetime
 import os
 
 # === CONFIGURAÇÃO DO LOGGING ===
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-os.makedirs("tests", exist_ok=True)
-logging.basicConfig(
-    filename=f"tests/test_a_star_{timestamp}.log",
-    filemode="a",
-    level=logging.DEBUG,
-    format="%(asctime)s - %(levelname)s - %(message)s"
-)
+def configurar_logging():
+    """Grava o log desta implementação em tests/ (chamada explicitamente; importar não cria arquivos)"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    os.makedirs("tests", exist_ok=True)
+    logging.basicConfig(
+        filename=f"tests/test_a_star_{timestamp}.log",
+        filemode="a",
+        level=logging.DEBUG,
+        format="%(asctime)s - %(levelname)s - %(message)s"
+    )
 
 POSICAO_INICIAL_ORIGINAL = None
 
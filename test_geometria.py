@@ -3,18 +3,20 @@ from datetime import datetime
 import os
 
 # Configurações básicas de log para registro da execução
-os.makedirs("tests", exist_ok=True)
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-log_file = os.path.join("tests", f"geometria_{timestamp}.log")
+def configurar_logging():
+    """Grava o log desta implementação em tests/ e no console (chamada explicitamente; importar não cria arquivos)"""
+    os.makedirs("tests", exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    log_file = os.path.join("tests", f"geometria_{timestamp}.log")
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s [%(levelname)s]: %(message)s',
-    handlers=[
-        logging.FileHandler(log_file),
-        logging.StreamHandler()
-    ]
-)
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s [%(levelname)s]: %(message)s',
+        handlers=[
+            logging.FileHandler(log_file),
+            logging.StreamHandler()
+        ]
+    )
 
 logger = logging.getLogger("GeometriaAlgoritmo")
 
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+'''
+Testes de regressão dos planejadores (unittest, sem dependências além do NumPy).
+
+Execução, na raiz do repositório:
+    python -m unittest discover
+ou
+    python -m pytest testes
+'''
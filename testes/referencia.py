@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Referência comum dos testes.
+
+Um Dijkstra de força bruta sobre (célula, direção, bola), escrito só com
+calcular_custo_movimento e calcular_penalidade_adversarios, sem as tabelas, campos e
+filas que os motores compartilham. As consultas vêm de benchmark.gerar_cenarios com
+semente fixa, mais uma sem caminho, e os caminhos são validados e pontuados em lote
+por validacao_lote.validar_consultas.
+'''
+
+import heapq
+import logging
+import unittest
+
+import candidato
+from benchmark import gerar_cenarios
+from candidato import MOVIMENTOS, SEM_DIRECAO
+from validacao_lote import validar_consultas
+
+SEMENTE = 2025
+# Modelos verificados: o padrão, o enunciado original do desafio e um sem custos de rotação
+MODELO_ENUNCIADO = candidato.ModeloCusto(custo_reto=300, custo_diagonal=100)
+MODELO_SEM_ROTACAO = candidato.ModeloCusto(custo_reto_diagonal=0, custo_90_graus=0)
+MODELOS = (None, MODELO_ENUNCIADO, MODELO_SEM_ROTACAO)
+
+# ==================== FORÇA BRUTA ====================
+def dijkstra_referencia(pos_inicial, objetivos, obstaculos, largura_grid, altura_grid, tem_bola=False, modelo=None):
+    """
+    Custo ótimo por força bruta sobre (célula, direção, bola, trecho)
+    Args:
+        pos_inicial: Tupla (x,y) com a posição inicial
+        objetivos: Lista de objetivos visitados em ordem; ao chegar ao primeiro de dois
+                   objetivos o robô pega a bola (robô -> bola -> gol)
+        obstaculos: Lista de posições dos adversários
+        largura_grid: Largura do grid
+        altura_grid: Altura do grid
+        tem_bola: Posse de bola no início
+        modelo: ModeloCusto (None usa candidato.MODELO_PADRAO)
+    Returns:
+        Custo ótimo, ou None se algum objetivo for inalcançável
+    """
+    bloqueados = set(obstaculos)
+    penalidades = {}
+    ultimo = len(objetivos) - 1
+    inicial = (pos_inicial, SEM_DIRECAO, 0)
+    dist = {inicial: 0}
+    heap = [(0, 0, pos_inicial, SEM_DIRECAO)]
+    while heap:
+        custo, trecho, posicao, direcao = heapq.heappop(heap)
+        if custo > dist[(posicao, direcao, trecho)]:
+            continue
+        if posicao == objetivos[trecho]:
+            if trecho == ultimo:
+                return custo
+            trecho += 1  # Pega a bola e segue com a mesma direção
+            if custo < dist.get((posicao, direcao, trecho), candidato.CUSTO_INFINITO):
+                dist[(posicao, direcao, trecho)] = custo
+                heapq.heappush(heap, (custo, trecho, posicao, direcao))
+            continue
+        bola = tem_bola or trecho > 0
+        anterior = MOVIMENTOS[direcao] if direcao != SEM_DIRECAO else None
+        for indice, movimento in enumerate(MOVIMENTOS):
+            vizinha = (posicao[0] + movimento[0], posicao[1] + movimento[1])
+            if not (0 <= vizinha[0] < largura_grid and 0 <= vizinha[1] < altura_grid) or vizinha in bloqueados:
+                continue
+            if vizinha not in penalidades:
+                penalidades[vizinha] = candidato.calcular_penalidade_adversarios(vizinha, obstaculos)
+            novo = (custo + candidato.calcular_custo_movimento(anterior, movimento, bola, modelo)
+                    + penalidades[vizinha])
+            chave = (vizinha, indice, trecho)
+            if novo < dist.get(chave, candidato.CUSTO_INFINITO):
+                dist[chave] = novo
+                heapq.heappush(heap, (novo, trecho, vizinha, indice))
+    return None
+
+def custo_sequencial(caminho, obstaculos, tem_bola=False, troca_bola=None, modelo=None):
+    """Custo de um caminho passo a passo; a partir da posição troca_bola o robô está com a bola"""
+    custo, direcao, bola = 0, None, tem_bola
+    for anterior, posicao in zip(caminho, caminho[1:]):
+        if anterior == troca_bola:
+            bola = True
+        movimento = (posicao[0] - anterior[0], posicao[1] - anterior[1])
+        custo += (candidato.calcular_custo_movimento(direcao, movimento, bola, modelo)
+                  + candidato.calcular_penalidade_adversarios(posicao, obstaculos))
+        direcao = movimento
+    return custo
+
+# ==================== CONSULTAS ====================
+def consulta_cercada():
+    """Consulta sem caminho: o objetivo está cercado pelos 8 vizinhos"""
+    objetivo = (9, 4)
+    obstaculos = [(objetivo[0] + dx, objetivo[1] + dy) for dx, dy in MOVIMENTOS] + [(3, 3)]
+    return {"grupo": "cercado", "obstaculos": obstaculos, "largura_grid": 12, "altura_grid": 9,
+            "pos_inicial": (0, 4), "pos_objetivo": objetivo, "tem_bola": False}
+
+_consultas = None
+
+def consultas_verificacao():
+    """
+    Consultas de benchmark.gerar_cenarios (12x9 e 20x15, densidades 0,1 e 0,25), mais uma
+    sem caminho, com o custo ótimo de referência de cada modelo já calculado (None quando
+    não há caminho). Calculadas uma vez por processo e compartilhadas pelos testes.
+    """
+    global _consultas
+    if _consultas is None:
+        consultas = gerar_cenarios([(12, 9), (20, 15)], [0.1, 0.25], 4, SEMENTE) + [consulta_cercada()]
+        for consulta in consultas:
+            consulta["referencia"] = {}
+            for modelo in MODELOS:
+                consulta["referencia"][id(modelo)] = dijkstra_referencia(
+                    consulta["pos_inicial"], [consulta["pos_objetivo"]], consulta["obstaculos"],
+                    consulta["largura_grid"], consulta["altura_grid"], consulta["tem_bola"], modelo)
+        _consultas = consultas
+    return _consultas
+
+def chamar(planejador, consulta, **opcoes):
+    """Chama um planejador com a assinatura comum dos motores sobre uma consulta"""
+    return planejador(consulta["pos_inicial"], consulta["pos_objetivo"], consulta["obstaculos"],
+                      consulta["largura_grid"], consulta["altura_grid"], consulta["tem_bola"], **opcoes)
+
+# ==================== CASO BASE ====================
+class TesteComReferencia(unittest.TestCase):
+    """Caso base: consultas com referência e comparação de custo contra a força bruta"""
+
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.WARNING)  # Avisos esperados: caminhos inexistentes, robô travado
+        cls.consultas = consultas_verificacao()
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def verificar_exato(self, nome, planejador, modelo=None, consultas=None, repassar_modelo=True):
+        """
+        Caminhos válidos e com o custo ótimo; consultas sem caminho devolvem um caminho vazio
+        Com repassar_modelo=False o planejador já foi construído com o modelo (classes como
+        ReplanejadorIncremental) e é chamado sem modelo=
+        """
+        consultas = consultas or self.consultas
+        caminhos = [chamar(planejador, consulta, modelo=modelo) if repassar_modelo and modelo is not None
+                    else chamar(planejador, consulta) for consulta in consultas]
+        validacao = validar_consultas(caminhos, consultas, modelo)
+        for i, consulta in enumerate(consultas):
+            referencia = consulta["referencia"][id(modelo)]
+            with self.subTest(motor=nome, modelo=modelo, consulta=i):
+                if referencia is None:
+                    self.assertFalse(caminhos[i])
+                else:
+                    self.assertTrue(validacao["valido"][i])
+                    self.assertEqual(int(validacao["custo"][i]), referencia)
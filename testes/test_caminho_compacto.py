@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Ida e volta entre listas de posições, CaminhoCompacto e CursorCaminho
+'''
+
+import random
+import unittest
+
+import candidato
+from caminho_compacto import CaminhoCompacto, DESLOCAMENTOS, percorrer
+from testes.referencia import MODELOS, SEMENTE, TesteComReferencia
+
+def compacto(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, modelo=None):
+    """Caminho compacto montado pelo motor vetorial, expandido de volta para a lista"""
+    caminho = candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid,
+                                          tem_bola, modelo=modelo, compacto=True)
+    return list(caminho)
+
+def caminhos_aleatorios(n=200):
+    rng = random.Random(SEMENTE)
+    for _ in range(n):
+        posicao = (rng.randrange(-5, 50), rng.randrange(-5, 50))
+        caminho = [posicao]
+        direcao = rng.choice(DESLOCAMENTOS)
+        for _ in range(rng.randrange(0, 40)):
+            if rng.random() < 0.3:
+                direcao = rng.choice(DESLOCAMENTOS)  # Inclui (0, 0): esperas do planejamento cooperativo
+            posicao = (posicao[0] + direcao[0], posicao[1] + direcao[1])
+            caminho.append(posicao)
+        yield caminho
+
+class TesteCaminhoCompacto(TesteComReferencia):
+
+    def test_busca_compacta(self):
+        for modelo in MODELOS:
+            self.verificar_exato("compacto", compacto, modelo)
+
+    def test_ida_e_volta(self):
+        for caminho in caminhos_aleatorios():
+            compactado = CaminhoCompacto.de_posicoes(caminho)
+            self.assertEqual(list(compactado), caminho)
+            self.assertEqual(len(compactado), len(caminho))
+            self.assertEqual(compactado, caminho)
+            self.assertEqual([compactado[i] for i in range(len(caminho))], caminho)
+            self.assertEqual(compactado[-1], caminho[-1])
+            self.assertEqual(compactado[1:4], caminho[1:4])
+            vertices = compactado.vertices()
+            self.assertEqual((vertices[0], vertices[-1]), (caminho[0], caminho[-1]))
+            self.assertTrue(set(vertices) <= set(caminho))
+
+    def test_cursor(self):
+        for caminho in caminhos_aleatorios():
+            cursor = CaminhoCompacto.de_posicoes(caminho).cursor()
+            for consumidas, esperada in enumerate(caminho):
+                self.assertEqual(len(cursor), len(caminho) - consumidas)
+                self.assertEqual(list(cursor), caminho[consumidas:])
+                self.assertEqual(cursor[0], esperada)
+                self.assertEqual(cursor.popleft(), esperada)
+            self.assertFalse(cursor)
+            with self.assertRaises(IndexError):
+                cursor.popleft()
+
+    def test_vazio_e_lista(self):
+        vazio = CaminhoCompacto.de_posicoes([])
+        self.assertFalse(vazio)
+        self.assertEqual(list(vazio), [])
+        self.assertEqual(list(percorrer([(0, 0), (1, 1)])), [(0, 0), (1, 1)])
+        with self.assertRaises(ValueError):
+            CaminhoCompacto.de_posicoes([(0, 0), (2, 0)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Campo de custo até o objetivo contra o Dijkstra de força bruta
+'''
+
+import unittest
+
+from candidato import CUSTO_INFINITO
+from campo_objetivo import CampoCustoObjetivo, encontrar_caminho_por_campo
+from testes.referencia import MODELOS, TesteComReferencia
+
+class TesteCampoObjetivo(TesteComReferencia):
+
+    def test_caminho_pela_tabela(self):
+        for modelo in MODELOS:
+            self.verificar_exato("campo_objetivo", encontrar_caminho_por_campo, modelo)
+
+    def test_custo_restante(self):
+        """O valor da tabela no estado inicial é o próprio custo ótimo"""
+        for modelo in MODELOS:
+            for i, consulta in enumerate(self.consultas):
+                campo = CampoCustoObjetivo(consulta["pos_objetivo"], consulta["obstaculos"],
+                                           consulta["largura_grid"], consulta["altura_grid"], modelo)
+                referencia = consulta["referencia"][id(modelo)]
+                with self.subTest(modelo=modelo, consulta=i):
+                    self.assertEqual(campo.custo_restante(consulta["pos_inicial"], None, consulta["tem_bola"]),
+                                     CUSTO_INFINITO if referencia is None else referencia)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Motores de candidato.encontrar_caminho contra o Dijkstra de força bruta
+'''
+
+import unittest
+
+import candidato
+from testes.referencia import MODELOS, MODELO_ENUNCIADO, TesteComReferencia, dijkstra_referencia, custo_sequencial
+
+def motor(nome, **fixas):
+    """Planejador com a assinatura comum que usa candidato.encontrar_caminho com o motor dado"""
+    def planejar(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, modelo=None):
+        return candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid,
+                                           tem_bola, motor=nome, modelo=modelo, **fixas)
+    return planejar
+
+class TesteMotores(TesteComReferencia):
+
+    def test_vetorial(self):
+        for modelo in MODELOS:
+            self.verificar_exato("vetorial", motor("vetorial"), modelo)
+
+    def test_objetos(self):
+        for modelo in MODELOS:
+            self.verificar_exato("objetos", motor("objetos"), modelo)
+
+class TesteBuscaCombinada(TesteComReferencia):
+    """Robô -> bola -> gol em uma busca (pos_final) contra a força bruta com dois trechos"""
+
+    def test_busca_combinada(self):
+        # gerar_cenarios devolve as consultas de cada cenário em pares: robô -> bola, bola -> gol
+        pares = [consulta for consulta in self.consultas if consulta["grupo"] != "cercado"]
+        cenarios = list(zip(pares[::2], pares[1::2]))
+        for modelo in (None, MODELO_ENUNCIADO):
+            for i, (ida, volta) in enumerate(cenarios):
+                robo, bola, gol = ida["pos_inicial"], ida["pos_objetivo"], volta["pos_objetivo"]
+                referencia = dijkstra_referencia(robo, [bola, gol], ida["obstaculos"], ida["largura_grid"],
+                                                 ida["altura_grid"], False, modelo)
+                caminho = candidato.encontrar_caminho(robo, bola, ida["obstaculos"], ida["largura_grid"],
+                                                      ida["altura_grid"], modelo=modelo, pos_final=gol)
+                with self.subTest(modelo=modelo, cenario=i):
+                    if referencia is None:
+                        self.assertFalse(caminho)
+                        continue
+                    self.assertIn(bola, caminho)
+                    self.assertEqual((caminho[0], caminho[-1]), (robo, gol))
+                    self.assertEqual(custo_sequencial(caminho, ida["obstaculos"], troca_bola=bola, modelo=modelo),
+                                     referencia)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Filas de prioridade: ordem de remoção e busca com a fila de baldes
+'''
+
+import random
+import unittest
+
+import candidato
+from fila_prioridade import FILAS, FilaBaldes
+from testes.referencia import MODELOS, SEMENTE, TesteComReferencia, chamar, custo_sequencial, dijkstra_referencia
+
+def com_baldes(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, modelo=None):
+    """Motor vetorial com a fila de baldes"""
+    return candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                       modelo=modelo, fila="baldes")
+
+class TesteFilas(TesteComReferencia):
+
+    def test_busca_com_baldes(self):
+        for modelo in MODELOS:
+            self.verificar_exato("baldes", com_baldes, modelo)
+
+    def test_mesma_ordem_de_remocao(self):
+        """Todas as filas retiram as mesmas entradas na mesma ordem (menor f, depois menor h)"""
+        rng = random.Random(SEMENTE)
+        for granularidade in (1, 50):
+            filas = {nome: classe(granularidade) for nome, classe in FILAS.items()}
+            removidas = {nome: [] for nome in filas}
+            for passo in range(3000):
+                if rng.random() < 0.6:
+                    # Sem retroceder abaixo do último f retirado, como no A* com heurística consistente
+                    base = removidas["binaria"][-1][0] if removidas["binaria"] else 0
+                    entrada = (base + granularidade * rng.randrange(0, 20), rng.randrange(0, 500), passo)
+                    for fila in filas.values():
+                        fila.inserir(entrada)
+                elif filas["binaria"]:
+                    for nome, fila in filas.items():
+                        removidas[nome].append(fila.remover())
+            for nome, fila in filas.items():
+                while fila:
+                    removidas[nome].append(fila.remover())
+                with self.subTest(fila=nome, granularidade=granularidade):
+                    self.assertEqual(removidas[nome], removidas["binaria"])
+                    with self.assertRaises(IndexError):
+                        fila.remover()
+
+    def test_custos_fracionarios(self):
+        """Com custos não inteiros a fila de baldes dá lugar à binária e todo motor continua exato"""
+        with self.assertRaises(ValueError):
+            FilaBaldes(2.5)
+        modelo = candidato.ModeloCusto(custo_reto=10.5)
+        for penalidades in (None, [300.0, 200.5, 70]):
+            candidato.definir_penalidades_proximidade(penalidades)
+            self.addCleanup(candidato.definir_penalidades_proximidade, None)
+            consultas = [consulta for consulta in self.consultas if consulta["largura_grid"] == 12]
+            referencias = [dijkstra_referencia(c["pos_inicial"], [c["pos_objetivo"]], c["obstaculos"],
+                                               c["largura_grid"], c["altura_grid"], c["tem_bola"], modelo)
+                           for c in consultas]
+            for nome_motor in ("vetorial", "objetos"):
+                for fila in ("binaria", "baldes"):
+                    for i, (consulta, referencia) in enumerate(zip(consultas, referencias)):
+                        caminho = chamar(candidato.encontrar_caminho, consulta, motor=nome_motor, fila=fila,
+                                         modelo=modelo)
+                        with self.subTest(penalidades=penalidades, motor=nome_motor, fila=fila, consulta=i):
+                            if referencia is None:
+                                self.assertFalse(caminho)
+                                continue
+                            self.assertEqual((caminho[0], caminho[-1]),
+                                             (consulta["pos_inicial"], consulta["pos_objetivo"]))
+                            self.assertAlmostEqual(custo_sequencial(caminho, consulta["obstaculos"],
+                                                                    consulta["tem_bola"], modelo=modelo), referencia)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Heurística ALT contra o Dijkstra de força bruta
+'''
+
+import unittest
+
+import candidato
+from heuristica_marcos import encontrar_caminho_alt, obter_tabela_marcos
+from testes.referencia import MODELOS, TesteComReferencia
+
+def com_marcos(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, modelo=None):
+    """Motor vetorial com a heurística ALT de 4 marcos"""
+    return candidato.encontrar_caminho(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                       modelo=modelo, marcos=4)
+
+class TesteMarcos(TesteComReferencia):
+
+    def test_alt(self):
+        for modelo in MODELOS:
+            self.verificar_exato("alt", com_marcos, modelo)
+
+    def test_encontrar_caminho_alt(self):
+        for modelo in MODELOS:
+            self.verificar_exato("encontrar_caminho_alt", encontrar_caminho_alt, modelo)
+
+    def test_cache_por_modelo(self):
+        """Modelos criados e descartados em sequência nunca recebem a tabela de outro modelo"""
+        consulta = self.consultas[0]
+        for i in range(40):
+            custo = 150 if i % 2 else 100
+            modelo = candidato.ModeloCusto(custo_reto=custo, custo_diagonal=custo)
+            tabela = obter_tabela_marcos(consulta["obstaculos"], consulta["largura_grid"], consulta["altura_grid"], 2,
+                                         modelo)
+            self.assertIs(tabela.modelo, modelo)
+            self.assertEqual(set(tabela.passos), {custo})
+            del modelo, tabela
+
+    def test_heuristica_do_modelo_admissivel(self):
+        """A heurística de cada modelo nunca passa do custo ótimo"""
+        for modelo in MODELOS:
+            for i, consulta in enumerate(self.consultas):
+                referencia = consulta["referencia"][id(modelo)]
+                if referencia is None:
+                    continue
+                with self.subTest(modelo=modelo, consulta=i):
+                    self.assertLessEqual(candidato.calcular_heuristica(consulta["pos_inicial"],
+                                                                       consulta["pos_objetivo"], modelo), referencia)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+MapaOcupacao: regra de ocupação, arquivo mapeado e busca sobre o mapa
+'''
+
+import os
+import tempfile
+import unittest
+
+import candidato
+from mapa import MapaOcupacao, salvar_mapa, carregar_mapa
+from testes.referencia import MODELOS, TesteComReferencia
+
+def sobre_mapa(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, modelo=None):
+    """encontrar_caminho recebendo os adversários como MapaOcupacao em vez de lista"""
+    mapa = MapaOcupacao.de_lista(obstaculos, largura_grid, altura_grid)
+    return candidato.encontrar_caminho(pos_inicial, pos_objetivo, mapa, largura_grid, altura_grid, tem_bola,
+                                       modelo=modelo)
+
+class TesteMapa(TesteComReferencia):
+
+    def test_busca_sobre_mapa(self):
+        for modelo in MODELOS:
+            self.verificar_exato("mapa", sobre_mapa, modelo)
+
+    def test_bytes_nao_nulos(self):
+        """Qualquer byte não nulo é uma célula ocupada, na memória e no arquivo mapeado"""
+        dados = bytearray(20)
+        dados[1], dados[7], dados[18] = 1, 2, 255
+        mapa = MapaOcupacao(5, 4, dados)
+        esperadas = [(1, 0), (2, 1), (3, 3)]
+        self.assertEqual(list(mapa), esperadas)
+        self.assertEqual(len(mapa), 3)
+        self.assertTrue(all(posicao in mapa for posicao in esperadas))
+        with tempfile.TemporaryDirectory() as pasta:
+            arquivo = os.path.join(pasta, "mapa.bin")
+            salvar_mapa(mapa, arquivo)
+            mapeado = carregar_mapa(arquivo)
+            self.assertEqual(list(mapeado), esperadas)
+            mapeado.fechar()
+
+if __name__ == '__main__':
+    unittest.main()
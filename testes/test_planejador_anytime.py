@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+ARA* contra o Dijkstra de força bruta, com e sem orçamento
+'''
+
+import unittest
+
+from planejador_anytime import PlanejadorComPrazo, encontrar_caminho_anytime
+from testes.referencia import MODELOS, TesteComReferencia, chamar, custo_sequencial
+
+def sem_orcamento(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola, modelo=None):
+    """encontrar_caminho_anytime sem prazo, devolvendo só o caminho"""
+    return encontrar_caminho_anytime(pos_inicial, pos_objetivo, obstaculos, largura_grid, altura_grid, tem_bola,
+                                     modelo=modelo).caminho
+
+class TesteAnytime(TesteComReferencia):
+
+    def test_sem_orcamento(self):
+        for modelo in MODELOS:
+            self.verificar_exato("anytime", PlanejadorComPrazo(None, modelo), modelo, repassar_modelo=False)
+            self.verificar_exato("encontrar_caminho_anytime", sem_orcamento, modelo)
+
+    def test_limite_com_orcamento(self):
+        """Com poucas expansões o caminho é válido, o custo informado é o real e respeita o limite"""
+        for i, (consulta, modelo) in enumerate(zip(self.consultas, MODELOS * len(self.consultas))):
+            referencia = consulta["referencia"][id(modelo)]
+            resultado = chamar(encontrar_caminho_anytime, consulta, max_expansoes=30, modelo=modelo)
+            with self.subTest(consulta=i, modelo=modelo):
+                if referencia is None or not resultado.caminho:
+                    self.assertFalse(resultado.caminho)
+                    continue
+                self.assertEqual((resultado.caminho[0], resultado.caminho[-1]),
+                                 (consulta["pos_inicial"], consulta["pos_objetivo"]))
+                self.assertEqual(custo_sequencial(resultado.caminho, consulta["obstaculos"], consulta["tem_bola"],
+                                                  modelo=modelo), resultado.custo)
+                self.assertGreaterEqual(resultado.custo, referencia)
+                self.assertLessEqual(resultado.custo, resultado.limite * referencia)
+
+if __name__ == '__main__':
+    unittest.main()
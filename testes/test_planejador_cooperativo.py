@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Planejamento cooperativo: nenhum robô na mesma célula nem trocando de célula
+'''
+
+import logging
+import random
+import unittest
+
+from planejador_cooperativo import PlanejadorCooperativo
+from simulacao import executar_lote, executar_episodio_equipe, resetar_equipe
+from testes.referencia import MODELO_ENUNCIADO, SEMENTE
+
+class TesteCooperativo(unittest.TestCase):
+
+    def setUp(self):
+        logging.disable(logging.WARNING)  # Robôs travados esperando a vez geram avisos
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def verificar_sem_colisao(self, caminhos, pedidos):
+        ticks = max((len(caminho) for caminho in caminhos), default=0)
+        for tick in range(ticks):
+            posicoes = {}
+            for robo, (caminho, pedido) in enumerate(zip(caminhos, pedidos)):
+                if not caminho:
+                    posicao = pedido["pos_inicial"]
+                elif tick < len(caminho):
+                    posicao = caminho[tick]
+                elif pedido["tem_bola"] and caminho[-1] == pedido["pos_objetivo"]:
+                    continue  # Marcou e saiu do campo
+                else:
+                    posicao = caminho[-1]
+                self.assertNotIn(posicao, posicoes, f"tick {tick}: robôs {posicoes.get(posicao)} e {robo}")
+                posicoes[posicao] = robo
+        for a in range(len(caminhos)):
+            for b in range(a + 1, len(caminhos)):
+                for tick in range(min(len(caminhos[a]), len(caminhos[b])) - 1):
+                    troca = (caminhos[a][tick], caminhos[a][tick + 1]) == (caminhos[b][tick + 1], caminhos[b][tick])
+                    self.assertFalse(troca and caminhos[a][tick] != caminhos[a][tick + 1],
+                                     f"tick {tick}: robôs {a} e {b} trocam de célula")
+
+    def test_plano_sem_colisao(self):
+        for semente in range(6):
+            for modelo in (None, MODELO_ENUNCIADO):
+                estado = resetar_equipe(5, 20, 15, 30, random.Random(semente))
+                pedidos = [{"pos_inicial": robo["pos_robo"], "pos_objetivo": robo["pos_bola"], "tem_bola": False,
+                            "direcao": None} for robo in estado["robos"]]
+                caminhos = PlanejadorCooperativo(janela=12, modelo=modelo)(pedidos, estado["obstaculos"], 20, 15)
+                with self.subTest(semente=semente, modelo=modelo):
+                    self.verificar_sem_colisao(caminhos, pedidos)
+
+    def test_episodios_sem_colisao(self):
+        for adversarios_moveis in (0, 3):
+            resultados = executar_lote(4, SEMENTE, episodio=executar_episodio_equipe,
+                                       planejador_equipe=PlanejadorCooperativo(janela=12), n_robos=4,
+                                       adversarios_moveis=adversarios_moveis, replanejar_a_cada=6)
+            with self.subTest(adversarios_moveis=adversarios_moveis):
+                self.assertEqual(sum(r["colisoes"] for r in resultados), 0)
+                self.assertTrue(all(r["gols"] > 0 for r in resultados))
+
+if __name__ == '__main__':
+    unittest.main()
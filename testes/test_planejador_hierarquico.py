@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+HPA* dentro dos limites de custo documentados em planejador_hierarquico
+'''
+
+import logging
+import unittest
+
+from benchmark import gerar_cenarios
+from mapa import MapaOcupacao
+from planejador_hierarquico import PlanejadorHierarquico
+from testes.referencia import SEMENTE, dijkstra_referencia
+from validacao_lote import validar_consultas
+
+class TesteHierarquico(unittest.TestCase):
+    """HPA* acima da escala em que delega tudo à busca direta"""
+
+    LIMITES = {None: 1.55, 0: 1.30, 1: 1.03}  # Pior custo / ótimo medido para cada corredor
+
+    def setUp(self):
+        logging.disable(logging.WARNING)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def test_limite_de_custo(self):
+        consultas = gerar_cenarios([(40, 30)], [0.1], 3, SEMENTE)
+        referencias = [dijkstra_referencia(consulta["pos_inicial"], [consulta["pos_objetivo"]], consulta["obstaculos"],
+                                           40, 30, consulta["tem_bola"]) for consulta in consultas]
+        for corredor, limite in self.LIMITES.items():
+            planejadores = {}
+            caminhos = []
+            for consulta in consultas:
+                chave = id(consulta["obstaculos"])
+                if chave not in planejadores:
+                    planejadores[chave] = PlanejadorHierarquico(consulta["obstaculos"], 40, 30, corredor=corredor)
+                caminhos.append(planejadores[chave].planejar(consulta["pos_inicial"], consulta["pos_objetivo"],
+                                                             consulta["tem_bola"]))
+            validacao = validar_consultas(caminhos, consultas)
+            for i, referencia in enumerate(referencias):
+                with self.subTest(corredor=corredor, consulta=i):
+                    self.assertTrue(validacao["valido"][i])
+                    self.assertGreaterEqual(int(validacao["custo"][i]), referencia)
+                    self.assertLessEqual(int(validacao["custo"][i]), limite * referencia)
+
+    def test_mapa_do_chamador_intacto(self):
+        consulta = gerar_cenarios([(40, 30)], [0.1], 1, SEMENTE)[0]
+        mapa = MapaOcupacao.de_lista(consulta["obstaculos"], 40, 30)
+        dados, versao = bytes(mapa.dados), mapa.versao
+        planejador = PlanejadorHierarquico(mapa, 40, 30)
+        livre = next((x, y) for y in range(30) for x in range(40)
+                     if (x, y) not in mapa and (x, y) not in (consulta["pos_inicial"], consulta["pos_objetivo"]))
+        planejador.adicionar_obstaculo(livre)
+        planejador.remover_obstaculo(consulta["obstaculos"][0])
+        self.assertEqual(bytes(mapa.dados), dados)
+        self.assertEqual(mapa.versao, versao)
+        self.assertIn(livre, planejador.mapa)
+        self.assertNotIn(consulta["obstaculos"][0], planejador.mapa)
+        caminho = planejador.planejar(consulta["pos_inicial"], consulta["pos_objetivo"], consulta["tem_bola"])
+        self.assertNotIn(livre, caminho)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+D* Lite contra o Dijkstra de força bruta, inclusive depois de reparos incrementais
+'''
+
+import random
+import unittest
+
+from candidato import MOVIMENTOS
+from planejador_incremental import PlanejadorIncremental, ReplanejadorIncremental
+from testes.referencia import MODELOS, SEMENTE, TesteComReferencia, dijkstra_referencia, custo_sequencial
+
+class TesteIncremental(TesteComReferencia):
+
+    def test_consultas(self):
+        for modelo in MODELOS:
+            # Uma instância para todas as consultas: exercita a reutilização entre chamadas
+            self.verificar_exato("incremental", ReplanejadorIncremental(modelo), modelo, repassar_modelo=False)
+
+    def test_reparo_com_adversarios_moveis(self):
+        """Depois de mover adversários e o robô, o caminho reparado tem o custo de uma busca do zero (modelos alternados)"""
+        rng = random.Random(SEMENTE)
+        consultas = [consulta for consulta in self.consultas if consulta["obstaculos"] and consulta["grupo"] != "cercado"]
+        for i, (consulta, modelo) in enumerate(zip(consultas, MODELOS * len(consultas))):
+            largura, altura = consulta["largura_grid"], consulta["altura_grid"]
+            objetivo, tem_bola = consulta["pos_objetivo"], consulta["tem_bola"]
+            obstaculos = list(consulta["obstaculos"])
+            planejador = PlanejadorIncremental(objetivo, obstaculos, largura, altura, tem_bola, modelo)
+            posicao = consulta["pos_inicial"]
+            for rodada in range(3):
+                caminho = planejador.planejar(posicao)
+                referencia = dijkstra_referencia(posicao, [objetivo], obstaculos, largura, altura, tem_bola, modelo)
+                with self.subTest(consulta=i, modelo=modelo, rodada=rodada):
+                    if referencia is None:
+                        self.assertFalse(caminho)
+                        break
+                    self.assertEqual((caminho[0], caminho[-1]), (posicao, objetivo))
+                    self.assertEqual(custo_sequencial(caminho, obstaculos, tem_bola, modelo=modelo), referencia)
+                if len(caminho) < 3:
+                    break
+                posicao = caminho[1]
+                ocupadas = {posicao, objetivo}
+                for j, (x, y) in enumerate(obstaculos):
+                    dx, dy = rng.choice(MOVIMENTOS)
+                    destino = (x + dx, y + dy)
+                    if 0 <= destino[0] < largura and 0 <= destino[1] < altura and destino not in ocupadas:
+                        obstaculos[j] = destino
+                planejador.atualizar_obstaculos(obstaculos)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Registro de planejadores: importação sem efeitos colaterais e caminhos válidos
+'''
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import planejadores
+from testes.referencia import TesteComReferencia, chamar
+from validacao_lote import validar_consultas
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TesteRegistro(TesteComReferencia):
+
+    def test_caminhos_validos(self):
+        """Todo planejador registrado devolve caminhos válidos (test_a_star e test_geometria não seguem o modelo)"""
+        consultas = [consulta for consulta in self.consultas if consulta["referencia"][id(None)] is not None]
+        for nome in planejadores.nomes():
+            planejador = planejadores.carregar(nome)
+            caminhos = [chamar(planejador, consulta) for consulta in consultas]
+            validacao = validar_consultas(caminhos, consultas)
+            for i, caminho in enumerate(caminhos):
+                if caminho:
+                    with self.subTest(planejador=nome, consulta=i):
+                        self.assertTrue(validacao["adjacente"][i] and validacao["livre"][i] and validacao["dentro"][i])
+
+    def test_importacao_sem_efeitos(self):
+        """Consultar o registro não importa planejadores, e importá-los não cria arquivos nem configura o logging"""
+        codigo = ("import sys, logging, planejadores\n"
+                  "planejadores.nomes()\n"
+                  "assert 'candidato' not in sys.modules\n"
+                  "for nome in planejadores.nomes():\n"
+                  "    planejadores.modulo(nome)\n"
+                  "assert not logging.getLogger().handlers\n")
+        with tempfile.TemporaryDirectory() as pasta:
+            ambiente = dict(os.environ, PYTHONPATH=RAIZ)
+            subprocess.run([sys.executable, "-c", codigo], cwd=pasta, env=ambiente, check=True)
+            self.assertEqual(os.listdir(pasta), [])
+
+    def test_logging_proprio_do_planejador(self):
+        """test_a_star e test_geometria gravam o próprio log em tests/; os demais usam o do candidato"""
+        codigo = ("import sys, logging, planejadores\n"
+                  "planejadores.configurar_logging(sys.argv[1], arquivo=False)\n"
+                  "planejadores.carregar(sys.argv[1])((0, 0), (3, 2), [(1, 1)], 6, 5)\n")
+        esperados = {"test_a_star": ["test_a_star_"], "test_geometria": ["geometria_"], "candidato": None}
+        for nome, prefixos in esperados.items():
+            with self.subTest(planejador=nome), tempfile.TemporaryDirectory() as pasta:
+                ambiente = dict(os.environ, PYTHONPATH=RAIZ)
+                subprocess.run([sys.executable, "-c", codigo, nome], cwd=pasta, env=ambiente, check=True,
+                               capture_output=True)
+                if prefixos is None:
+                    self.assertEqual(os.listdir(pasta), [])
+                    continue
+                logs = os.listdir(os.path.join(pasta, "tests"))
+                self.assertEqual([log for log in logs if not log.startswith(prefixos[0])], [])
+                with open(os.path.join(pasta, "tests", logs[0]), encoding="utf-8") as arquivo:
+                    self.assertIn("DEBUG", arquivo.read())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Validador em lote: pontuação igual à passo a passo e recusa de caminhos inválidos
+'''
+
+import unittest
+
+import candidato
+from testes.referencia import MODELOS, TesteComReferencia, custo_sequencial
+from validacao_lote import validar_consultas
+
+class TesteValidacao(TesteComReferencia):
+
+    def test_custo_igual_ao_passo_a_passo(self):
+        for modelo in MODELOS:
+            caminhos = [candidato.encontrar_caminho(c["pos_inicial"], c["pos_objetivo"], c["obstaculos"],
+                                                    c["largura_grid"], c["altura_grid"], c["tem_bola"], modelo=modelo)
+                        for c in self.consultas]
+            validacao = validar_consultas(caminhos, self.consultas, modelo)
+            for i, (caminho, consulta) in enumerate(zip(caminhos, self.consultas)):
+                if caminho:
+                    with self.subTest(modelo=modelo, consulta=i):
+                        self.assertTrue(validacao["valido"][i])
+                        self.assertEqual(int(validacao["custo"][i]),
+                                         custo_sequencial(caminho, consulta["obstaculos"], consulta["tem_bola"],
+                                                          modelo=modelo))
+
+    def test_recusa_caminhos_invalidos(self):
+        consulta = next(c for c in self.consultas if c["referencia"][id(None)] is not None and c["obstaculos"])
+        caminho = candidato.encontrar_caminho(consulta["pos_inicial"], consulta["pos_objetivo"], consulta["obstaculos"],
+                                              consulta["largura_grid"], consulta["altura_grid"], consulta["tem_bola"])
+        salto = [caminho[0]] + caminho[2:]
+        sobre_adversario = caminho[:1] + [consulta["obstaculos"][0]] + caminho[1:]
+        incompleto = caminho[:-1]
+        validacao = validar_consultas([caminho, salto, sobre_adversario, incompleto, []], [consulta] * 5)
+        self.assertEqual(list(validacao["valido"]), [True, False, False, False, False])
+        self.assertFalse(validacao["adjacente"][1])
+        self.assertFalse(validacao["livre"][2])
+        self.assertFalse(validacao["extremos"][3])
+        self.assertEqual(list(validacao["custo"][1:]), [-1] * 4)
+
+if __name__ == '__main__':
+    unittest.main()
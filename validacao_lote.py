@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Validação e pontuação de lotes de caminhos com NumPy.
+
+Os caminhos são empilhados em uma matriz (caminho, passo, xy) preenchida até o
+maior comprimento, e os cenários em grades (cenário, y, x) preenchidas até o maior
+tamanho: bloqueio, penalidade de proximidade e folga (distância de Chebyshev até o
+adversário mais próximo). Legalidade, custo, rotações e folga mínima de todos os
+caminhos saem de operações sobre essas matrizes, sem laço em Python por passo. O
+custo é o mesmo de calcular_custo_movimento + calcular_penalidade_adversarios
+(tabela do ModeloCusto e penalidades de proximidade em uso).
+'''
+
+import numpy
+
+import candidato
+from candidato import MOVIMENTOS, N_DIRECOES, SEM_DIRECAO, RAIO_PENALIDADE
+from mapa import MapaOcupacao
+
+# Índice em MOVIMENTOS de cada deslocamento (dx+1)*3 + (dy+1); -1 para ficar parado
+_INDICE_MOVIMENTO = numpy.full(9, -1, dtype=numpy.int64)
+for _indice, (_dx, _dy) in enumerate(MOVIMENTOS):
+    _INDICE_MOVIMENTO[(_dx + 1) * 3 + _dy + 1] = _indice
+
+# ==================== CENÁRIOS ====================
+class CenariosLote:
+    """Grades de bloqueio, penalidade e folga de vários cenários, empilhadas até o maior tamanho"""
+
+    def __init__(self, cenarios):
+        """
+        Args:
+            cenarios: Lista de tuplas (obstaculos, largura_grid, altura_grid); obstaculos é
+                      uma lista de posições ou um MapaOcupacao
+        """
+        n = len(cenarios)
+        self.largura = numpy.array([largura for _, largura, _ in cenarios], dtype=numpy.int64)
+        self.altura = numpy.array([altura for _, _, altura in cenarios], dtype=numpy.int64)
+        w = int(self.largura.max()) if n else 1
+        h = int(self.altura.max()) if n else 1
+        r = RAIO_PENALIDADE
+
+        # Adversários por célula (repetidos contam várias vezes, como na lista), com borda de r células
+        contagem = numpy.zeros((n, h + 2 * r, w + 2 * r), dtype=numpy.int64)
+        for i, (obstaculos, largura, altura) in enumerate(cenarios):
+            if isinstance(obstaculos, MapaOcupacao):
+                contagem[i, r:r + altura, r:r + largura] = obstaculos.como_array()
+            elif len(obstaculos):
+                posicoes = numpy.asarray(obstaculos, dtype=numpy.int64).reshape(-1, 2)
+                numpy.add.at(contagem[i], (posicoes[:, 1] + r, posicoes[:, 0] + r), 1)
+        self.bloqueado = contagem[:, r:r + h, r:r + w] > 0
+
+        # Penalidade: soma das cópias deslocadas da contagem, pesadas pelo kernel de proximidade
+        kernel = candidato.penalidades_proximidade()
+        self.penalidade = numpy.zeros((n, h, w), dtype=numpy.int64)
+        for dy in range(-r, r + 1):
+            for dx in range(-r, r + 1):
+                peso = kernel[max(abs(dx), abs(dy))]
+                if peso:
+                    self.penalidade += peso * contagem[:, r + dy:r + dy + h, r + dx:r + dx + w]
+
+        self.folga = self._folga(self.bloqueado, max(w, h))
+
+    @staticmethod
+    def _folga(bloqueado, sem_adversarios):
+        """
+        Distância de Chebyshev de cada célula ao adversário mais próximo, por dilatações 3x3
+        sucessivas (uma por unidade de distância); sem_adversarios nas grades sem adversários
+        """
+        folga = numpy.full(bloqueado.shape, sem_adversarios, dtype=numpy.int64)
+        folga[bloqueado] = 0
+        alcancadas = bloqueado.copy()
+        distancia = 0
+        while True:
+            distancia += 1
+            dilatadas = alcancadas.copy()
+            dilatadas[:, 1:, :] |= alcancadas[:, :-1, :]
+            dilatadas[:, :-1, :] |= alcancadas[:, 1:, :]
+            vertical = dilatadas.copy()
+            dilatadas[:, :, 1:] |= vertical[:, :, :-1]
+            dilatadas[:, :, :-1] |= vertical[:, :, 1:]
+            novas = dilatadas & ~alcancadas
+            if not novas.any():
+                return folga
+            folga[novas] = distancia
+            alcancadas = dilatadas
+
+# ==================== CAMINHOS ====================
+def empacotar_caminhos(caminhos, pos_iniciais=None):
+    """
+    Empilha caminhos de comprimentos diferentes em uma matriz
+    Args:
+        caminhos: Lista de caminhos (listas de posições)
+        pos_iniciais: Posição inicial de cada caminho, acrescentada no início dos caminhos
+                      que não a incluem (como faz benchmark.custo_caminho); None não altera
+    Returns:
+        Tupla (posicoes, comprimentos): posicoes tem forma (caminhos, maior comprimento, 2) e
+        é preenchida com a última posição de cada caminho
+    """
+    if pos_iniciais is not None:
+        caminhos = [[inicial] + list(caminho) if caminho and caminho[0] != inicial else caminho
+                    for caminho, inicial in zip(caminhos, pos_iniciais)]
+    comprimentos = numpy.array([len(caminho) for caminho in caminhos], dtype=numpy.int64)
+    posicoes = numpy.zeros((len(caminhos), max(int(comprimentos.max()) if len(caminhos) else 0, 1), 2),
+                           dtype=numpy.int64)
+    for i, caminho in enumerate(caminhos):
+        if caminho:
+            posicoes[i, :len(caminho)] = caminho
+            posicoes[i, len(caminho):] = caminho[-1]
+    return posicoes, comprimentos
+
+def validar_lote(posicoes, comprimentos, cenarios, indice_cenario, pos_inicial, pos_objetivo, tem_bola,
+                 modelo=None):
+    """
+    Valida e pontua um lote de caminhos em uma única passada vetorizada
+    Args:
+        posicoes: Matriz (caminhos, passos, 2) de empacotar_caminhos
+        comprimentos: Comprimento de cada caminho
+        cenarios: CenariosLote
+        indice_cenario: Índice em cenarios do cenário de cada caminho
+        pos_inicial: Matriz (caminhos, 2) com a posição inicial de cada consulta
+        pos_objetivo: Matriz (caminhos, 2) com o objetivo de cada consulta
+        tem_bola: Posse de bola de cada consulta
+        modelo: ModeloCusto (None usa MODELO_PADRAO)
+    Returns:
+        Dicionário de vetores, um valor por caminho:
+        - adjacente: todos os passos vão para uma das 8 células vizinhas
+        - dentro: todas as células estão dentro do grid do cenário
+        - livre: nenhuma célula é ocupada por adversário
+        - extremos: começa em pos_inicial e termina em pos_objetivo
+        - valido: não vazio e todas as condições acima
+        - custo: custo pelo modelo do candidato (-1 nos caminhos inválidos)
+        - rotacoes: passos em que a direção muda
+        - folga: menor distância de Chebyshev entre uma célula do caminho e um adversário
+    """
+    posicoes = numpy.asarray(posicoes, dtype=numpy.int64)
+    comprimentos = numpy.asarray(comprimentos, dtype=numpy.int64)
+    indice_cenario = numpy.asarray(indice_cenario, dtype=numpy.int64)
+    pos_inicial = numpy.asarray(pos_inicial, dtype=numpy.int64).reshape(-1, 2)
+    pos_objetivo = numpy.asarray(pos_objetivo, dtype=numpy.int64).reshape(-1, 2)
+    bola = numpy.asarray(tem_bola, dtype=numpy.int64)
+    n, total = posicoes.shape[:2]
+    linhas = numpy.arange(n)
+
+    # Células: limites, bloqueio e folga
+    celulas = numpy.arange(total) < comprimentos[:, None]
+    x, y = posicoes[:, :, 0], posicoes[:, :, 1]
+    largura = cenarios.largura[indice_cenario][:, None]
+    altura = cenarios.altura[indice_cenario][:, None]
+    dentro_celula = (x >= 0) & (x < largura) & (y >= 0) & (y < altura)
+    _, h, w = cenarios.bloqueado.shape
+    xc, yc = numpy.clip(x, 0, w - 1), numpy.clip(y, 0, h - 1)
+    cenario = indice_cenario[:, None]
+    livre_celula = ~cenarios.bloqueado[cenario, yc, xc] | ~dentro_celula
+    dentro = (dentro_celula | ~celulas).all(axis=1)
+    livre = (livre_celula | ~celulas).all(axis=1)
+    folga = numpy.where(celulas & dentro_celula, cenarios.folga[cenario, yc, xc], numpy.iinfo(numpy.int64).max)
+    folga = folga.min(axis=1)
+
+    # Passos: direção, custo de movimento e penalidade da célula de chegada
+    passos = numpy.arange(total - 1) < (comprimentos - 1)[:, None]
+    dx, dy = numpy.diff(x, axis=1), numpy.diff(y, axis=1)
+    vizinho = (numpy.abs(dx) <= 1) & (numpy.abs(dy) <= 1)
+    direcao = numpy.where(vizinho, _INDICE_MOVIMENTO[(numpy.clip(dx, -1, 1) + 1) * 3 + numpy.clip(dy, -1, 1) + 1], -1)
+    adjacente = ((direcao >= 0) | ~passos).all(axis=1)
+    direcao = numpy.where(passos & (direcao >= 0), direcao, 0)
+    anterior = numpy.concatenate([numpy.full((n, 1), SEM_DIRECAO, dtype=numpy.int64), direcao[:, :-1]], axis=1)
+    rotacoes = (passos & (anterior != SEM_DIRECAO) & (anterior != direcao)).sum(axis=1)
+
+    tabela = numpy.asarray((modelo or candidato.MODELO_PADRAO).tabela(), dtype=numpy.int64)
+    tabela = tabela.reshape(2, N_DIRECOES, 8)
+    custo_passos = tabela[bola[:, None], anterior, direcao] + cenarios.penalidade[cenario, yc[:, 1:], xc[:, 1:]]
+    custo = numpy.where(passos, custo_passos, 0).sum(axis=1)
+
+    ultima = numpy.maximum(comprimentos - 1, 0)
+    extremos = ((posicoes[:, 0] == pos_inicial).all(axis=1) &
+                (posicoes[linhas, ultima] == pos_objetivo).all(axis=1))
+    valido = (comprimentos > 0) & adjacente & dentro & livre & extremos
+    return {
+        "adjacente": adjacente,
+        "dentro": dentro,
+        "livre": livre,
+        "extremos": extremos,
+        "valido": valido,
+        "custo": numpy.where(valido, custo, -1),
+        "rotacoes": rotacoes,
+        "folga": folga,
+    }
+
+# ==================== CONSULTAS ====================
+def validar_consultas(caminhos, consultas, modelo=None):
+    """
+    Valida os caminhos devolvidos para consultas no formato de benchmark.gerar_cenarios
+    Args:
+        caminhos: Caminho devolvido para cada consulta (None ou lista vazia se não houver)
+        consultas: Dicionários com obstaculos, largura_grid, altura_grid, pos_inicial,
+                   pos_objetivo e tem_bola; consultas com a mesma lista de obstáculos
+                   compartilham as grades do cenário
+        modelo: ModeloCusto (None usa MODELO_PADRAO)
+    Returns:
+        Dicionário de vetores de validar_lote
+    """
+    indices = {}
+    cenarios = []
+    indice_cenario = []
+    for consulta in consultas:
+        chave = (id(consulta["obstaculos"]), consulta["largura_grid"], consulta["altura_grid"])
+        if chave not in indices:
+            indices[chave] = len(cenarios)
+            cenarios.append((consulta["obstaculos"], consulta["largura_grid"], consulta["altura_grid"]))
+        indice_cenario.append(indices[chave])
+
+    pos_inicial = [consulta["pos_inicial"] for consulta in consultas]
+    posicoes, comprimentos = empacotar_caminhos([caminho or [] for caminho in caminhos], pos_inicial)
+    return validar_lote(posicoes, comprimentos, CenariosLote(cenarios), indice_cenario, pos_inicial,
+                        [consulta["pos_objetivo"] for consulta in consultas],
+                        [consulta["tem_bola"] for consulta in consultas], modelo)
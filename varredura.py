@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+'''
+Varredura de parâmetros do modelo de custo em um pool de processos.
+
+Cada configuração (pesos de rotação do ModeloCusto e escala das penalidades de
+proximidade) é avaliada nos mesmos episódios sorteados com semente, então as
+diferenças entre linhas da tabela vêm dos pesos e não do sorteio. Os episódios são
+divididos em tarefas de EPISODIOS_POR_TAREFA sementes espalhadas entre os processos.
+Cada processo importa o candidato uma única vez (sem criar outro arquivo de log),
+aquece o planejador no inicializador e guarda um planejador por configuração;
+as tarefas devolvem só os resultados dos episódios, que são agregados na tabela
+à medida que chegam.
+'''
+
+import argparse
+import functools
+import itertools
+import json
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import candidato
+from simulacao import LARGURA_GRID, ALTURA_GRID, MAX_OBSTACULOS, executar_episodio
+
+# Parâmetros de ModeloCusto que podem ser varridos
+PARAMETROS_MODELO = ("custo_reto", "custo_diagonal", "custo_reto_diagonal", "custo_90_graus", "fator_bola")
+EPISODIOS_POR_TAREFA = 25
+# Penalidades de proximidade de referência, multiplicadas por escala_proximidade
+PENALIDADES_BASE = tuple(candidato.penalidade_por_distancia(dist) for dist in range(candidato.RAIO_PENALIDADE + 1))
+
+# ==================== CONFIGURAÇÕES ====================
+def gerar_configuracoes(grade):
+    """
+    Produto cartesiano dos valores de cada parâmetro
+    Args:
+        grade: Dicionário parâmetro -> lista de valores (PARAMETROS_MODELO e "escala_proximidade")
+    Returns:
+        Lista de dicionários parâmetro -> valor
+    """
+    nomes = sorted(grade)
+    return [dict(zip(nomes, valores)) for valores in itertools.product(*(grade[nome] for nome in nomes))]
+
+def penalidades_escaladas(escala):
+    """Penalidades de proximidade de referência multiplicadas por escala (arredondadas para inteiros)"""
+    return [round(escala * penalidade) for penalidade in PENALIDADES_BASE]
+
+def rotulo(configuracao):
+    """Texto curto de uma configuração para a tabela"""
+    return " ".join(f"{nome}={valor}" for nome, valor in configuracao.items())
+
+# ==================== PROCESSO TRABALHADOR ====================
+_planejadores = {}  # Configuração -> planejador, mantidos enquanto o processo viver
+
+def _iniciar_trabalhador(nivel_log):
+    """Inicializador do pool: silencia os logs por busca e aquece o planejador padrão"""
+    logging.getLogger().setLevel(max(nivel_log, logging.WARNING))
+    candidato.encontrar_caminho((0, 0), (3, 2), [(1, 1)], 4, 3)
+
+def _planejador(configuracao):
+    """Planejador da configuração, com a tabela do ModeloCusto calculada uma vez por processo"""
+    chave = tuple(sorted(configuracao.items()))
+    planejador = _planejadores.get(chave)
+    if planejador is None:
+        modelo = candidato.ModeloCusto(**{nome: valor for nome, valor in configuracao.items()
+                                          if nome in PARAMETROS_MODELO})
+        modelo.tabela()
+        planejador = _planejadores[chave] = functools.partial(candidato.encontrar_caminho, modelo=modelo)
+    return planejador
+
+def executar_tarefa(indice, configuracao, sementes, parametros_episodio, corpus=None, perfil=None):
+    """
+    Roda um bloco de episódios de uma configuração (executada nos processos do pool)
+    Args:
+        indice: Índice da configuração, devolvido junto com os resultados
+        configuracao: Dicionário parâmetro -> valor
+        sementes: Sementes dos episódios do bloco (com corpus, os índices dos cenários)
+        parametros_episodio: Parâmetros nomeados repassados para executar_episodio
+        corpus: Arquivo .npz de corpus_cenarios, aberto uma vez por processo e lido cenário a cenário
+        perfil: Opções de perfilamento.PerfilPlanejador para perfilar o bloco (None não perfila)
+    Returns:
+        Tupla (indice, lista de resultados de executar_episodio, dados do perfil ou None)
+    """
+    candidato.definir_penalidades_proximidade(penalidades_escaladas(configuracao.get("escala_proximidade", 1.0)))
+    planejador = _planejador(configuracao)
+    if perfil is not None:
+        from perfilamento import PerfilPlanejador
+        planejador = PerfilPlanejador(planejador, **perfil)
+    if corpus is None:
+        resultados = [executar_episodio(semente, planejador, **parametros_episodio) for semente in sementes]
+    else:
+        from corpus_cenarios import abrir_corpus
+        cenarios = abrir_corpus(corpus)
+        resultados = [executar_episodio(semente, planejador, cenario=cenarios[semente], **parametros_episodio)
+                      for semente in sementes]
+    return indice, resultados, planejador.como_dicionario() if perfil is not None else None
+
+# ==================== AGREGAÇÃO ====================
+class TabelaVarredura:
+    """Totais por configuração, atualizados a cada tarefa concluída"""
+
+    def __init__(self, configuracoes):
+        self.configuracoes = configuracoes
+        self.totais = [{"episodios": 0, "sucessos": 0, "passos_sucesso": 0, "replanejamentos": 0,
+                        "tempo_planejamento": 0.0} for _ in configuracoes]
+        self.perfis = [[] for _ in configuracoes]  # Dados de perfil de cada tarefa, se perfilada
+
+    def adicionar(self, indice, resultados, perfil=None):
+        if perfil is not None:
+            self.perfis[indice].append(perfil)
+        total = self.totais[indice]
+        for resultado in resultados:
+            total["episodios"] += 1
+            total["replanejamentos"] += resultado["replanejamentos"]
+            total["tempo_planejamento"] += resultado["tempo_planejamento"]
+            if resultado["sucesso"]:
+                total["sucessos"] += 1
+                total["passos_sucesso"] += resultado["passos"]
+
+    def linhas(self):
+        """Uma linha por configuração com as médias atuais"""
+        linhas = []
+        for configuracao, total in zip(self.configuracoes, self.totais):
+            linhas.append({
+                "configuracao": configuracao,
+                "episodios": total["episodios"],
+                "taxa_sucesso": total["sucessos"] / max(total["episodios"], 1),
+                "passos_medios": total["passos_sucesso"] / max(total["sucessos"], 1),
+                "replanejamentos": total["replanejamentos"],
+                "ms_por_plano": 1000 * total["tempo_planejamento"] / max(total["replanejamentos"], 1),
+            })
+        return linhas
+
+    def imprimir(self):
+        print(f"{'configuração':<60} {'episódios':>9} {'sucesso':>8} {'passos':>7} {'ms/plano':>9}")
+        for linha in self.linhas():
+            print(f"{rotulo(linha['configuracao']):<60} {linha['episodios']:>9} {100 * linha['taxa_sucesso']:>7.1f}% "
+                  f"{linha['passos_medios']:>7.2f} {linha['ms_por_plano']:>9.3f}")
+
+# ==================== EXECUÇÃO ====================
+def varrer(configuracoes, n_episodios, semente=0, processos=None, episodios_por_tarefa=EPISODIOS_POR_TAREFA,
+           ao_concluir=None, corpus=None, perfil=None, **parametros_episodio):
+    """
+    Avalia cada configuração nos mesmos n_episodios episódios
+    Args:
+        configuracoes: Lista de dicionários parâmetro -> valor (ver gerar_configuracoes)
+        n_episodios: Episódios por configuração
+        semente: Semente mestre (as sementes dos episódios são as de simulacao.executar_lote)
+        processos: Tamanho do pool (None usa todos os núcleos)
+        episodios_por_tarefa: Episódios enviados a um processo de uma vez
+        ao_concluir: Função chamada com (tabela, tarefas concluídas, total de tarefas) a cada tarefa
+        corpus: Arquivo .npz de corpus_cenarios: os episódios são os n_episodios primeiros cenários dele
+                (as dimensões e adversários vêm do corpus)
+        perfil: Opções de perfilamento.PerfilPlanejador: cada tarefa devolve seu perfil, guardado em
+                tabela.perfis por configuração (None não perfila)
+        **parametros_episodio: Repassados para executar_episodio (dimensões, adversários etc.)
+    Returns:
+        TabelaVarredura com os totais de todas as configurações
+    """
+    if corpus is None:
+        rng = random.Random(semente)
+        sementes = [rng.getrandbits(32) for _ in range(n_episodios)]
+    else:
+        from corpus_cenarios import abrir_corpus
+        sementes = list(range(min(n_episodios, len(abrir_corpus(corpus)))))
+    blocos = [sementes[i:i + episodios_por_tarefa] for i in range(0, len(sementes), episodios_por_tarefa)]
+    tabela = TabelaVarredura(configuracoes)
+
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_trabalhador,
+                             initargs=(logging.getLogger().level,)) as executor:
+        futuros = [executor.submit(executar_tarefa, indice, configuracao, bloco, parametros_episodio, corpus, perfil)
+                   for indice, configuracao in enumerate(configuracoes) for bloco in blocos]
+        for concluidas, futuro in enumerate(as_completed(futuros), 1):
+            tabela.adicionar(*futuro.result())
+            if ao_concluir is not None:
+                ao_concluir(tabela, concluidas, len(futuros))
+    return tabela
+
+def main():
+    parser = argparse.ArgumentParser(description="Varredura dos pesos do modelo de custo em vários processos")
+    parser.add_argument("--episodios", type=int, default=200, help="Episódios por configuração")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--largura", type=int, default=LARGURA_GRID)
+    parser.add_argument("--altura", type=int, default=ALTURA_GRID)
+    parser.add_argument("--obstaculos", type=int, default=MAX_OBSTACULOS)
+    parser.add_argument("--adversarios-moveis", type=int, default=0)
+    parser.add_argument("--processos", type=int, default=None, help="Tamanho do pool (padrão: todos os núcleos)")
+    parser.add_argument("--lote", type=int, default=EPISODIOS_POR_TAREFA, help="Episódios por tarefa")
+    for nome in PARAMETROS_MODELO:
+        parser.add_argument("--" + nome.replace("_", "-"), type=int, nargs="+", metavar="V",
+                            help=f"Valores de ModeloCusto.{nome}")
+    parser.add_argument("--escala-proximidade", type=float, nargs="+", default=[1.0], metavar="E",
+                        help=f"Multiplicadores das penalidades de proximidade {list(PENALIDADES_BASE)}")
+    parser.add_argument("--corpus", help="Corpus .npz (corpus_cenarios.py): os episódios são os primeiros cenários dele")
+    parser.add_argument("--progresso", action="store_true", help="Imprime a tabela parcial a cada 10%% das tarefas")
+    parser.add_argument("--saida", help="Arquivo JSON com a tabela final")
+    parser.add_argument("--perfilar", metavar="ARQUIVO",
+                        help="Perfila os planejamentos de cada configuração (perfilamento.py); relatório em .json ou texto")
+    parser.add_argument("--perfil-cprofile", action="store_true", help="Guarda o cProfile das chamadas mais lentas")
+    args = parser.parse_args()
+
+    candidato.configurar_logging(arquivo=False, nivel=logging.WARNING)
+    grade = {"escala_proximidade": args.escala_proximidade}
+    for nome in PARAMETROS_MODELO:
+        if getattr(args, nome) is not None:
+            grade[nome] = getattr(args, nome)
+    configuracoes = gerar_configuracoes(grade)
+
+    def ao_concluir(tabela, concluidas, total):
+        if args.progresso and (concluidas * 10 // total) != ((concluidas - 1) * 10 // total):
+            print(f"--- {concluidas}/{total} tarefas ({time.perf_counter() - inicio:.1f}s)")
+            tabela.imprimir()
+
+    processos = args.processos or os.cpu_count()
+    inicio = time.perf_counter()
+    perfil = {"cprofile": args.perfil_cprofile} if args.perfilar else None
+    tabela = varrer(configuracoes, args.episodios, args.semente, processos, args.lote, ao_concluir, args.corpus,
+                    perfil, largura_grid=args.largura, altura_grid=args.altura, max_obstaculos=args.obstaculos,
+                    adversarios_moveis=args.adversarios_moveis)
+    tempo_total = time.perf_counter() - inicio
+
+    tabela.imprimir()
+    n_episodios = sum(linha["episodios"] for linha in tabela.linhas())
+    print(f"{len(configuracoes)} configurações | {n_episodios} episódios | {processos} processos | "
+          f"{tempo_total:.2f}s ({n_episodios / max(tempo_total, 1e-9):.1f} episódios/s)")
+    if args.saida:
+        with open(args.saida, "w") as arquivo:
+            json.dump(tabela.linhas(), arquivo, indent=2)
+    if args.perfilar:
+        from perfilamento import exportar, juntar
+        exportar({rotulo(configuracao): juntar(perfis) for configuracao, perfis in zip(configuracoes, tabela.perfis)},
+                 args.perfilar)
+        print(f"Perfil gravado em {args.perfilar}")
+
+if __name__ == '__main__':
+    main()